@@ -8,24 +8,50 @@
 # 流程：每頁先收集所有 job_id 及其 list 頁資訊，存成集合，逐一爬細節頁，抓完清空集合，再處理下一頁。
 # 修復：優化無限滾動（移除滾動）、修復索引問題（先收集 job_id）、修復 psutil 錯誤。
 # 功能：只爬新職缺（比對舊 CSV）、斷點續爬（checkpoint.json）、手動中斷儲存並去重。
-# 執行前需安裝套件：pip install pandas selenium undetected-chromedriver psutil beautifulsoup4
+# 功能：細節頁可選 HTTP 模式（--fetch_backend http），直接抓職缺 JSON，不用開 Chrome，失敗才退回瀏覽器。
+# 功能：細節頁可用 --workers 平行爬取，所有請求共用 --rps 速率限制（token bucket），取代固定隨機 sleep。
+# 功能：--pipeline 讓列表頁與細節頁同時進行，斷點依實際存檔進度更新。
+# 功能：等待改為輪詢頁面就緒訊號（WaitPolicy），只保留可設定的隨機最短等待，並記錄每次等待秒數。
+# 功能：資料存進 SQLite（job_id upsert），CSV/JSON 改用 --export 或 job_store.py 需要時匯出。
+# 功能：--parquet_dir 另存分區 Parquet；每個細節頁爬完立刻寫入 JSONL（--jsonl_path），當機不遺失。
+# 功能：職缺工作佇列（--queue_db）記錄每個職缺的狀態，中斷後從未完成的職缺接續，失敗的依退避時間重試。
+# 功能：--incremental 比對列表頁更新日期與內容，只重爬有變動的職缺；--stop_after_known_pages 沒有新職缺時提早結束。
+# 功能：瀏覽器池背景維持待命 Chrome 並做健康檢查；--block_resources 擋掉圖片、字型、廣告與追蹤腳本。
+# 功能：進程看門狗只追蹤自己開的 Chrome 進程樹，記憶體超過 --max_driver_rss_mb 就換新，結束時只清自己的殘留進程（Linux / Windows 皆可）。
+# 功能：技能關鍵字改用可設定的技能字典（--skill_dict），同義詞轉成標準名稱，每份文件只掃一次。
+# 功能：細節頁原始內容 gzip 封存到 --archive_dir，改了解析規則可用 job_archive.py reextract 多進程重新解析，不用重爬。
+# 功能：--cache_ttl 開啟頁面快取（依 URL、壓縮存放、過期與 LRU 淘汰），開發時重跑直接讀快取，不用再打 104。
+# 執行前需安裝套件：pip install pandas selenium undetected-chromedriver psutil lxml requests pyarrow
 
-import pandas as pd  # 用來處理表格資料，像 Excel 一樣讀寫 CSV 檔案
 import time  # 用來暫停程式，模擬人類瀏覽速度，避免被網站偵測為機器人
 import random  # 用來產生隨機數字，讓延遲時間不固定，降低被封鎖的風險
 import argparse  # 用來讀取命令列輸入，讓程式可以自訂參數（如起始頁碼）
 from datetime import datetime  # 用來取得現在的日期時間，幫助命名檔案
-import re  # 正則表達式，用來從文字中提取特定模式（如薪資數字或技能關鍵字）
-from selenium.webdriver.chrome.options import Options  # 用來設定 Chrome 瀏覽器的選項，比如不顯示視窗
-from selenium.webdriver.support.ui import WebDriverWait  # 用來等待網頁元素出現，避免程式太快出錯
-from selenium.webdriver.support import expected_conditions as EC  # 定義等待的條件，比如元素可見
+import re  # 正則表達式，用來從文字中提取特定模式（如 jobcat 代碼）
 from selenium.webdriver.common.by import By  # 用來指定如何找網頁元素（如用 CSS 或 XPath）
-import undetected_chromedriver as uc  # 一個隱藏 Selenium 痕跡的工具，讓網站以為是真人瀏覽
-import psutil  # 用來管理電腦進程，比如關閉多餘的 Chrome 視窗，避免記憶體爆滿
 import os  # 用來處理檔案和資料夾，比如檢查檔案是否存在
 import json  # 用來讀寫 JSON 檔案，適合儲存結構化的資料
-from bs4 import BeautifulSoup  # 用來解析 HTML 網頁內容，檢查元素（輔助 Selenium）
 import logging  # 用來記錄程式執行過程的日誌，方便除錯
+from job_list_parser import parse_list_page, parse_total_pages  # 列表頁單次解析（兩支爬蟲共用）
+from job_detail_parser import parse_job_detail  # 細節頁單次解析
+from job_http_fetcher import create_session, crawl_job_details_http  # 不開瀏覽器的細節頁抓取
+from job_browser import create_driver, PageWeightStats  # 共用的 Chrome 設定與啟動、頁面大小統計
+from job_driver_pool import DriverPool  # 待命瀏覽器池（健康檢查、背景換新）
+from job_watchdog import ChromeWatchdog  # 追蹤自己開的 Chrome 進程樹（記憶體、殘留進程）
+from job_rate_limiter import HostRateLimiter  # 所有 worker 共用的請求速率限制
+from job_worker_pool import DetailWorkerPool  # 細節頁平行爬取
+from job_pipeline import run_pipeline  # 列表頁 / 細節頁 pipeline
+from job_wait import WaitPolicy  # 依頁面就緒訊號等待，取代固定 sleep
+from job_store import JobStore  # SQLite 職缺資料庫（job_id upsert）
+from job_id_index import open_index  # 已存 job_id 的 Bloom filter 索引（啟動不用載入所有 job_id）
+from job_parquet import write_partition  # Parquet 輸出（依爬取日期 / jobcat 分區）
+from job_jsonl_sink import JsonlSink, iter_jsonl  # 每筆職缺爬完立刻寫入 JSONL
+from job_checkpoint import JobQueue  # 以職缺為單位的斷點（pending / done / failed）
+from job_incremental import IncrementalPlanner, FINGERPRINT_FIELDS  # 增量重爬：只爬新的或有更新的職缺
+from job_pagination import PaginationPolicy  # 沒有新職缺時提早結束翻頁
+from job_skills import SkillMatcher  # 技能關鍵字比對（Aho-Corasick + 技能字典）
+from job_archive import RawPageArchive  # 細節頁原始內容封存（可不重爬重新解析）
+from job_page_cache import PageCache  # 依 URL 的壓縮頁面快取（TTL + LRU）
 
 # User-Agent 列表，模擬不同瀏覽器
 # 為什麼？網站會檢查 User-Agent，如果總是用同一個，容易被當成機器人
@@ -48,38 +74,95 @@ def parse_arguments():
                         help="分頁參數，104 用 page={page}")
     parser.add_argument("--start_page", type=int, default=1, help="起始頁碼")
     parser.add_argument("--end_page", type=int, default=20, help="結束頁碼")
+    parser.add_argument("--stop_after_known_pages", type=int, default=0,
+                        help="連續幾頁沒有新職缺就停止翻頁（0 為不啟用；適合依更新日期排序的每日執行）")
     parser.add_argument("--output_csv", default="job_data.csv", help="輸出 CSV 檔名")
-    parser.add_argument("--existing_csv", default="job_data_jobcat_1022.csv", help="現有 CSV，用來比對 job_id")
+    parser.add_argument("--existing_csv", default="job_data_jobcat_1022.csv",
+                        help="現有 CSV，第一次執行時匯入資料庫，用來比對 job_id")
+    parser.add_argument("--db_path", default="job_data.db", help="SQLite 職缺資料庫檔")
+    parser.add_argument("--jsonl_path", default="job_details.jsonl",
+                        help="每個細節頁爬完立刻追加寫入的 JSONL（當機不遺失），空字串則不寫")
+    parser.add_argument("--archive_dir", default="raw_pages",
+                        help="細節頁原始內容（gzip）封存資料夾，可用 job_archive.py reextract 不重爬重新解析；空字串則不封存")
+    parser.add_argument("--cache_dir", default="page_cache", help="頁面快取資料夾")
+    parser.add_argument("--cache_ttl", type=float, default=0,
+                        help="頁面快取有效秒數，這段時間內同一個 URL 直接讀快取不重抓（0 表示不使用快取）")
+    parser.add_argument("--cache_max_mb", type=float, default=500, help="頁面快取大小上限（MB），超過時刪最久沒用的")
+    parser.add_argument("--incremental", action="store_true", default=False,
+                        help="增量模式：已存在的職缺若列表頁的更新日期或內容有變，也重爬細節頁")
+    parser.add_argument("--queue_db", default="job_queue.db",
+                        help="職缺工作佇列（每個職缺的 pending / done / failed 狀態），中斷後從這裡接續")
+    parser.add_argument("--max_attempts", type=int, default=3, help="每個職缺最多嘗試幾次")
+    parser.add_argument("--retry_delay", type=float, default=60,
+                        help="失敗職缺第一次重試前至少等幾秒，之後每次加倍")
+    parser.add_argument("--parquet_dir", default=None,
+                        help="另外把每批職缺寫成 Parquet（依 crawl_date / jobcat 分區），例如 job_parquet")
+    parser.add_argument("--export", action="store_true", default=False,
+                        help="爬完後從資料庫匯出 CSV 和 JSON")
     parser.add_argument("--headless", action="store_true", default=False,
                         help="使用 headless 模式（不開視窗）")
+    parser.add_argument("--fetch_backend", choices=["browser", "http"], default="browser",
+                        help="細節頁抓取方式：browser 用 Chrome，http 直接抓職缺 JSON（失敗時改用 Chrome）")
+    parser.add_argument("--replay_dir", default=None,
+                        help="HTTP 模式改讀本機 {job_id}.json（例如 fixtures/job_content），離線測試用")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="細節頁平行 worker 數（browser 模式每個 worker 各開一個 Chrome）")
+    parser.add_argument("--block_resources", action="store_true", default=False,
+                        help="擋掉圖片、字型、廣告與追蹤腳本（CDP），減少頁面下載量、加快就緒")
+    parser.add_argument("--warm_drivers", type=int, default=1,
+                        help="背景維持幾個待命 Chrome，換瀏覽器時不用等冷啟動")
+    parser.add_argument("--recycle_after", type=int, default=30,
+                        help="每個 Chrome 開幾個頁面後換新")
+    parser.add_argument("--max_driver_rss_mb", type=float, default=None,
+                        help="Chrome 進程樹記憶體超過幾 MB 就換新（看門狗背景取樣；不設定則只清理殘留進程）")
+    parser.add_argument("--rps", type=float, default=0.2,
+                        help="對 104 的總請求速率上限（每秒幾個請求，所有 worker 共用）")
+    parser.add_argument("--min_wait", type=float, default=1.0,
+                        help="頁面就緒後至少等待的秒數（從開始等待起算）")
+    parser.add_argument("--wait_jitter", type=float, default=1.0,
+                        help="最短等待額外加上的隨機秒數上限")
+    parser.add_argument("--wait_timeout", type=float, default=30,
+                        help="等待頁面就緒訊號的預設逾時秒數")
+    parser.add_argument("--pipeline", action="store_true", default=False,
+                        help="列表頁與細節頁同時進行（producer/consumer），斷點依實際存檔進度更新")
+    parser.add_argument("--queue_size", type=int, default=40,
+                        help="pipeline 模式中等待爬細節的職缺上限")
+    parser.add_argument("--commit_every", type=int, default=20,
+                        help="pipeline 模式每處理幾個職缺存檔一次")
+    parser.add_argument("--skill_dict", default=None,
+                        help="技能字典 JSON（標準名稱、同義詞、排除詞），預設為 skill_dictionary.json")
     return parser.parse_args()
 
-def cleanup_chrome_processes():
-    """清理 Chrome 和 chromedriver 進程，避免記憶體問題
-    為什麼？Chrome 容易殘留進程，導致電腦變慢或程式出錯"""
-    terminated = 0
-    try:
-        for proc in psutil.process_iter(['name']):
-            if proc.info['name'] in ['chrome.exe', 'chromedriver.exe']:
-                proc.kill()
-                terminated += 1
-                print(f"已終止進程: {proc.info['name']} (PID: {proc.pid})")
-        return terminated
-    except Exception as e:
-        print(f"清理進程時發生錯誤: {e}")
-        return terminated
-
-def load_existing_job_ids(existing_csv):
-    """讀取現有 CSV 的 job_id，檢查新職缺
-    為什麼？避免重複爬取已經有的職缺，節省時間"""
+def load_existing_job_ids(store, id_index, existing_csv=None, jobcat=None):
+    """回傳已存 job_id 的索引（JobIdIndex，支援 in / len），檢查新職缺
+    為什麼？避免重複爬取已經有的職缺，節省時間；索引檔只補上新存的職缺，不用每次把所有 job_id 讀成 set
+    existing_csv 只在第一次（或檔案有更新時）匯入資料庫，標上目前的 jobcat，--export 時才會一起匯出"""
     if existing_csv and os.path.exists(existing_csv):
         try:
-            df = pd.read_csv(existing_csv)
-            return set(df['job_id'].dropna().astype(str))
+            imported = store.import_csv(existing_csv, jobcat)
+            if imported:
+                print(f"已將 {existing_csv} 匯入資料庫 {imported} 筆")
         except Exception as e:
-            print(f"讀取現有 CSV 失敗 ({existing_csv}): {e}")
-            return set()
-    return set()
+            print(f"匯入現有 CSV 失敗 ({existing_csv}): {e}")
+    id_index.sync(store)
+    return id_index
+
+def recover_from_jsonl(store, id_index, jsonl_path, jobcat=None):
+    """把 JSONL 裡有、資料庫裡還沒有的職缺補存進資料庫
+    為什麼？上次若在每 5 頁存檔之前當機，爬好的細節頁只留在 JSONL，補回後就不會重爬"""
+    if not jsonl_path or not os.path.exists(jsonl_path):
+        return 0
+    latest = {}
+    for record in iter_jsonl(jsonl_path):
+        job_id = str(record.get("job_id", ""))
+        # 已在 latest 的不用再查索引；同一職缺出現多次時以最後一筆為準
+        if job_id and (job_id in latest or job_id not in id_index):
+            latest[job_id] = record
+    if latest:
+        store.upsert_jobs(list(latest.values()), jobcat)
+        id_index.sync(store)
+        print(f"已從 {jsonl_path} 補回 {len(latest)} 筆上次未存檔的職缺")
+    return len(latest)
 
 def save_checkpoint(page, checkpoint_file="checkpoint.json"):
     """儲存當前爬到的頁數（斷點）
@@ -101,165 +184,36 @@ def load_checkpoint(checkpoint_file="checkpoint.json"):
             print(f"讀取斷點失敗: {e}")
     return 1
 
-def parse_salary(salary):
-    """解析薪資，提取 min、max、avg 和 note
-    例如：從 '月薪40,000~60,000元' 提取最小、最大、平均值"""
-    if not salary or salary == "待遇面議":
-        return None, None, None, "無薪資資訊"
-    salary = salary.replace(",", "")
-    match = re.match(r"月薪(\d+)(?:~(\d+))?元", salary)
-    if match:
-        min_salary = int(match.group(1))
-        max_salary = int(match.group(2)) if match.group(2) else None
-        avg_salary = (min_salary + max_salary) / 2 if max_salary else min_salary
-        note = "最低保證薪資" if not max_salary else ""
-        return min_salary, max_salary, avg_salary, note
-    match = re.match(r"年薪(\d+)(?:~(\d+))?元", salary)
-    if match:
-        min_salary = int(match.group(1)) // 12
-        max_salary = int(match.group(2)) // 12 if match.group(2) else None
-        avg_salary = (min_salary + max_salary) / 2 if max_salary else min_salary
-        note = "年薪轉換為月薪"
-        return min_salary, max_salary, avg_salary, note
-    match = re.match(r"時薪(\d+)元", salary)
-    if match:
-        hourly = int(match.group(1))
-        min_salary = hourly * 8 * 22
-        max_salary = None
-        avg_salary = min_salary
-        note = "推估（時薪 × 8小時 × 22天）"
-        return min_salary, max_salary, avg_salary, note
-    match = re.match(r"日薪(\d+)元", salary)
-    if match:
-        daily = int(match.group(1))
-        min_salary = daily * 22
-        max_salary = None
-        avg_salary = min_salary
-        note = "推估（日薪 × 22天）"
-        return min_salary, max_salary, avg_salary, note
-    return None, None, None, "無法解析薪資格式"
-
-def extract_skills(text):
-    """從文字提取技能關鍵字
-    例如：從工作描述中找 'Python' 或 'SQL' 等詞"""
-    skills_pattern = r'(?<!\w)(MySQL|PostgreSQL|MS SQL|MongoDB|Redis|AWS|GCP|Cloud SQL|CI/CD|IaC|GDPR|ASP\.NET|MVC|C#|SQL|SAP|S/4 HANA|JavaScript|Python|Java|Docker|Kubernetes|Hadoop|Spark|Kafka|Airflow|Talend|Luigi|Tableau|Power BI|Looker|Scala|Pandas|NumPy|Terraform|Helm|Jenkins|Elasticsearch|Snowflake|Databricks|R)(?!\w)'
-    skills = re.findall(skills_pattern, text, re.IGNORECASE)
-    # 過濾掉明顯非獨立技能的 'R'
-    skills = [s for s in skills if not (s.lower() == 'r' and re.search(r'\w+r\w+', text, re.IGNORECASE))]
-    return list(set(skills)) if skills else []
-
-def extract_field_value(driver, keyword, default="未知"):
-    """提取指定關鍵字的欄位值（更穩健的 CSS 選擇器）
-    例如：找 '管理責任' 的值"""
-    try:
-        rows = driver.find_elements(By.CSS_SELECTOR, "div.job-description-table div.list-row")
-        for row in rows:
-            try:
-                title_elem = row.find_element(By.CSS_SELECTOR, "h3.h3")
-                if keyword in title_elem.text:
-                    value_elem = row.find_element(By.CSS_SELECTOR, "div.t3.mb-0")
-                    return value_elem.text.strip()
-            except:
-                continue
-    except:
-        pass
-    return default
-
-def restart_driver(driver, args):
-    """重啟瀏覽器以恢復 session
-    為什麼？長時間運行後，瀏覽器可能卡住或被網站偵測，重啟可以刷新"""
-    try:
-        driver.quit()
-        print("關閉舊瀏覽器")
-    except Exception as e:
-        print(f"關閉瀏覽器時發生錯誤: {str(e)}")
-    options = Options()
-    options.add_argument(f"user-agent={random.choice(user_agents)}")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--disable-web-security")
-    if args.headless:
-        options.add_argument("--headless=new")
-    new_driver = uc.Chrome(options=options)
-    time.sleep(5)  # 等待新 session 穩定
-    return new_driver
-
 def crawl_job_details(driver, job_id, list_data):
     """爬取單個職缺的細節頁
     步驟：開細節頁，滾動載入內容，提取描述、技能等，合併列表頁資料"""
     url = f"https://www.104.com.tw/job/{job_id}"
+    cached = page_cache.get(url) if page_cache is not None else None
+    if cached is not None:
+        return parse_job_detail(cached, job_id, list_data, skill_matcher.extract)
     max_retries = 3
     for attempt in range(max_retries):
         try:
+            rate_limiter.acquire(url)  # 共用速率限制，取代載入後的隨機等待
             driver.get(url)
-            for _ in range(3):
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(random.uniform(2, 4))
-            # 等待工作內容
+            wait_policy.until_document_ready(driver, "細節頁載入")
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")  # 觸發延遲載入的區塊
+            # 等待工作內容出現即可解析，不再固定滾動 3 次、每次等 2~4 秒
             elements = [
                 (By.CSS_SELECTOR, "p.job-description__content"),
                 (By.XPATH, "//h2[contains(text(), '工作內容')]/following-sibling::p[contains(@class, 'job-description__content')]"),
                 (By.CSS_SELECTOR, "div.job-description__content p")
             ]
-            job_description = None
-            for by, selector in elements:
-                try:
-                    WebDriverWait(driver, 20).until(EC.presence_of_element_located((by, selector)))
-                    job_description = driver.find_element(by, selector).text.strip()
-                    break
-                except:
-                    continue
-            if not job_description:
-                print(f"警告: {job_id} 無法找到工作內容")
-                job_description = "未知"
-            time.sleep(random.uniform(5, 10))
-            # 整合 list 資料
-            job_detail = {
-                "job_id": job_id,
-                **{k: v for k, v in list_data.items() if pd.notna(v)}
-            }
-            # 提取工作內容和技能
-            job_detail["job_description"] = job_description
-            skills_from_description = extract_skills(job_description)
-            # 其他條件
-            other_elem = driver.find_elements(By.XPATH,
-                                              "//h3[contains(text(), '其他條件')]/ancestor::div[contains(@class, 'list-row')]/following-sibling::div[contains(@class, 'list-row__data')]//div[contains(@class, 'job-requirement-table__data')]//p[contains(@class, 'm-0 r3 w-100')]")
-            other_conditions = other_elem[0].text.strip() if other_elem else "無"
-            skills_from_other = extract_skills(other_conditions)
-            job_detail["skills"] = list(set(skills_from_description + skills_from_other))
-            # 職務類別
-            job_categories = [cat.text.strip() for cat in driver.find_elements(By.CSS_SELECTOR, "div.category-item div.v-popper u")]
-            job_detail["job_categories"] = job_categories if job_categories else ["未知"]
-            # 表格欄位
-            job_detail["management_responsibility"] = extract_field_value(driver, "管理責任")
-            job_detail["work_shift"] = extract_field_value(driver, "上班時段")
-            job_detail["remote_work"] = extract_field_value(driver, "遠端工作")
-            job_detail["BT_EXP"] = extract_field_value(driver, "出差外派")
-            # 語文條件（採用使用者提供的選擇器）
-            language_elem = None
-            try:
-                rows = driver.find_elements(By.CSS_SELECTOR, "div.job-requirement-table div.list-row")
-                for row in rows:
-                    try:
-                        title_elem = row.find_element(By.CSS_SELECTOR, "h3.h3")
-                        if "語文條件" in title_elem.text:
-                            language_elem = row.find_element(By.CSS_SELECTOR, "u").text.strip()
-                            break
-                    except:
-                        continue
-                job_detail["languages"] = language_elem if language_elem else "不拘"
-            except:
-                job_detail["languages"] = "--"
-            # 擅長工具
-            tools_elem = [tool.find_element(By.TAG_NAME, "u").text.strip() for tool in driver.find_elements(By.CSS_SELECTOR, "a.tools") if tool.find_elements(By.TAG_NAME, "u")]
-            job_detail["tools"] = tools_elem if tools_elem else ["--"]
-            # 工作技能
-            skills_elem = [skill.find_element(By.TAG_NAME, "u").text.strip() for skill in driver.find_elements(By.CSS_SELECTOR, "a.skills") if skill.find_elements(By.TAG_NAME, "u")]
-            job_detail["work_skills"] = skills_elem if skills_elem else ["不拘"]
-            # 其他條件
-            job_detail["other_conditions"] = other_conditions
+            wait_policy.until_present(driver, "細節頁工作內容", elements, timeout=20)
+            page_stats.record("細節頁", driver)  # 記錄下載量與載入時間
+            # 頁面載入後只取一次 page_source，在本機一次解析所有欄位（job_detail_parser.py）
+            # 為什麼？原本每個欄位都要 find_elements，表格欄位還會重複抓所有 list-row，WebDriver 往返很多
+            page_source = driver.page_source
+            if archive is not None:
+                archive.save_page(job_id, page_source, list_data)  # 封存原始頁面，之後改解析規則不用重爬
+            job_detail = parse_job_detail(page_source, job_id, list_data, skill_matcher.extract)
+            if page_cache is not None:
+                page_cache.put(url, page_source)
             return job_detail
         except Exception as e:
             if attempt < max_retries - 1:
@@ -271,121 +225,137 @@ def crawl_job_details(driver, job_id, list_data):
                 f.write(driver.page_source)
             return None
 
-def download_page(driver, url, max_retries=3, existing_job_ids=None):
-    """爬取單頁 search list，先收集所有 job_id 及其資訊，再爬細節頁
-    步驟：開列表頁，等待載入，收集每個職缺的基本資訊，然後逐一爬細節"""
+def crawl_one_job(driver, job_id, row, http_session=None):
+    """依 --fetch_backend 爬取單個職缺
+    為什麼？HTTP 模式快很多，但 104 改版或擋請求時仍可退回瀏覽器，不會漏資料"""
+    if args.fetch_backend == "http" and http_session is not None:
+        job_detail = crawl_job_details_http(http_session, job_id, row, skill_matcher.extract, replay_dir=args.replay_dir,
+                                            rate_limiter=rate_limiter, archive=archive, cache=page_cache)
+        if job_detail or args.replay_dir:
+            return job_detail, False
+        print(f"HTTP 抓取失敗，改用瀏覽器: {job_id}")
+    return crawl_job_details(driver, job_id, row), True
+
+def create_detail_pool():
+    """依 --fetch_backend 建立細節頁 worker pool，每個 worker 有自己的 HTTP Session 或 Chrome"""
+    if args.fetch_backend == "http":
+        return DetailWorkerPool(args.workers,
+                                lambda: create_session(random.choice(user_agents)),
+                                lambda session: session.close())
+    # worker 的瀏覽器也從瀏覽器池拿，重建時直接換待命的
+    # 每個職缺前檢查記憶體（看門狗）與健康狀態，worker 的瀏覽器也會依 --max_driver_rss_mb 退役
+    return DetailWorkerPool(args.workers, driver_pool.acquire, driver_pool.retire,
+                            recycle_every=args.recycle_after, needs_recycle=driver_pool.needs_recycle)
+
+def write_to_sink(job_detail):
+    """爬完一個細節頁立刻寫入 JSONL（沒設定 --jsonl_path 或爬取失敗時不寫），原樣回傳"""
+    if sink is not None:
+        sink.write(job_detail)
+    return job_detail
+
+def detail_crawl_fn():
+    """worker pool 使用的 crawl_fn(resource, row)：resource 是 worker 自己的 HTTP Session 或 Chrome
+    每個 worker 爬完就寫入 JSONL，不用等整頁或整批完成"""
+    if args.fetch_backend == "http":
+        return lambda session, row: write_to_sink(crawl_job_details_http(session, row["job_id"], row, skill_matcher.extract,
+                                                                         replay_dir=args.replay_dir,
+                                                                         rate_limiter=rate_limiter, archive=archive,
+                                                                         cache=page_cache))
+    return lambda worker_driver, row: write_to_sink(crawl_job_details(worker_driver, row["job_id"], row))
+
+def crawl_page_details(driver, job_data_list, http_session=None, detail_pool=None):
+    """爬取一頁 job_data_list 的細節頁，回傳 (data, driver)
+    有 detail_pool 時平行爬取；HTTP 失敗的職缺最後用列表頁的瀏覽器補爬"""
+    data = []
+    job_count = 0
+    if detail_pool is not None:
+        results = detail_pool.map(detail_crawl_fn(), job_data_list)
+        remaining = []
+        for row, job_detail in zip(job_data_list, results):
+            if job_detail:
+                data.append(job_detail)
+                job_count += 1
+                print(f"已處理職缺 {row['job_id']}，總計 {job_count} 個")
+            elif args.fetch_backend == "http" and not args.replay_dir:
+                remaining.append(row)
+        if remaining:
+            print(f"HTTP 失敗 {len(remaining)} 個職缺，改用瀏覽器補爬")
+    else:
+        remaining = job_data_list
+    # 逐一爬細節頁（單一 worker 或補爬）
+    for row in remaining:
+        job_id = row["job_id"]
+        try:
+            if detail_pool is not None:
+                job_detail, used_browser = crawl_job_details(driver, job_id, row), True
+            else:
+                job_detail, used_browser = crawl_one_job(driver, job_id, row, http_session)
+            if used_browser:
+                # 記錄使用次數並做健康檢查，次數或記憶體超過上限、或瀏覽器已失效就換待命的
+                driver = driver_pool.maintain(driver)
+            write_to_sink(job_detail)
+            if job_detail:
+                data.append(job_detail)
+                job_count += 1
+                print(f"已處理職缺 {job_id}，總計 {job_count} 個")
+        except Exception as e:
+            print(f"爬取細節頁 {job_id} 失敗: {str(e)}")
+            continue
+    return data, driver
+
+def collect_page_jobs(driver, url, max_retries=3, existing_job_ids=None, page=None):
+    """爬取單頁 search list，收集所有新職缺的 job_id 及其 list 頁資訊（page：這頁的頁數，用來檢查讀到的總頁數）
+    步驟：開列表頁，等待載入，收集每個職缺的基本資訊（不爬細節頁）"""
     for attempt in range(max_retries):
         try:
-            driver.get(url)
-            time.sleep(10)
-            print(f"頁面標題: {driver.title}")
-            if "Just a moment..." in driver.title:
-                print("檢測到 Cloudflare，等待繞過...")
-                time.sleep(random.uniform(180, 240))
-                print(f"Cloudflare 等待後標題: {driver.title}")
-                print("請在瀏覽器完成 Cloudflare 驗證，然後按 Enter 繼續")
-                input()
-            # 移除滾動，避免無限滾動載入多頁
-            print("不進行滾動，僅抓取初始頁面內容")
-            time.sleep(random.uniform(10, 20))  # 等待頁面穩定
-            page_source = driver.page_source
-            with open(f"page_source_attempt_{attempt + 1}.html", "w", encoding="utf-8") as f:
-                f.write(page_source)
-            print(f"已存頁面到 page_source_attempt_{attempt + 1}.html")
-            soup = BeautifulSoup(page_source, 'html.parser')
-            containers = soup.find_all('div', class_='info-container')
-            dates = soup.find_all('div', class_='date-container')
-            print(f"BeautifulSoup 找到 info-container 數: {len(containers)}")
-            print(f"BeautifulSoup 找到日期元素數: {len(dates)}")
-            # 等待職缺元素
-            WebDriverWait(driver, 60).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.info-container"))
-            )
-            time.sleep(random.uniform(10, 20))
-            # 收集所有 job_id 及其 list 頁資訊
-            job_elements = driver.find_elements(By.CSS_SELECTOR, "div.info-container")
-            print(f"URL: {url}, 找到職缺數: {len(job_elements)}, 嘗試: {attempt + 1}/{max_retries}")
-            if len(job_elements) == 0:
+            # 快取裡有 --cache_ttl 內抓過的同一頁就直接用，不開瀏覽器、不佔速率限制
+            page_source = page_cache.get(url) if page_cache is not None else None
+            from_cache = page_source is not None
+            if from_cache:
+                print(f"使用快取的列表頁: {url}")
+            else:
+                rate_limiter.acquire(url)
+                driver.get(url)
+                wait_policy.until_document_ready(driver, "列表頁載入")
+                print(f"頁面標題: {driver.title}")
+                if "Just a moment..." in driver.title:
+                    print("檢測到 Cloudflare，等待繞過...")
+                    time.sleep(random.uniform(180, 240))
+                    print(f"Cloudflare 等待後標題: {driver.title}")
+                    print("請在瀏覽器完成 Cloudflare 驗證，然後按 Enter 繼續")
+                    input()
+                # 移除滾動，避免無限滾動載入多頁
+                print("不進行滾動，僅抓取初始頁面內容")
+                # 等到職缺卡片數量不再變化（前端渲染完成），取代固定等待 10~20 秒兩次
+                wait_policy.until_stable_count(driver, "列表頁職缺卡片", "div.info-container", timeout=60, required=True)
+                page_stats.record("列表頁", driver)
+                page_source = driver.page_source
+            # 讀得到搜尋結果總頁數時，不開超過總頁數的空白頁
+            page_policy.update_total_pages(parse_total_pages(page_source), page)
+            # 一次解析整頁 HTML，取代每張卡片十幾次 find_elements
+            rows = parse_list_page(page_source, url)
+            print(f"URL: {url}, 找到職缺數: {len(rows)}, 嘗試: {attempt + 1}/{max_retries}")
+            if len(rows) == 0:
                 print("警告：未找到職缺項目，可能選擇器失效")
                 return []
-            date_elements = driver.find_elements(By.CSS_SELECTOR, "div.date-container")
-            print(f"Selenium 找到日期元素數: {len(date_elements)}")
+            if page_cache is not None and not from_cache:
+                page_cache.put(url, page_source)  # 有職缺才存，Cloudflare 或空白頁不會被快取
             job_data_list = []  # 儲存 job_id 和 list 頁資訊
             processed_job_ids = set()  # 頁內去重
-            for idx in range(len(job_elements)):
-                # 每次迴圈重新查找
-                job_elements = driver.find_elements(By.CSS_SELECTOR, "div.info-container")
-                if idx >= len(job_elements):
-                    print(f"警告：索引 {idx} 超過職缺數，可能頁面更新")
-                    continue
-                job = job_elements[idx]
-                row = {}
-                try:
-                    title_elem = job.find_elements(By.CSS_SELECTOR, "h2 a[data-gtm-joblist=\"職缺-職缺名稱\"]")
-                    row["job_title"] = title_elem[0].text.strip() if title_elem else "N/A"
-                    job_id = "N/A"
-                    if title_elem and title_elem[0].get_attribute("href"):
-                        href = title_elem[0].get_attribute("href")
-                        match = re.search(r"/job/(\w+)", href)
-                        job_id = match.group(1) if match else "N/A"
-                    row["job_id"] = job_id
-                    if job_id in processed_job_ids:
-                        print(f"跳過頁內重複職缺: {job_id}")
-                        continue
-                    if existing_job_ids and job_id in existing_job_ids:
-                        print(f"跳過已存在職缺: {job_id}")
-                        continue
-                    processed_job_ids.add(job_id)
-                    company_elem = job.find_elements(By.CSS_SELECTOR, "a[data-gtm-joblist=\"職缺-公司名稱\"]")
-                    row["company"] = company_elem[0].text.strip() if company_elem else "N/A"
-                    industry_elem = job.find_elements(By.CSS_SELECTOR, "span[data-gtm-joblist*='職缺-產業'] a")
-                    row["industry"] = industry_elem[0].text.strip() if industry_elem else "N/A"
-                    location_elem = job.find_elements(By.CSS_SELECTOR, "div.info-tags a[data-gtm-joblist*=\"職缺-地區\"]")
-                    row["location"] = location_elem[0].text.strip() if location_elem else "N/A"
-                    experience_elem = job.find_elements(By.CSS_SELECTOR, "div.info-tags a[data-gtm-joblist*=\"職缺-經歷\"]")
-                    row["experience"] = experience_elem[0].text.strip() if experience_elem else "N/A"
-                    education_elem = job.find_elements(By.CSS_SELECTOR, "div.info-tags a[data-gtm-joblist*=\"職缺-學歷\"]")
-                    row["education"] = education_elem[0].text.strip() if education_elem else "N/A"
-                    salary_elem = job.find_elements(By.CSS_SELECTOR, "div.info-tags a[data-gtm-joblist*=\"職缺-薪資\"]")
-                    salary = salary_elem[0].text.strip() if salary_elem else "N/A"
-                    row["salary"] = salary
-                    min_salary, max_salary, avg_salary, salary_note = parse_salary(salary)
-                    row["salary_min"] = min_salary
-                    row["salary_max"] = max_salary
-                    row["salary_avg"] = avg_salary
-                    row["salary_note"] = salary_note
-                    tags_elem = job.find_elements(By.CSS_SELECTOR, "div.info-othertags a")
-                    row["tags"] = ", ".join([tag.text.strip() for tag in tags_elem]) if tags_elem else "N/A"
-                    date_elements = driver.find_elements(By.CSS_SELECTOR, "div.date-container")
-                    if idx < len(date_elements):
-                        row["update_date"] = date_elements[idx].text.strip()
-                    else:
-                        row["update_date"] = "N/A"
-                        print("警告：日期元素數量不匹配")
-                    row["source_url"] = url
-                    job_data_list.append(row)
-                except Exception as e:
-                    print(f"收集職缺 {idx} 資訊失敗: {str(e)}")
-                    continue
-            # 逐一爬細節頁
-            data = []
-            job_count = 0
-            for row in job_data_list:
+            for row in rows:
                 job_id = row["job_id"]
-                try:
-                    job_detail = crawl_job_details(driver, job_id, row)
-                    if job_detail:
-                        data.append(job_detail)
-                        job_count += 1
-                        print(f"已處理職缺 {job_id}，總計 {job_count} 個")
-                    # 每 30 個職缺重啟瀏覽器
-                    if job_count % 30 == 0:
-                        print(f"處理 {job_count} 個職缺後重啟瀏覽器...")
-                        driver = restart_driver(driver, args)
-                except Exception as e:
-                    print(f"爬取細節頁 {job_id} 失敗: {str(e)}")
+                if job_id in processed_job_ids:
+                    print(f"跳過頁內重複職缺: {job_id}")
+                    continue
+                if planner is None and existing_job_ids and job_id in existing_job_ids:
+                    print(f"跳過已存在職缺: {job_id}")
                     continue
-            return data
+                processed_job_ids.add(job_id)
+                job_data_list.append(row)
+            if planner is not None:
+                # 增量模式：和資料庫比對更新日期與卡片內容，只留下新的或有更新的職缺
+                job_data_list = planner.plan(job_data_list)
+            return job_data_list
         except Exception as e:
             if attempt < max_retries - 1:
                 print(f"請求錯誤，URL: {url}, 錯誤: {e}, 嘗試: {attempt + 1}/{max_retries}")
@@ -395,42 +365,108 @@ def download_page(driver, url, max_retries=3, existing_job_ids=None):
             return []
     return []
 
+def crawl_and_commit(driver, job_data_list, http_session=None, detail_pool=None):
+    """爬一批職缺的細節頁，存檔後在佇列標成 done，沒爬到的標成 failed（之後依退避時間重試）
+    回傳 driver，因為爬細節時瀏覽器可能被重啟"""
+    if not job_data_list:
+        return driver
+    data, driver = crawl_page_details(driver, job_data_list, http_session, detail_pool)
+    save_data(data, args.output_csv, args.query_params)
+    done_ids = {str(job_detail["job_id"]) for job_detail in data}
+    job_queue.mark_done(done_ids)
+    failed_ids = [str(row["job_id"]) for row in job_data_list if str(row["job_id"]) not in done_ids]
+    if failed_ids:
+        job_queue.mark_failed(failed_ids, "細節頁爬取失敗")
+        print(f"{len(failed_ids)} 個職缺失敗，已排入稍後重試")
+    return driver
+
+def process_ready_jobs(driver, label, http_session=None, detail_pool=None, batch_size=20):
+    """處理佇列中可爬的職缺：上次中斷時還沒爬的（pending），以及退避時間已到的失敗職缺"""
+    ready = job_queue.ready_jobs()
+    # 已經在資料庫的（例如存檔後、標成 done 前中斷，或從 JSONL 補回的）直接標成 done
+    # 增量模式例外：佇列裡的可能是判斷有更新、要重爬的舊職缺
+    if not args.incremental:
+        already_saved = {str(row["job_id"]) for row in ready if str(row["job_id"]) in id_index}
+        if already_saved:
+            job_queue.mark_done(list(already_saved))
+            ready = [row for row in ready if str(row["job_id"]) not in already_saved]
+    if not ready:
+        return driver
+    print(f"{label}: {len(ready)} 個職缺")
+    for i in range(0, len(ready), batch_size):
+        driver = crawl_and_commit(driver, ready[i:i + batch_size], http_session, detail_pool)
+    return driver
+
+def run_pipelined_crawl(driver, start_page, existing_job_ids, checkpoint_file):
+    """--pipeline 模式：列表頁和細節頁同時進行
+    列表頁用主瀏覽器，細節頁由 worker pool 自己的 Chrome 或 HTTP Session 處理；
+    HTTP 失敗的職缺在 pipeline 結束後用主瀏覽器補爬"""
+    detail_pool = create_detail_pool()
+    pages = [(page, f"{args.base_url}?{args.query_params}&{args.pagination.format(page=page)}")
+             for page in range(start_page, args.end_page + 1)]
+    page_of_url = {url: page for page, url in pages}
+    crawl_fn = detail_crawl_fn()
+
+    def list_fn(url):
+        nonlocal driver
+        driver = driver_pool.maintain(driver)
+        # 列表頁一抓完就寫進佇列，pipeline 中斷時還沒爬的職缺下次會接續
+        return job_queue.enqueue(collect_page_jobs(driver, url, 3, existing_job_ids, page_of_url[url]), page_of_url[url],
+                                 requeue=args.incremental)
+
+    def commit_fn(data):
+        save_data(data, args.output_csv, args.query_params)
+        job_queue.mark_done(job_detail["job_id"] for job_detail in data)
+
+    try:
+        saved, failed = run_pipeline(
+            pages,
+            list_fn,
+            crawl_fn,
+            detail_pool,
+            commit_fn,
+            lambda page: save_checkpoint(page, checkpoint_file),
+            queue_size=args.queue_size,
+            commit_every=args.commit_every,
+            continue_fn=lambda page, job_data_list: page_policy.observe(page, len(job_data_list)),
+        )
+    finally:
+        detail_pool.close()
+    print(f"pipeline 完成，已存檔 {saved} 個職缺，失敗 {len(failed)} 個")
+    if failed and args.fetch_backend == "http" and not args.replay_dir:
+        print(f"改用瀏覽器補爬 {len(failed)} 個職缺")
+        driver = crawl_and_commit(driver, failed)
+    elif failed:
+        job_queue.mark_failed([row["job_id"] for row in failed], "細節頁爬取失敗")
+    return driver
+
+def jobcat_suffix(query_params):
+    """從 query_params 取 jobcat 後 4 碼，例如 jobcat=2007001022 → 1022"""
+    jobcat_match = re.search(r"jobcat=(\w+)", query_params)
+    jobcat = jobcat_match.group(1) if jobcat_match else "unknown"
+    return jobcat[-4:] if len(jobcat) > 4 else jobcat
+
 def save_data(data, output_csv, query_params, page=None, start_page=None):
-    """儲存資料到 CSV 和 JSON，確保去重
-    步驟：轉換列表成字串，產生檔名，讀舊檔合併，去重後寫入"""
+    """儲存資料到 SQLite（以 job_id upsert，只寫入這批資料）
+    為什麼？原本每次都要讀整個 CSV、合併、去重再重寫 CSV 和 JSON，資料越多越慢；
+    CSV / JSON 改由 export_data()（--export）或 python job_store.py export 需要時再產生"""
     if not data:
         print("無職缺資料可存")
         return
-    df = pd.DataFrame(data)
-    # 將列表欄位轉為逗號分隔字串，適合 CSV
-    for col in ['job_categories', 'skills', 'tools', 'work_skills']:
-        if col in df.columns:
-            df[col] = df[col].apply(lambda x: ','.join(x) if isinstance(x, list) else x)
-    current_date = datetime.now().strftime("%Y%m%d")
-    jobcat_match = re.search(r"jobcat=(\w+)", query_params)
-    jobcat = jobcat_match.group(1) if jobcat_match else "unknown"
-    jobcat_short = jobcat[-4:] if len(jobcat) > 4 else jobcat
+    written = store.upsert_jobs(data, jobcat_suffix(query_params))
+    id_index.sync(store)  # 只把這次新增的職缺加進索引檔
+    print(f"已存入資料庫: {store.db_path}（本次 {written} 筆，總計 {store.count()} 筆）")
+    if args.parquet_dir:
+        # 為什麼？Parquet 保留 list / 數值型別、可只讀需要的欄位，分析時比重讀整個 CSV 快
+        path = write_partition(data, args.parquet_dir, jobcat_suffix(query_params))
+        print(f"已寫入 Parquet: {path}")
+
+def export_data(output_csv, query_params):
+    """從資料庫匯出去重後的 CSV 和 JSON，檔名和原本 save_data 相同"""
+    jobcat_short = jobcat_suffix(query_params)
     base_name = output_csv.replace(".csv", "")
-    filename = f"{base_name}_jobcat_{jobcat_short}.csv"
-    json_filename = f"{base_name}_jobcat_{jobcat_short}.json"
-    # 如果要階段頁面紀錄:
-    # if page and start_page:
-    # filename = f"{base_name}_jobcat_{jobcat_short}_{current_date}_pages_{start_page}_to_{page}.csv"
-    # json_filename = f"{base_name}_jobcat_{jobcat_short}_{current_date}_pages_{start_page}_to_{page}.json"
-    # else:
-    # filename = f"{base_name}_jobcat_{jobcat_short}_{current_date}.csv"
-    # json_filename = f"{base_name}_jobcat_{jobcat_short}_{current_date}.json"
-    # 去重並附加到現有 CSV
-    if os.path.exists(filename):
-        existing_df = pd.read_csv(filename)
-        df = pd.concat([existing_df, df], ignore_index=True)
-    df.drop_duplicates(subset=['job_id'], keep='first', inplace=True)
-    df.to_csv(filename, index=False, encoding="utf-8-sig")
-    print(f"已存為 CSV: {filename}")
-    # 儲存 JSON
-    with open(json_filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    print(f"已存為 JSON: {json_filename}")
+    store.export_csv(f"{base_name}_jobcat_{jobcat_short}.csv", jobcat_short)
+    store.export_json(f"{base_name}_jobcat_{jobcat_short}.json", jobcat_short)
 
 def main():
     # 初始化 logging
@@ -443,64 +479,104 @@ def main():
     )
     logging.info("start")
     start_time = time.time()
-    global args  # 為了 restart_driver 使用
+    global args, rate_limiter, wait_policy, store, id_index, sink, job_queue, planner, page_policy, driver_pool, page_stats, watchdog, skill_matcher, archive, page_cache  # 為了各爬取函式使用
     args = parse_arguments()
+    skill_matcher = SkillMatcher.from_json(args.skill_dict)  # 技能字典只載入、建自動機一次
+    rate_limiter = HostRateLimiter(args.rps)
+    wait_policy = WaitPolicy(args.min_wait, args.wait_jitter, args.wait_timeout)
+    page_stats = PageWeightStats()
+    print(f"請求速率上限: 每秒 {args.rps} 個，細節頁 worker 數: {args.workers}")
     checkpoint_file = "checkpoint.json"
     last_page = load_checkpoint(checkpoint_file)
     start_page = max(args.start_page, last_page)
     print(f"從頁數 {start_page} 開始爬（上次斷點: {last_page}）")
-    existing_job_ids = load_existing_job_ids(args.existing_csv)
+    page_policy = PaginationPolicy(start_page, args.end_page, args.stop_after_known_pages)
+    store = JobStore(args.db_path)
+    id_index = open_index(store)  # {db_path}.ids，啟動時只補上次之後新增的職缺
+    recover_from_jsonl(store, id_index, args.jsonl_path, jobcat_suffix(args.query_params))
+    existing_job_ids = load_existing_job_ids(store, id_index, args.existing_csv, jobcat_suffix(args.query_params))
+    sink = JsonlSink(args.jsonl_path) if args.jsonl_path else None
+    archive = RawPageArchive(args.archive_dir) if args.archive_dir else None
+    page_cache = PageCache(args.cache_dir, args.cache_ttl, args.cache_max_mb) if args.cache_ttl > 0 else None
+    job_queue = JobQueue(args.queue_db, args.max_attempts, args.retry_delay)
+    print(f"職缺佇列狀態: {job_queue.counts()}")
     print(f"現有 job_id 數量: {len(existing_job_ids)}")
-    options = Options()
-    options.add_argument(f"user-agent={random.choice(user_agents)}")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--disable-web-security")
-    if args.headless:
-        options.add_argument("--headless=new")
+    planner = None
+    if args.incremental:
+        planner = IncrementalPlanner(store.list_fields(["update_date"] + FINGERPRINT_FIELDS))
+        print("增量模式：比對列表頁更新日期與內容，只爬新的或有更新的職缺")
     driver = None
+    detail_pool = None
+    http_session = None
+    if args.fetch_backend == "http":
+        http_session = create_session(random.choice(user_agents))
+        print("細節頁使用 HTTP 模式" + (f"（replay: {args.replay_dir}）" if args.replay_dir else ""))
+    watchdog = ChromeWatchdog(args.max_driver_rss_mb)
+    driver_pool = DriverPool(lambda: create_driver(random.choice(user_agents), args.headless, args.block_resources),
+                             warm_size=args.warm_drivers, recycle_after=args.recycle_after, watchdog=watchdog)
     try:
-        driver = uc.Chrome(options=options)
+        driver = driver_pool.acquire()
         print("瀏覽器初始化成功")
-        all_data = []
+        if args.workers > 1 and not args.pipeline:
+            detail_pool = create_detail_pool()
         try:
-            for page in range(start_page, args.end_page + 1):
-                url = f"{args.base_url}?{args.query_params}&{args.pagination.format(page=page)}"
-                page_data = download_page(driver, url, max_retries=3, existing_job_ids=existing_job_ids)
-                if page_data:
-                    all_data.extend(page_data)
-                save_checkpoint(page, checkpoint_file)
-                if (page % 5 == 0 or page == args.end_page) and all_data:
-                    save_data(all_data, args.output_csv, args.query_params, page, start_page)
-                    all_data = []  # 清空記憶體
-                print(f"第 {page} 頁完成（包含細節）")
-                time.sleep(random.uniform(5, 10))
-            if all_data:
-                save_data(all_data, args.output_csv, args.query_params)
+            # 先接續上次中斷時還沒爬完的職缺，不用重開列表頁
+            driver = process_ready_jobs(driver, "接續上次未完成的職缺", http_session, detail_pool)
+            if args.pipeline:
+                driver = run_pipelined_crawl(driver, start_page, existing_job_ids, checkpoint_file)
+            else:
+                for page in range(start_page, args.end_page + 1):
+                    url = f"{args.base_url}?{args.query_params}&{args.pagination.format(page=page)}"
+                    driver = driver_pool.maintain(driver)
+                    job_data_list = collect_page_jobs(driver, url, max_retries=3, existing_job_ids=existing_job_ids, page=page)
+                    job_data_list = job_queue.enqueue(job_data_list, page, requeue=args.incremental)
+                    # 職缺已寫進佇列才前進斷點，中斷後不會跳過這頁的職缺
+                    save_checkpoint(page, checkpoint_file)
+                    keep_going = page_policy.observe(page, len(job_data_list))
+                    # 每頁爬完就存檔（SQLite upsert 只寫這一頁），不再累積 5 頁
+                    driver = crawl_and_commit(driver, job_data_list, http_session, detail_pool)
+                    print(f"第 {page} 頁完成（包含細節）")
+                    if not keep_going:
+                        break
+            # 退避時間已到的失敗職缺再試一次，其餘留給下次執行
+            driver = process_ready_jobs(driver, "重試失敗的職缺", http_session, detail_pool)
         except KeyboardInterrupt:
-            print("偵測到手動中斷 (Ctrl+C)，儲存當前結果...")
-            if all_data:
-                save_data(all_data, args.output_csv, args.query_params, args.end_page, args.start_page)
-            print("已儲存當前爬取結果，並去重複。")
+            print("偵測到手動中斷 (Ctrl+C)，已完成的職缺都已存檔，下次執行會從佇列接續")
             # ... 爬蟲程式結束log（例如 download_page 迴圈）
             end_time = time.time()
             logging.info(f"end total: {end_time - start_time:.2f} s")
     except Exception as e:
         print(f"程式執行錯誤: {e}")
     finally:
-        if driver:
-            try:
-                driver.quit()
-                print("瀏覽器已關閉")
-            except Exception as e:
-                print(f"關閉瀏覽器時發生錯誤，已忽略: {e}")
+        wait_policy.summary()
+        page_stats.summary(args.block_resources)
+        if planner is not None:
+            planner.summary()
+        page_policy.summary()
+        if args.export:
             try:
-                terminated = cleanup_chrome_processes()
-                print(f"清理終止 {terminated} 個進程")
+                export_data(args.output_csv, args.query_params)
             except Exception as e:
-                print(f"清理進程時發生錯誤，已忽略: {e}")
+                print(f"匯出 CSV/JSON 時發生錯誤: {e}")
+        id_index.summary()
+        store.close()
+        if page_cache is not None:
+            page_cache.summary()
+            page_cache.close()
+        print(f"職缺佇列狀態: {job_queue.counts()}")
+        job_queue.close()
+        if sink is not None:
+            sink.close()
+            print(f"本次共寫入 JSONL {sink.written} 筆: {args.jsonl_path}")
+        if detail_pool:
+            detail_pool.close()
+            print("細節頁 worker 已關閉")
+        driver_pool.close(driver)
+        print("瀏覽器已關閉")
+        # 只清理自己開的瀏覽器進程樹的殘留進程，不會動到使用者自己開的 Chrome
+        terminated = watchdog.reap_all()
+        print(f"清理終止 {terminated} 個進程")
+        watchdog.summary()
 
 if __name__ == "__main__":
     main()
@@ -6,16 +6,23 @@ import pandas as pd
 import time
 import random
 import json
-import re
 import socket
+import urllib.error
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 import undetected_chromedriver as uc
 from selenium.common.exceptions import WebDriverException
 from typing import List, Dict, Optional
 import argparse
+from job_detail_parser import parse_job_detail
+from job_wait import WaitPolicy
+from job_checkpoint import JobQueue
+from job_jsonl_sink import JsonlSink, load_latest
+from job_driver_pool import DriverPool
+from job_watchdog import ChromeWatchdog
+from job_browser import apply_resource_blocking, PageWeightStats
+from job_skills import SkillMatcher
+from job_archive import RawPageArchive
 
 # 設定 Selenium 選項
 def get_driver(max_retries=3):
@@ -27,7 +34,10 @@ def get_driver(max_retries=3):
             options.add_argument("--disable-blink-features=AutomationControlled")
             options.add_argument("--start-maximized")
             options.add_argument("--disable-gpu")
-            return uc.Chrome(options=options)
+            driver = uc.Chrome(options=options)
+            if args.block_resources:
+                apply_resource_blocking(driver)  # 擋掉圖片、字型、廣告與追蹤腳本
+            return driver
         except (socket.gaierror, urllib.error.URLError) as e:
             if attempt < max_retries - 1:
                 print(f"網路錯誤，嘗試 {attempt + 1} 失敗: {str(e)}，重試中...")
@@ -35,39 +45,71 @@ def get_driver(max_retries=3):
                 continue
             raise Exception(f"無法初始化瀏覽器，網路錯誤: {str(e)}")
 
-# 全局瀏覽器實例
-driver = get_driver()
-
-# 讀取 CSV 檔案
-csv_file = 'job_data_jobcat_1022_20251019.csv'
-df = pd.read_csv(csv_file)
-
-# 解析命令行參數
+# 解析命令行參數（先解析參數，--help 時不用開瀏覽器）
 parser = argparse.ArgumentParser(description="Crawl 104 job details")
-parser.add_argument("--start_idx", type=int, default=0, help="Start index of job IDs")
-parser.add_argument("--end_idx", type=int, default=len(df), help="End index of job IDs")
+parser.add_argument("--start_idx", type=int, default=0,
+                    help="Optional: only enqueue job IDs from this index (resume is handled by the job queue)")
+parser.add_argument("--end_idx", type=int, default=None, help="Optional: only enqueue job IDs before this index")
+parser.add_argument("--queue_db", default="job_detail_queue.db", help="Per-job work queue (pending / done / failed)")
+parser.add_argument("--jsonl_path", default="detailed_job_data.jsonl",
+                    help="Append-only JSONL where each crawled job is written immediately")
+parser.add_argument("--max_attempts", type=int, default=3, help="Maximum attempts per job")
+parser.add_argument("--min_wait", type=float, default=3.0, help="Minimum seconds per page wait (after ready)")
+parser.add_argument("--wait_jitter", type=float, default=3.0, help="Extra random seconds added to the minimum wait")
+parser.add_argument("--block_resources", action="store_true", default=False,
+                    help="Block images, fonts, ads and analytics scripts via CDP to cut page weight")
+parser.add_argument("--recycle_after", type=int, default=30, help="Replace the browser after this many pages")
+parser.add_argument("--max_driver_rss_mb", type=float, default=None,
+                    help="Replace the browser when its process tree uses more memory than this (MB)")
+parser.add_argument("--archive_dir", default="raw_pages",
+                    help="Archive each fetched page (gzip) here so job_archive.py reextract can re-parse without recrawling; empty to disable")
+parser.add_argument("--skill_dict", default=None,
+                    help="Skill dictionary JSON (canonical names, synonyms, exclusions); defaults to skill_dictionary.json")
 args = parser.parse_args()
 
-# 儲存結果的列表
-job_data: List[Dict] = []
+# 缺值預設：本程式輸出的擅長工具原本預設為 ["不拘"]（整合版為 ["--"]），維持不變，下游分析看到的值一致
+DETAIL_DEFAULTS = {"tools": ["不拘"]}
 
-def extract_skills(text: str) -> List[str]:
-    """提取技能關鍵字，擴展以涵蓋更多資料工程技能"""
-    skills_pattern = r'(MySQL|PostgreSQL|MS SQL|MongoDB|Redis|AWS|GCP|Cloud SQL|CI/CD|IaC|GDPR|ASP.NET|MVC|C#|SQL|SAP|S/4 HANA|JavaScript|Python|Java|Docker|Kubernetes|Hadoop|Spark|Kafka|Airflow|Talend|Luigi|Tableau|Power BI|Looker|Scala|R|Pandas|NumPy|Terraform|Helm|Jenkins|Elasticsearch|Snowflake|Databricks)'
-    skills = re.findall(skills_pattern, text, re.IGNORECASE)
-    return list(set(skills)) if skills else []
+# 技能字典：和整合版爬蟲共用同一份，技能名稱一致
+skill_matcher = SkillMatcher.from_json(args.skill_dict)
 
-def extract_field_value(rows: List, keyword: str, default: str = "未知") -> str:
-    """提取指定關鍵字的欄位值"""
-    for row in rows:
-        try:
-            title_elem = row.find_element(By.CSS_SELECTOR, "h3.h3")
-            if keyword in title_elem.text:
-                value_elem = row.find_element(By.CSS_SELECTOR, "div.t3.mb-0")
-                return value_elem.text.strip()
-        except:
-            continue
-    return default
+# 列表頁 CSV（啟動時分批讀進職缺佇列，不整個載入記憶體）
+csv_file = 'job_data_jobcat_1022_20251019.csv'
+
+# 瀏覽器池：背景維持一個待命瀏覽器，換瀏覽器時不用冷啟動
+# 看門狗追蹤瀏覽器進程樹的記憶體，結束時只清理自己開的殘留進程
+watchdog = ChromeWatchdog(args.max_driver_rss_mb)
+driver_pool = DriverPool(get_driver, warm_size=1, recycle_after=args.recycle_after, watchdog=watchdog)
+driver = driver_pool.acquire()
+
+# 依頁面就緒訊號等待，記錄每次實際等待秒數
+wait_policy = WaitPolicy(args.min_wait, args.wait_jitter)
+page_stats = PageWeightStats()  # 每頁下載量與載入時間
+
+# 職缺工作佇列：每個 job_id 的 pending / done / failed 狀態存在 SQLite
+# 為什麼？原本要手動用 --start_idx/--end_idx 分批，中斷後得自己算從哪裡接；
+# 現在重跑同一個指令，只會爬還沒完成的職缺和退避時間已到的失敗職缺
+job_queue = JobQueue(args.queue_db, args.max_attempts)
+
+def enqueue_from_csv(path, start_idx=0, end_idx=None, chunksize=5000):
+    """分批讀列表 CSV（只讀 start_idx 到 end_idx 的列）加入佇列，回傳讀到的筆數
+    為什麼？原本一載入就把整個 CSV 讀成 DataFrame 再逐列 iterrows，歷史資料越多啟動越慢、越吃記憶體；
+    已在佇列中的職缺 enqueue 不會覆蓋狀態，每次啟動重讀也不會重爬"""
+    nrows = None if end_idx is None else max(end_idx - start_idx, 0)
+    total = 0
+    for chunk in pd.read_csv(path, dtype={"job_id": str}, skiprows=range(1, start_idx + 1), nrows=nrows, chunksize=chunksize):
+        rows = chunk.to_dict("records")
+        job_queue.enqueue(rows)
+        total += len(rows)
+    return total
+
+enqueue_from_csv(csv_file, args.start_idx, args.end_idx)
+print(f"職缺佇列狀態: {job_queue.counts()}")
+
+# 每個職缺爬完立刻寫入 JSONL，中斷也不會遺失已爬的結果
+sink = JsonlSink(args.jsonl_path)
+# 原始頁面封存：之後改了解析規則，用 python job_archive.py reextract 重新解析即可，不用重爬
+archive = RawPageArchive(args.archive_dir) if args.archive_dir else None
 
 def crawl_job_details(job_id: str, original_data: Dict) -> Optional[Dict]:
     """
@@ -78,73 +120,25 @@ def crawl_job_details(job_id: str, original_data: Dict) -> Optional[Dict]:
     for attempt in range(max_retries):
         try:
             driver.get(url)
-            # 滾動頁面確保內容載入
-            for _ in range(3):
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(random.uniform(1, 3))
+            wait_policy.until_document_ready(driver, "細節頁載入")
+            # 滾動頁面觸發延遲載入的區塊
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
 
             # 等待頁面載入，嘗試多個選擇器
             elements = [
                 (By.CSS_SELECTOR, "p.job-description__content"),
                 (By.XPATH, "//h2[contains(text(), '工作內容')]/following-sibling::p[contains(@class, 'job-description__content')]"),
             ]
-            job_description = None
-            for by, selector in elements:
-                try:
-                    WebDriverWait(driver, 20).until(EC.presence_of_element_located((by, selector)))
-                    job_description = driver.find_element(by, selector).text.strip()
-                    break
-                except:
-                    continue
-            if not job_description:
+            # 工作內容出現就解析；WaitPolicy 會補足隨機最短等待，取代載入後固定等 5~15 秒
+            if not wait_policy.until_present(driver, "細節頁工作內容", elements, timeout=20):
                 raise Exception("無法找到工作內容")
+            page_stats.record("細節頁", driver)
 
-            time.sleep(random.uniform(5, 15))
-
-            # 緩存所有 rows 減少查詢
-            rows = driver.find_elements(By.CSS_SELECTOR, "div.job-description-table div.list-row")
-
-            # 提取資料
-            job_detail = {
-                "job_id": job_id,
-                **{k: v for k, v in original_data.items() if pd.notna(v)}
-            }
-
-            # 工作內容
-            job_detail["job_description"] = job_description
-
-            # 提取並合併技能
-            skills_from_description = extract_skills(job_description)
-            other_elem = driver.find_elements(By.XPATH, "//h3[contains(text(), '其他條件')]/ancestor::div[contains(@class, 'list-row')]/following-sibling::div[contains(@class, 'list-row__data')]//div[contains(@class, 'job-requirement-table__data')]//p[contains(@class, 'm-0 r3 w-100')]")
-            other_conditions = other_elem[0].text.strip() if other_elem else "無"
-            skills_from_other = extract_skills(other_conditions)
-            job_detail["skills"] = list(set(skills_from_description + skills_from_other))
-
-            # 職務類別
-            job_categories = [cat.text.strip() for cat in driver.find_elements(By.CSS_SELECTOR, "div.category-item div.v-popper u")]
-            job_detail["job_categories"] = job_categories if job_categories else ["未知"]
-
-            # 其他欄位
-            job_detail["management_responsibility"] = extract_field_value(rows, "管理責任")
-            job_detail["work_shift"] = extract_field_value(rows, "上班時段")
-            job_detail["remote_work"] = extract_field_value(rows, "遠端工作")
-            job_detail["BT_EXP"] = extract_field_value(rows, "出差外派")
-
-            # 語文條件
-            language_elem = next((row.find_element(By.CSS_SELECTOR, "div.job-requirement-table div.list-row").text.strip() for row in rows if "語文條件" in row.find_element(By.CSS_SELECTOR, "h3.h3").text), "不拘")
-            job_detail["languages"] = language_elem
-
-            # 擅長工具
-            tools_elem = [tool.find_element(By.TAG_NAME, "u").text.strip() for tool in driver.find_elements(By.CSS_SELECTOR, "a.tools") if tool.find_elements(By.TAG_NAME, "u")]
-            job_detail["tools"] = tools_elem if tools_elem else ["不拘"]
-
-            # 工作技能
-            skills_elem = [skill.find_element(By.TAG_NAME, "u").text.strip() for skill in driver.find_elements(By.CSS_SELECTOR, "a.skills") if skill.find_elements(By.TAG_NAME, "u")]
-            job_detail["work_skills"] = skills_elem if skills_elem else ["不拘"]
-
-            # 其他條件
-            job_detail["other_conditions"] = other_conditions
-
+            # 只取一次 page_source，在本機一次解析所有欄位（job_detail_parser.py）
+            page_source = driver.page_source
+            if archive is not None:
+                archive.save_page(job_id, page_source, original_data)
+            job_detail = parse_job_detail(page_source, job_id, original_data, skill_matcher.extract, DETAIL_DEFAULTS)
             return job_detail
         except WebDriverException as e:
             if attempt < max_retries - 1 and "invalid session id" in str(e).lower():
@@ -163,43 +157,50 @@ def crawl_job_details(job_id: str, original_data: Dict) -> Optional[Dict]:
             return None
 
 def restart_driver():
-    """重啟瀏覽器以恢復 session"""
+    """換成待命瀏覽器以恢復 session（舊的在背景關閉，不用等冷啟動）"""
     global driver
-    if 'driver' in globals() and driver:
+    driver = driver_pool.swap(driver)
+
+def record_result(job_id, job_detail):
+    """寫入 JSONL 並更新佇列狀態"""
+    if job_detail:
+        sink.write(job_detail)
+        job_queue.mark_done([job_id])
+    else:
+        job_queue.mark_failed([job_id], "細節頁爬取失敗")
+
+# 只處理佇列中還沒完成的職缺
+ready = job_queue.ready_jobs()
+print(f"本次要處理 {len(ready)} 個職缺")
+try:
+    for row in ready:
+        job_id = row['job_id']
+        print(f"處理職缺: {job_id}")
         try:
-            driver.quit()
+            record_result(job_id, crawl_job_details(job_id, row))
+            # 記錄使用次數並做健康檢查：滿 --recycle_after 個、記憶體過高或瀏覽器已失效就換待命的
+            driver = driver_pool.maintain(driver)
+        except WebDriverException as e:
+            if "invalid session id" in str(e).lower():
+                print(f"Session 失效，自動重啟並繼續，{job_id} - {str(e)}")
+                restart_driver()
+                record_result(job_id, crawl_job_details(job_id, row))
+            else:
+                raise
         except Exception as e:
-            print(f"關閉瀏覽器時發生錯誤: {str(e)}")
-    driver = get_driver()
-    time.sleep(5)  # 等待新 session 穩定
-
-# 測試職缺，支援分批處理
-for index, row in df.iloc[args.start_idx:args.end_idx].iterrows():
-    job_id = row['job_id']
-    print(f"處理職缺: {job_id}")
-    try:
-        job_detail = crawl_job_details(job_id, row.to_dict())
-        if job_detail:
-            job_data.append(job_detail)
-        # 每 30 個職缺重啟一次瀏覽器
-        if (index + 1 - args.start_idx) % 30 == 0:
-            print(f"處理 {index + 1} 個職缺後重啟瀏覽器...")
-            restart_driver()
-    except WebDriverException as e:
-        if "invalid session id" in str(e).lower():
-            print(f"Session 失效，自動重啟並繼續，{job_id} - {str(e)}")
-            restart_driver()
-            job_detail = crawl_job_details(job_id, row.to_dict())
-            if job_detail:
-                job_data.append(job_detail)
-        else:
-            raise
-    except Exception as e:
-        print(f"意外錯誤: {job_id} - {str(e)}")
-        with open(f"error_{job_id}.html", "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
-
-# 將資料轉為 DataFrame 並存為 CSV
+            print(f"意外錯誤: {job_id} - {str(e)}")
+            job_queue.mark_failed([job_id], str(e))
+            with open(f"error_{job_id}.html", "w", encoding="utf-8") as f:
+                f.write(driver.page_source)
+except KeyboardInterrupt:
+    print("偵測到手動中斷 (Ctrl+C)，已完成的職缺都在 JSONL，重跑即可接續")
+finally:
+    sink.close()
+    print(f"職缺佇列狀態: {job_queue.counts()}")
+    job_queue.close()
+
+# 從 JSONL 取出所有已爬職缺（同一 job_id 保留最新），轉為 DataFrame 並存為 CSV
+job_data: List[Dict] = load_latest([args.jsonl_path])
 df_result = pd.DataFrame(job_data)
 # 將列表欄位轉為逗號分隔字串，適合 CSV
 for col in ['job_categories', 'skills', 'tools', 'work_skills']:
@@ -212,6 +213,10 @@ with open(output_file, 'w', encoding='utf-8') as f:
     json.dump(job_data, f, ensure_ascii=False, indent=2)
 
 # 關閉瀏覽器
-driver.quit()
+wait_policy.summary()
+page_stats.summary(args.block_resources)
+driver_pool.close(driver)
+watchdog.reap_all()
+watchdog.summary()
 print(f"資料已儲存至 {output_file} 和 detailed_job_data_jobcat_202510{time.localtime().tm_mday:02d}.csv")
 
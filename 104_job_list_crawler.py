@@ -5,7 +5,7 @@
 # 這是爬取 104 人力銀行資料工程師職缺的 Python 腳本。
 # 適合初學者學習網路爬蟲（Web Scraping）、Selenium 使用、資料處理（Pandas）。
 # 注意：爬蟲可能違反網站政策，請確保合法使用，並尊重網站的 robots.txt。
-# 執行前需安裝所需套件：pip install pandas selenium undetected-chromedriver psutil beautifulsoup4
+# 執行前需安裝所需套件：pip install pandas selenium undetected-chromedriver psutil lxml
 
 import pandas as pd  # 用來處理資料表格，像是 Excel 的 Python 版本
 import time  # 用來暫停程式，避免太快被網站偵測
@@ -13,13 +13,12 @@ import random  # 用來產生隨機數字，模擬人類行為
 import argparse  # 用來處理命令列輸入，讓程式更靈活
 from datetime import datetime  # 用來取得當前日期
 import re  # 用來處理文字正則表達式（Regex），例如解析薪資
-from selenium.webdriver.chrome.options import Options  # Selenium 的 Chrome 設定
-from selenium.webdriver.support.ui import WebDriverWait  # 用來等待網頁元素出現
-from selenium.webdriver.support import expected_conditions as EC  # 等待條件的定義
-from selenium.webdriver.common.by import By  # 用來指定網頁元素的尋找方式
-import undetected_chromedriver as uc  # 隱藏 Selenium 的偵測，避開反爬蟲
-import psutil  # 用來管理系統進程，清理 Chrome
 import os  # 用來處理檔案和系統命令
+from job_list_parser import parse_list_page  # 一次解析整頁 HTML，和整合版爬蟲共用
+from job_wait import WaitPolicy  # 依頁面狀態等待，取代固定 sleep
+from job_browser import create_driver, quit_driver, PageWeightStats  # 共用的 Chrome 設定（undetected-chromedriver）與頁面大小統計
+from job_watchdog import ChromeWatchdog  # 追蹤自己開的 Chrome 進程（psutil），只清理自己的殘留進程
+from job_page_cache import PageCache  # 依 URL 的壓縮頁面快取，開發時重跑不用再打 104
 
 # 在程式開始時清理 Chrome 進程
 # os.system("taskkill /im chrome.exe /f")  # 這行註解掉了，因為 Windows 專用；初學者可視情況開啟，強制關閉 Chrome
@@ -49,83 +48,39 @@ def parse_arguments():
     parser.add_argument("--output_csv", default="job_data.csv", help="輸出 CSV 檔名")
     parser.add_argument("--headless", action="store_true", default=False,
                         help="使用 headless 模式運行 Chrome（預設關閉）")  # headless 模式不開瀏覽器視窗，適合伺服器運行
+    # 等待設定：頁面就緒後至少等 min_wait + 隨機 0~wait_jitter 秒，避免動作太規律被偵測
+    parser.add_argument("--min_wait", type=float, default=1.0, help="頁面就緒後至少等待的秒數")
+    parser.add_argument("--wait_jitter", type=float, default=1.0, help="最短等待額外加上的隨機秒數上限")
+    parser.add_argument("--wait_timeout", type=float, default=30, help="等待頁面就緒的預設逾時秒數")
+    # 擋掉圖片、字型、廣告與追蹤腳本：我們只需要 HTML，頁面更快就緒、也省頻寬
+    parser.add_argument("--block_resources", action="store_true", default=False,
+                        help="擋掉圖片、字型、廣告與追蹤腳本（CDP），減少頁面下載量")
+    # Chrome 用太多記憶體時重開瀏覽器，避免長時間執行讓電腦開始用 swap 變很慢
+    parser.add_argument("--max_driver_rss_mb", type=float, default=None,
+                        help="Chrome 進程樹記憶體超過幾 MB 就重開瀏覽器（不設定則只在結束時清理殘留進程）")
+    # 頁面快取：--cache_ttl 秒內爬過的同一頁直接讀快取（壓縮存放，超過 --cache_max_mb 刪最久沒用的）
+    # 為什麼？改了解析規則要重跑時，不用再開瀏覽器、再等 104 一次
+    parser.add_argument("--cache_dir", default="page_cache", help="頁面快取資料夾")
+    parser.add_argument("--cache_ttl", type=float, default=0, help="頁面快取有效秒數（0 表示不使用快取）")
+    parser.add_argument("--cache_max_mb", type=float, default=500, help="頁面快取大小上限（MB）")
     return parser.parse_args()
 
-def cleanup_chrome_processes():
-    """清理殞地 Chrome 和 chromedriver 進程"""
-    # 這函式用來殺掉殘留的 Chrome 進程，避免程式卡住
-    # psutil 可以檢查系統所有進程
-    terminated = 0
-    try:
-        for proc in psutil.process_iter(['name']):
-            if proc.info['name'] in ['chrome.exe', 'chromedriver.exe']:
-                proc.kill()
-                terminated += 1
-                print(f"已終止進程: {proc.info['name']} (PID: {proc.pid})")
-        return terminated
-    except Exception as e:
-        print(f"清理進程時發生錯誤: {e}")
-        return terminated
-
-def parse_salary(salary):
-    """解析薪資，提取 min、max、avg 和 note"""
-    # 這函式用 Regex 解析不同格式的薪資文字，例如 "月薪40,000~60,000元"
-    # Regex 是文字匹配的工具，初學者可以想想成搜尋模式
-    if not salary or salary == "待遇面議":
-        return None, None, None, "無薪資資訊"
-
-    # 移除逗號
-    salary = salary.replace(",", "")
-
-    # 月薪範圍（例如 "月薪40,000~60,000元"）
-    match = re.match(r"月薪(\d+)(?:~(\d+))?元", salary)
-    if match:
-        min_salary = int(match.group(1))
-        max_salary = int(match.group(2)) if match.group(2) else None
-        avg_salary = (min_salary + max_salary) / 2 if max_salary else min_salary
-        note = "最低保證薪資" if not max_salary else ""
-        return min_salary, max_salary, avg_salary, note
-
-    # 年薪範圍（例如 "年薪600,000~1,200,000元"）
-    match = re.match(r"年薪(\d+)(?:~(\d+))?元", salary)
-    if match:
-        min_salary = int(match.group(1)) // 12
-        max_salary = int(match.group(2)) // 12 if match.group(2) else None
-        avg_salary = (min_salary + max_salary) / 2 if max_salary else min_salary
-        note = "年薪轉換為月薪"
-        return min_salary, max_salary, avg_salary, note
-
-    # 時薪（例如 "時薪180元"）
-    match = re.match(r"時薪(\d+)元", salary)
-    if match:
-        hourly = int(match.group(1))
-        min_salary = hourly * 8 * 22  # 假設 8 小時 × 22 天
-        max_salary = None
-        avg_salary = min_salary
-        note = "推估（時薪 × 8小時 × 22天）"
-        return min_salary, max_salary, avg_salary, note
-
-    # 日薪（例如 "日薪1,500元"）
-    match = re.match(r"日薪(\d+)元", salary)
-    if match:
-        daily = int(match.group(1))
-        min_salary = daily * 22  # 假設 22 天
-        max_salary = None
-        avg_salary = min_salary
-        note = "推估（日薪 × 22天）"
-        return min_salary, max_salary, avg_salary, note
-
-    return None, None, None, "無法解析薪資格式"
-
 # 104人力銀行search job list
-def download_page(driver, url, max_retries=1):
-    """爬取單頁職缺資料，返回 DataFrame"""
+def download_page(driver, url, max_retries=1, wait_policy=None, page_stats=None, page_cache=None):
+    """爬取單頁職缺資料，返回 DataFrame（page_cache 有這頁時直接解析快取內容，不開網頁）"""
     # 這是核心函式，用 Selenium 開瀏覽器抓取一頁資料
     # Selenium 模擬真人瀏覽，適合動態網頁；初學者記得安裝 ChromeDriver
+    # WaitPolicy 會輪詢頁面是否就緒（例如職缺數不再變化），就緒就繼續，不用每次都等滿固定秒數
+    wait_policy = wait_policy or WaitPolicy()
+    cached = page_cache.get(url) if page_cache is not None else None
+    if cached is not None:
+        data = parse_list_page(cached, url)
+        print(f"使用快取的列表頁: {url}, 找到職缺數: {len(data)}")
+        return pd.DataFrame(data)
     for attempt in range(max_retries):
         try:
             driver.get(url)  # 開啟網頁
-            time.sleep(10)  # 等待 10 秒，讓網頁載入
+            wait_policy.until_document_ready(driver, "列表頁載入")  # 等網頁載入完成
             print(f"頁面標題: {driver.title}")
 
             # 檢查 Cloudflare
@@ -137,105 +92,31 @@ def download_page(driver, url, max_retries=1):
                 input()  # 暫停，等使用者輸入
 
             # 滾動頁面
-            for _ in range(4):
+            for scroll in range(4):
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")  # 滾到底部載入更多內容
-                time.sleep(random.uniform(5, 10))  # 隨機等待
+                # 等新載入的職缺數量不再變化，取代每次隨機等 5~10 秒
+                wait_policy.until_stable_count(driver, f"滾動 {scroll + 1} 載入", "div.info-container", timeout=15)
 
-            # 存頁面 HTML
-            page_source = driver.page_source  # 取得網頁原始碼
-            with open(f"page_source_attempt_{attempt + 1}.html", "w", encoding="utf-8") as f:
-                f.write(page_source)
-            print(f"已存頁面到 page_source_attempt_{attempt + 1}.html")
+            # 等待穩定選擇器：職缺數量穩定才算載入完成，最多 45 秒
+            wait_policy.until_stable_count(driver, "列表頁職缺卡片", "div.info-container", timeout=45, required=True)
 
-            # 用 BeautifulSoup 檢查（學習靜態解析）
-            from bs4 import BeautifulSoup  # BeautifulSoup 是解析 HTML 的工具，比 Selenium 快但不處理 JavaScript
-            soup = BeautifulSoup(page_source, 'html.parser')
-            containers = soup.find_all('div', class_='info-container')
-            dates = soup.find_all('div', class_='date-container')
-            print(f"BeautifulSoup 找到 info-container 數: {len(containers)}")
-            print(f"BeautifulSoup 找到日期元素數: {len(dates)}")
+            if page_stats is not None:
+                page_stats.record("列表頁", driver)  # 記錄這頁的下載量與載入時間
 
-            # 等待穩定選擇器
-            WebDriverWait(driver, 45).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.info-container"))
-            )  # 等待元素出現，最多 45 秒
-            time.sleep(random.uniform(15, 30))  # 額外等待
+            page_source = driver.page_source  # 取得網頁原始碼
 
-            job_elements = driver.find_elements(By.CSS_SELECTOR, "div.info-container")  # 找所有職缺區塊
-            print(f"URL: {url}, 找到職缺數: {len(job_elements)}, 嘗試: {attempt + 1}/{max_retries}")
+            # 用 lxml 一次解析整頁（job_list_parser.py），不再對每個欄位呼叫 find_elements
+            # 為什麼？每次 find_elements 都要和瀏覽器來回溝通一次，一頁上百次很慢；拿到 HTML 後在本機解析快得多
+            data = parse_list_page(page_source, url)
+            print(f"URL: {url}, 找到職缺數: {len(data)}, 嘗試: {attempt + 1}/{max_retries}")
 
-            if len(job_elements) == 0:
+            if len(data) == 0:
                 print("警告：未找到職缺項目，可能選擇器失效或頁面未正確加載")
                 print(f"頁面前 15000 字元:\n{page_source[:15000]}")
                 return pd.DataFrame()  # 返回空 DataFrame
 
-            # 全域抓日期
-            date_elements = driver.find_elements(By.CSS_SELECTOR, "div.date-container")
-            print(f"Selenium 找到日期元素數: {len(date_elements)}")
-
-            data = []  # 存資料的列表
-            for idx, job in enumerate(job_elements):  # 迴圈處理每個職缺
-                row = {}  # 每筆資料的字典
-                # 職缺名稱
-                title_elem = job.find_elements(By.CSS_SELECTOR, "h2 a[data-gtm-joblist=\"職缺-職缺名稱\"]")
-                row["job_title"] = title_elem[0].text.strip() if title_elem else "N/A"
-
-                # 職缺 ID
-                job_id = "N/A"
-                if title_elem and title_elem[0].get_attribute("href"):
-                    href = title_elem[0].get_attribute("href")
-                    match = re.search(r"/job/(\w+)", href)  # 用 Regex 抓 ID
-                    job_id = match.group(1) if match else "N/A"
-                row["job_id"] = job_id
-
-                # 公司名稱
-                company_elem = job.find_elements(By.CSS_SELECTOR, "a[data-gtm-joblist=\"職缺-公司名稱\"]")
-                row["company"] = company_elem[0].text.strip() if company_elem else "N/A"
-
-                # 產業（用 XPath）
-                industry_elem = job.find_elements(By.XPATH, ".//span[contains(@data-gtm-joblist, '職缺-產業')]/a")
-                if industry_elem:
-                    row["industry"] = industry_elem[0].text.strip()  # 直接取 <a> 的文字
-                else:
-                    row["industry"] = "N/A"
-                    print("警告：未找到產業元素")
-
-                # 地區
-                location_elem = job.find_elements(By.CSS_SELECTOR, "div.info-tags a[data-gtm-joblist*=\"職缺-地區\"]")
-                row["location"] = location_elem[0].text.strip() if location_elem else "N/A"
-
-                # 經驗要求
-                experience_elem = job.find_elements(By.CSS_SELECTOR, "div.info-tags a[data-gtm-joblist*=\"職缺-經歷\"]")
-                row["experience"] = experience_elem[0].text.strip() if experience_elem else "N/A"
-
-                # 學歷要求
-                education_elem = job.find_elements(By.CSS_SELECTOR, "div.info-tags a[data-gtm-joblist*=\"職缺-學歷\"]")
-                row["education"] = education_elem[0].text.strip() if education_elem else "N/A"
-
-                # 薪資
-                salary_elem = job.find_elements(By.CSS_SELECTOR, "div.info-tags a[data-gtm-joblist*=\"職缺-薪資\"]")
-                salary = salary_elem[0].text.strip() if salary_elem else "N/A"
-                row["salary"] = salary
-                min_salary, max_salary, avg_salary, salary_note = parse_salary(salary)  # 呼叫解析函式
-                row["salary_min"] = min_salary
-                row["salary_max"] = max_salary
-                row["salary_avg"] = avg_salary
-                row["salary_note"] = salary_note
-
-                # 標籤
-                tags_elem = job.find_elements(By.CSS_SELECTOR, "div.info-othertags a")
-                row["tags"] = ", ".join([tag.text.strip() for tag in tags_elem]) if tags_elem else "N/A"
-
-                # 更新日期和企業認證（全域索引匹配）
-                if idx < len(date_elements):
-                    row["update_date"] = date_elements[idx].text.strip()
-                else:
-                    row["update_date"] = "N/A"
-                    print("警告：日期元素數量不匹配（可能廣告影響）")
-
-                row["source_url"] = url  # 記錄來源網址
-                data.append(row)  # 加到列表
-
+            if page_cache is not None:
+                page_cache.put(url, page_source)  # 有職缺才存進快取，空白頁或被擋的頁面不會被快取
             df = pd.DataFrame(data)  # 轉成 Pandas DataFrame
             if len(df) < 10:
                 print(f"警告：職缺數量 {len(df)} 低於預期，可能被反爬蟲限制")
@@ -275,30 +156,33 @@ def save_data(df, output_csv, query_params, page=None, start_page=None):
 def main():
     args = parse_arguments()  # 讀取命令列參數
 
-    options = Options()  # 設定 Chrome 選項
-    options.add_argument(f"user-agent={random.choice(user_agents)}")  # 隨機 UA
-    options.add_argument("--disable-blink-features=AutomationControlled")  # 隱藏自動化
-    options.add_argument("--start-maximized")  # 最大化視窗
-    options.add_argument("--disable-gpu")  # 關閉 GPU，穩定性
-    options.add_argument("--window-size=1920,1080")  # 設定視窗大小
-    options.add_argument("--disable-web-security")  # 關閉安全檢查
-
-    if args.headless:
-        options.add_argument("--headless=new")  # 無頭模式
-
+    # 看門狗：記下我們開的 Chrome 進程樹，背景量記憶體，結束時只清理這些進程
+    # 為什麼？原本的清理只比對 chrome.exe，在 Linux / macOS 抓不到，在 Windows 又會關掉你自己開的 Chrome
+    watchdog = ChromeWatchdog(args.max_driver_rss_mb)
     driver = None
     try:
-        driver = uc.Chrome(options=options)  # 啟動瀏覽器
-        print("瀏覽器初始化成功")
+        # Chrome 選項（隨機 UA、隱藏自動化、視窗大小、headless）統一在 job_browser.py 設定
+        driver = create_driver(random.choice(user_agents), args.headless, args.block_resources)  # 啟動瀏覽器
+        watchdog.register(driver)
+        print("瀏覽器初始化成功" + ("（已擋圖片、字型、廣告與追蹤腳本）" if args.block_resources else ""))
     except Exception as e:
         print(f"瀏覽器初始化失敗: {e}")
         return
 
+    wait_policy = WaitPolicy(args.min_wait, args.wait_jitter, args.wait_timeout)  # 所有頁面共用，最後印出等待統計
+    page_stats = PageWeightStats()  # 每頁下載量與載入時間，最後印出平均（可比較有無 --block_resources）
+    page_cache = PageCache(args.cache_dir, args.cache_ttl, args.cache_max_mb) if args.cache_ttl > 0 else None
     all_data = []  # 存所有頁資料
     try:
         for page in range(args.start_page, args.end_page + 1):  # 迴圈爬多頁
             url = f"{args.base_url}?{args.query_params}&{args.pagination.format(page=page)}"  # 組合 URL
-            df_page = download_page(driver, url)  # 爬一頁
+            rss = watchdog.over_limit(driver)
+            if rss is not None:  # 記憶體太高就重開瀏覽器
+                print(f"瀏覽器記憶體 {rss:.0f} MB 超過上限，重開瀏覽器")
+                quit_driver(driver)
+                watchdog.reap(driver)
+                driver = watchdog.register(create_driver(random.choice(user_agents), args.headless, args.block_resources))
+            df_page = download_page(driver, url, wait_policy=wait_policy, page_stats=page_stats, page_cache=page_cache)  # 爬一頁
             if not df_page.empty:
                 all_data.append(df_page)
 
@@ -322,17 +206,20 @@ def main():
     except Exception as e:
         print(f"程式執行錯誤: {e}")
     finally:
+        wait_policy.summary()  # 印出每種等待的平均秒數
+        page_stats.summary(args.block_resources)  # 印出每頁平均下載量與載入時間
+        if page_cache is not None:
+            page_cache.summary()  # 印出快取命中次數與大小
+            page_cache.close()
         if driver:
             try:
                 driver.quit()  # 關閉瀏覽器
                 print("瀏覽器已關閉")
             except Exception as e:
                 print(f"關閉瀏覽器時發生錯誤，已忽略: {e}")
-            try:
-                terminated = cleanup_chrome_processes()  # 清理進程
-                print(f"清理終止 {terminated} 個進程")
-            except Exception as e:
-                print(f"清理進程時發生錯誤，已忽略: {e}")
+        terminated = watchdog.reap_all()  # 只清理自己開的瀏覽器留下的進程
+        print(f"清理終止 {terminated} 個進程")
+        watchdog.summary()
 
 if __name__ == "__main__":
     main()  # 程式入口
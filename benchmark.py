@@ -0,0 +1,240 @@
+'''
+效能比較腳本：比較新舊做法的執行時間
+用法：
+    python benchmark.py list_parser --html fixtures/list_page_sample.html
+    python benchmark.py list_parser --html fixtures/list_page_sample.html --selenium   # 另外量 Selenium 逐欄位版本（需開 Chrome）
+    python benchmark.py page_weight --url https://www.104.com.tw/job/8ukbm   # 有無擋資源的下載量與載入時間（需開 Chrome）
+    python benchmark.py salary --csv 104_job_data_jobcat_1022_raw.csv --rows 50000   # 薪資解析：逐筆 vs 整欄向量化
+    python benchmark.py skills --extra_terms 500   # 技能比對：alternation 正規表示式 vs Aho-Corasick（字典變大時）
+    python benchmark.py features --rows 50000   # 分析衍生欄位：逐列 apply / iterrows vs 整欄運算
+'''
+
+import argparse  # 子命令與參數
+import os  # 組合 file:// 路徑
+import re  # 舊版 Selenium 解析用
+import time  # 計時
+
+def timed(fn, repeat):
+    """執行 fn repeat 次，回傳 (平均秒數, 最後一次結果)"""
+    result = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+def legacy_selenium_extract(driver, url):
+    """原本 download_page 的 Selenium 逐欄位擷取（每張卡片重新查 info-container / date-container）"""
+    from selenium.webdriver.common.by import By
+    from job_salary import parse_salary
+    rows = []
+    job_elements = driver.find_elements(By.CSS_SELECTOR, "div.info-container")
+    for idx in range(len(job_elements)):
+        job = driver.find_elements(By.CSS_SELECTOR, "div.info-container")[idx]
+        row = {}
+        title_elem = job.find_elements(By.CSS_SELECTOR, "h2 a[data-gtm-joblist=\"職缺-職缺名稱\"]")
+        row["job_title"] = title_elem[0].text.strip() if title_elem else "N/A"
+        job_id = "N/A"
+        if title_elem and title_elem[0].get_attribute("href"):
+            match = re.search(r"/job/(\w+)", title_elem[0].get_attribute("href"))
+            job_id = match.group(1) if match else "N/A"
+        row["job_id"] = job_id
+        company_elem = job.find_elements(By.CSS_SELECTOR, "a[data-gtm-joblist=\"職缺-公司名稱\"]")
+        row["company"] = company_elem[0].text.strip() if company_elem else "N/A"
+        industry_elem = job.find_elements(By.CSS_SELECTOR, "span[data-gtm-joblist*='職缺-產業'] a")
+        row["industry"] = industry_elem[0].text.strip() if industry_elem else "N/A"
+        for field, label in [("location", "地區"), ("experience", "經歷"), ("education", "學歷"), ("salary", "薪資")]:
+            elem = job.find_elements(By.CSS_SELECTOR, f"div.info-tags a[data-gtm-joblist*=\"職缺-{label}\"]")
+            row[field] = elem[0].text.strip() if elem else "N/A"
+        row["salary_min"], row["salary_max"], row["salary_avg"], row["salary_note"] = parse_salary(row["salary"])
+        tags_elem = job.find_elements(By.CSS_SELECTOR, "div.info-othertags a")
+        row["tags"] = ", ".join([tag.text.strip() for tag in tags_elem]) if tags_elem else "N/A"
+        date_elements = driver.find_elements(By.CSS_SELECTOR, "div.date-container")
+        row["update_date"] = date_elements[idx].text.strip() if idx < len(date_elements) else "N/A"
+        row["source_url"] = url
+        rows.append(row)
+    return rows
+
+def bench_list_parser(args):
+    from job_list_parser import parse_list_page
+    with open(args.html, "r", encoding="utf-8") as f:
+        page_source = f.read()
+    url = "file://" + os.path.abspath(args.html)
+    seconds, rows = timed(lambda: parse_list_page(page_source, url), args.repeat)
+    print(f"lxml 單次解析: {len(rows)} 筆，平均 {seconds * 1000:.2f} ms/頁（{args.repeat} 次）")
+    if not args.selenium:
+        return
+    from job_browser import create_driver
+    driver = create_driver("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/141.0.0.0 Safari/537.36",
+                           headless=True)
+    try:
+        driver.get(url)
+        selenium_repeat = max(1, args.repeat // 10)  # Selenium 版很慢，次數減少
+        selenium_seconds, selenium_rows = timed(lambda: legacy_selenium_extract(driver, url), selenium_repeat)
+        parse_seconds, _ = timed(lambda: parse_list_page(driver.page_source, url), selenium_repeat)
+    finally:
+        driver.quit()
+    print(f"Selenium 逐欄位: {len(selenium_rows)} 筆，平均 {selenium_seconds * 1000:.2f} ms/頁（{selenium_repeat} 次）")
+    print(f"page_source + lxml: 平均 {parse_seconds * 1000:.2f} ms/頁，加速 {selenium_seconds / parse_seconds:.1f} 倍")
+    mismatched = sum(1 for a, b in zip(rows, selenium_rows) if {**a, "source_url": ""} != {**b, "source_url": ""})
+    print(f"兩種做法欄位不一致的職缺數: {mismatched}")
+
+def load_and_measure(driver, url, settle):
+    """開頁面、等 load 完成再多等 settle 秒（讓延遲載入的資源也算進去），回傳 (page_weight, 經過秒數)"""
+    from job_browser import page_weight
+    start = time.perf_counter()
+    driver.get(url)
+    while driver.execute_script("return document.readyState") != "complete":
+        time.sleep(0.1)
+    elapsed = time.perf_counter() - start
+    time.sleep(settle)
+    return page_weight(driver), elapsed
+
+def bench_page_weight(args):
+    from job_browser import create_driver, quit_driver
+    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/141.0.0.0 Safari/537.36"
+    drivers = {"完整頁面": create_driver(user_agent, args.headless),
+               "擋資源": create_driver(user_agent, args.headless, block_resources=True)}
+    results = {label: [] for label in drivers}
+    try:
+        for url in args.url:
+            for _ in range(args.repeat):
+                for label, driver in drivers.items():  # 兩種交錯執行，減少網路狀況變化的影響
+                    weight, elapsed = load_and_measure(driver, url, args.settle)
+                    if weight:
+                        results[label].append((weight, elapsed))
+    finally:
+        for driver in drivers.values():
+            quit_driver(driver)
+    averages = {}
+    for label, rows in results.items():
+        if not rows:
+            print(f"{label}: 讀不到 Performance API 資料")
+            return
+        count = len(rows)
+        averages[label] = {
+            "kb": sum(w["bytes"] for w, _ in rows) / count / 1024,
+            "requests": sum(w["requests"] for w, _ in rows) / count,
+            "dom_ready_ms": sum(w["dom_ready_ms"] for w, _ in rows) / count,
+            "load_s": sum(elapsed for _, elapsed in rows) / count,
+        }
+        a = averages[label]
+        print(f"{label}: 平均 {a['kb']:.0f} KB、{a['requests']:.0f} 個請求、"
+              f"DOMContentLoaded {a['dom_ready_ms']:.0f} ms、載入完成 {a['load_s']:.2f} 秒（{count} 次）")
+    full, blocked = averages["完整頁面"], averages["擋資源"]
+    print(f"每頁省下 {full['kb'] - blocked['kb']:.0f} KB（{(1 - blocked['kb'] / full['kb']) * 100 if full['kb'] else 0:.0f}%），"
+          f"載入完成快 {full['load_s'] - blocked['load_s']:.2f} 秒")
+
+def bench_salary(args):
+    import pandas as pd
+    from job_salary import parse_salary, parse_salary_series
+    salary = pd.read_csv(args.csv, usecols=["salary"])["salary"]
+    salary = pd.concat([salary] * (-(-args.rows // len(salary))), ignore_index=True).iloc[:args.rows]  # 複製到指定筆數
+    scalar_seconds, scalar_rows = timed(lambda: [parse_salary(value) for value in salary], args.repeat)
+    vector_seconds, vectorized = timed(lambda: parse_salary_series(salary), args.repeat)
+    print(f"逐筆 parse_salary: {len(salary)} 筆，平均 {scalar_seconds * 1000:.1f} ms（{args.repeat} 次）")
+    print(f"整欄 parse_salary_series: 平均 {vector_seconds * 1000:.1f} ms，加速 {scalar_seconds / vector_seconds:.1f} 倍")
+    scalar = pd.DataFrame(scalar_rows, columns=vectorized.columns, index=salary.index)
+    mismatched = 0
+    for column in vectorized.columns:
+        expected = scalar[column] if column == "salary_note" else pd.to_numeric(scalar[column])
+        same = (vectorized[column] == expected) | (vectorized[column].isna() & expected.isna())
+        mismatched += int((~same).sum())
+    print(f"兩種做法結果不一致的欄位數: {mismatched}")
+
+def bench_skills(args):
+    import json
+    import random
+    import string
+    import pandas as pd
+    from job_skills import SkillMatcher, DEFAULT_DICTIONARY
+    texts = pd.read_csv(args.csv, usecols=["job_description"])["job_description"].fillna("").tolist()
+    with open(DEFAULT_DICTIONARY, "r", encoding="utf-8") as f:
+        entries = json.load(f)["skills"]
+    random.seed(0)
+    entries += [{"name": "".join(random.choices(string.ascii_lowercase, k=random.randint(4, 9)))}
+                for _ in range(args.extra_terms)]  # 模擬字典變大（隨機英文詞，幾乎不會比對到）
+    terms = [term for entry in entries for term in [entry["name"]] + entry.get("aliases", [])]
+    # 原本 extract_skills 的做法：一個 alternation 正規表示式 + IGNORECASE
+    pattern = re.compile(r"(?<!\w)(" + "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)) + r")(?!\w)",
+                         re.IGNORECASE)
+    regex_seconds, _ = timed(lambda: [pattern.findall(text) for text in texts], args.repeat)
+    matcher = SkillMatcher(entries)
+    matcher_seconds, found = timed(lambda: matcher.extract_many(texts), args.repeat)
+    print(f"字典 {len(terms)} 個寫法、{len(texts)} 份工作內容")
+    print(f"alternation 正規表示式: 平均 {regex_seconds * 1000:.0f} ms")
+    print(f"Aho-Corasick（含邊界規則與同義詞）: 平均 {matcher_seconds * 1000:.0f} ms，"
+          f"共比對到 {sum(len(skills) for skills in found)} 個技能")
+
+def legacy_features(df):
+    """原本 Job_list_Analize.py 的逐列做法：apply(fill_salary, axis=1)、company_size 的 lambda、iterrows 清理標題"""
+    import pandas as pd
+    from job_features import TITLE_NOISE
+    def fill_salary(row):
+        if pd.isna(row['salary_avg']):
+            experience = row['experience']
+            if any(x in experience for x in ['1年', '2年', '3年']):
+                return 57000
+            elif any(x in experience for x in ['4年', '5年']):
+                return 60000
+            elif any(x in experience for x in ['6年', '7年', '8年', '9年', '10年']):
+                return 65000
+            else:
+                return 50000
+        return row['salary_avg']
+    df['is_remote'] = df['tags'].str.contains('遠端工作', na=False)
+    df['is_listed'] = df['tags'].str.contains('上市上櫃', na=False)
+    df['company_size'] = df['company'].apply(lambda x: '大型' if any(kw in x for kw in ['國際', '集團', '股份', '科技', '電子']) else '中小型')
+    df['salary_avg'] = df.apply(fill_salary, axis=1)
+    df['title_clean'] = [re.sub(TITLE_NOISE, '', row['job_title'].lower()) for _, row in df.iterrows()]
+    return df
+
+def bench_features(args):
+    import pandas as pd
+    from job_features import add_features
+    from job_salary import parse_salary_series
+    source = pd.read_csv(args.csv, usecols=['job_title', 'company', 'experience', 'salary', 'tags'])
+    source = pd.concat([source] * (-(-args.rows // len(source))), ignore_index=True).iloc[:args.rows]
+    source['salary_avg'] = parse_salary_series(source['salary'])['salary_avg']
+    source['experience'] = source['experience'].fillna('')  # 原本的 fill_salary 遇到缺值會出錯
+    legacy_seconds, legacy = timed(lambda: legacy_features(source.copy()), args.repeat)
+    vector_seconds, vectorized = timed(lambda: add_features(source.copy()), args.repeat)
+    print(f"逐列 apply / iterrows: {len(source)} 筆，平均 {legacy_seconds * 1000:.0f} ms（{args.repeat} 次）")
+    print(f"整欄 add_features: 平均 {vector_seconds * 1000:.0f} ms，加速 {legacy_seconds / vector_seconds:.1f} 倍")
+    columns = ['is_remote', 'is_listed', 'company_size', 'salary_avg', 'title_clean']
+    mismatched = {column: int((legacy[column] != vectorized[column]).sum()) for column in columns}
+    print(f"兩種做法結果不一致的筆數: {mismatched}")
+
+def main():
+    parser = argparse.ArgumentParser(description="比較新舊做法的效能")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    list_parser = subparsers.add_parser("list_parser", help="列表頁：lxml 單次解析 vs Selenium 逐欄位")
+    list_parser.add_argument("--html", default="fixtures/list_page_sample.html", help="列表頁 HTML 檔")
+    list_parser.add_argument("--repeat", type=int, default=50, help="重複次數")
+    list_parser.add_argument("--selenium", action="store_true", default=False, help="同時量 Selenium 版本（需開 Chrome）")
+    list_parser.set_defaults(func=bench_list_parser)
+    weight_parser = subparsers.add_parser("page_weight", help="瀏覽器：有無擋資源的頁面下載量與載入時間")
+    weight_parser.add_argument("--url", action="append", required=True, help="要量的網址，可重複指定")
+    weight_parser.add_argument("--repeat", type=int, default=3, help="每個網址重複次數")
+    weight_parser.add_argument("--settle", type=float, default=2.0, help="load 完成後再等幾秒才讀統計")
+    weight_parser.add_argument("--headless", action="store_true", default=False, help="使用 headless 模式")
+    weight_parser.set_defaults(func=bench_page_weight)
+    salary_parser = subparsers.add_parser("salary", help="薪資解析：逐筆 parse_salary vs 整欄向量化")
+    salary_parser.add_argument("--csv", default="104_job_data_jobcat_1022_raw.csv", help="有 salary 欄位的 CSV 檔")
+    salary_parser.add_argument("--rows", type=int, default=50000, help="複製到幾筆再量（模擬回填歷史資料）")
+    salary_parser.add_argument("--repeat", type=int, default=3, help="重複次數")
+    salary_parser.set_defaults(func=bench_salary)
+    skills_parser = subparsers.add_parser("skills", help="技能比對：alternation 正規表示式 vs Aho-Corasick")
+    skills_parser.add_argument("--csv", default="104_job_data_jobcat_1022_raw.csv", help="有 job_description 欄位的 CSV 檔")
+    skills_parser.add_argument("--extra_terms", type=int, default=0, help="額外加入幾個隨機詞，模擬字典變大")
+    skills_parser.add_argument("--repeat", type=int, default=3, help="重複次數")
+    skills_parser.set_defaults(func=bench_skills)
+    features_parser = subparsers.add_parser("features", help="分析衍生欄位：逐列 apply / iterrows vs 整欄運算")
+    features_parser.add_argument("--csv", default="104_job_data_jobcat_1022_raw.csv", help="職缺 CSV 檔")
+    features_parser.add_argument("--rows", type=int, default=50000, help="複製到幾筆再量（模擬多個月的資料）")
+    features_parser.add_argument("--repeat", type=int, default=3, help="重複次數")
+    features_parser.set_defaults(func=bench_features)
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
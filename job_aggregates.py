@@ -0,0 +1,320 @@
+'''
+分析圖表用的彙總指標：每個指標只算一次，結果存到 {cache_dir}，依輸入資料的雜湊決定要不要重算
+為什麼？Job_list_Analize.py 的 exp_remote 用 pivot_table 算兩次、remote_industry 畫兩次，
+技能統計每張圖各自重建，而且每次執行都從 pd.read_csv 整份讀起。這裡：
+- 每個指標用 @metric 登記要用到的欄位，compute() 只算一次，所有圖表共用
+- 整份檔案的 SHA-256 和載入流程（衍生欄位的程式碼、技能字典）都和上次相同時，直接讀出上次的結果，連 CSV 都不用讀
+- 檔案有變（新爬的資料進來）時，對每個指標只雜湊它用到的欄位（加上指標本身和它呼叫的輔助函式、常數），
+  沒變的指標直接沿用，只重算輸入真的改變的指標
+    python job_aggregates.py 104_job_data_jobcat_1022_raw.csv          # 計算（或讀快取）並列出每個指標
+    python job_aggregates.py 104_job_data_jobcat_1022_raw.csv --force  # 全部重算
+'''
+
+import os  # 快取資料夾
+import json  # 快取清單
+import time  # 計時
+import pickle  # 指標結果（DataFrame / Series）
+import hashlib  # 檔案與欄位雜湊
+import inspect  # 指標程式碼改了也要重算
+import argparse  # 命令列
+import tempfile  # 先寫暫存檔再改名
+import re  # 雜湊常數時處理編譯好的正規表示式
+from collections import Counter  # 技能計數
+import pandas as pd  # 彙總計算
+from job_features import EXP_ORDER, add_features  # 經驗排序、衍生欄位
+from job_loader import load_jobs  # 有型別的 CSV 載入
+
+# 分析只需要這些欄位，不讀 job_description 等長文字欄位
+ANALYSIS_COLUMNS = ['job_id', 'job_title', 'company', 'industry', 'location', 'experience', 'education', 'salary', 'salary_avg', 'tags']
+# 技能統計只看這些技能（標準名稱，見 skill_dictionary.json）；交叉統計只看前 5 個
+SKILLS = ['Python', 'SQL', 'ETL', 'Big Data', 'Hadoop', 'Spark', 'AWS', 'GCP', 'Azure', 'Machine Learning', 'LLM', 'MongoDB', 'MySQL',
+          'Pandas', 'Tableau', 'Docker', 'Kubernetes', 'Data Analysis', 'Cloud', 'Power BI', 'TensorFlow', 'PyTorch']
+
+def load_analysis_frame(file_path):
+    """讀入職缺資料（CSV，或 job_parquet.py 寫出的 Parquet）並算好所有分析用的衍生欄位"""
+    if os.path.isdir(file_path) or file_path.endswith('.parquet'):
+        from job_parquet import read_jobs
+        df = read_jobs(file_path, columns=ANALYSIS_COLUMNS)
+    else:
+        # 依 schema 讀取（job_loader.py）：重複率高的欄位用 category、只讀分析用的欄位，舊檔缺欄位時不報錯
+        df = load_jobs(file_path, columns=ANALYSIS_COLUMNS, report=True)
+    # 舊的 raw CSV 只有 salary 字串、沒有 salary_avg：整欄一次解析（job_salary.py），不逐筆呼叫 parse_salary
+    if 'salary_avg' not in df.columns and 'salary' in df.columns:
+        from job_salary import parse_salary_series
+        df['salary_avg'] = parse_salary_series(df['salary'])['salary_avg']
+    df['experience'] = pd.Categorical(df['experience'], categories=EXP_ORDER, ordered=True)
+    add_features(df)
+    # 標題一次丟給技能比對引擎（job_skills.py，與爬蟲共用技能字典），每個標題只掃一次
+    from job_skills import default_matcher
+    df['title_skills'] = [[skill for skill in found if skill in SKILLS] for found in default_matcher().extract_many(df['job_title'])]
+    return df
+
+METRICS = {}  # 指標名稱 -> (計算函式, 用到的欄位)
+# 指標快取的版本：改了自動偵測不到的東西（例如外部模組的函式行為）時加 1，全部指標都會重算
+METRICS_VERSION = 1
+
+def metric(name, columns):
+    """登記一個指標：fn(df) 回傳彙總結果，columns 是它用到的欄位（決定何時要重算）"""
+    def register(fn):
+        METRICS[name] = (fn, list(columns))
+        return fn
+    return register
+
+@metric('title_head', ['job_title'])
+def title_head(df):
+    return df['job_title'].head(10)
+
+@metric('missing_counts', ANALYSIS_COLUMNS + ['is_remote', 'is_listed', 'company_size'])
+def missing_counts(df):
+    return df.drop(columns=['title_skills', 'title_clean', 'salary_imputed'], errors='ignore').isnull().sum()
+
+@metric('job_count', ['job_id'])
+def job_count(df):
+    return len(df)
+
+@metric('salary_frame', ['salary_avg', 'experience', 'is_remote'])
+def salary_frame(df):
+    """有薪資的職缺（分佈圖、箱形圖用），只留畫圖需要的欄位"""
+    return df.dropna(subset=['salary_avg'])[['salary_avg', 'experience', 'is_remote']].reset_index(drop=True)
+
+@metric('industry_counts', ['industry'])
+def industry_counts(df):
+    return df['industry'].value_counts().head(10)
+
+@metric('industry_salary', ['industry', 'salary_avg'])
+def industry_salary(df):
+    return (df.dropna(subset=['salary_avg']).groupby('industry', observed=True)['salary_avg']
+            .agg(['mean', 'median', 'count']).sort_values('count', ascending=False).head(10))
+
+@metric('location_salary', ['location', 'salary_avg'])
+def location_salary(df):
+    return df.dropna(subset=['salary_avg']).groupby('location', observed=True)['salary_avg'].agg(['mean', 'count']).reset_index()
+
+@metric('exp_counts', ['experience'])
+def exp_counts(df):
+    return df['experience'].value_counts()
+
+@metric('exp_industry', ['industry', 'experience', 'job_id'])
+def exp_industry(df):
+    return df.pivot_table(index='industry', columns='experience', values='job_id', aggfunc='count', fill_value=0, observed=True).head(10)
+
+@metric('exp_remote', ['experience', 'is_remote', 'job_id'])
+def exp_remote(df):
+    return df.pivot_table(index='experience', columns='is_remote', values='job_id', aggfunc='count', fill_value=0, observed=True)
+
+@metric('remote_counts', ['is_remote'])
+def remote_counts(df):
+    return df['is_remote'].value_counts()
+
+@metric('remote_industry', ['is_remote', 'industry', 'job_id'])
+def remote_industry(df):
+    return df[df['is_remote']].groupby('industry', observed=True)['job_id'].count().sort_values(ascending=False).head(10)
+
+@metric('remote_edu', ['is_remote', 'education', 'job_id'])
+def remote_edu(df):
+    return df[df['is_remote']].groupby('education', observed=True)['job_id'].count().sort_values(ascending=False)
+
+@metric('skill_counts', ['title_skills'])
+def skill_counts(df):
+    counts = Counter(skill for found in df['title_skills'] for skill in found)
+    return pd.DataFrame(counts.most_common(10), columns=['Skill', 'Count'])
+
+@metric('skill_salary', ['title_skills', 'salary_avg'])
+def skill_salary(df):
+    skill_jobs = df.dropna(subset=['salary_avg'])[['title_skills', 'salary_avg']].explode('title_skills').dropna(subset=['title_skills'])
+    return (skill_jobs.groupby('title_skills')['salary_avg'].agg(Mean_Salary='mean', Count='count')
+            .rename_axis('Skill').reset_index().sort_values('Mean_Salary', ascending=False).head(10))
+
+@metric('remote_skills', ['title_skills', 'is_remote'])
+def remote_skills(df):
+    counts = Counter(skill for found in df.loc[df['is_remote'], 'title_skills'] for skill in found)
+    return pd.DataFrame(counts.most_common(10), columns=['Skill', 'Count'])
+
+def _cross_skill_counts(df, column, label):
+    """某欄位（經驗、學歷）與前 5 技能的組合次數，取前 10"""
+    counts = Counter((value, skill) for value, found in zip(df[column], df['title_skills']) for skill in found if skill in SKILLS[:5])
+    return pd.DataFrame([(value, skill, count) for (value, skill), count in counts.most_common(10)],
+                        columns=[label, 'Skill', 'Count'])
+
+@metric('exp_skills', ['title_skills', 'experience'])
+def exp_skills(df):
+    return _cross_skill_counts(df, 'experience', 'Experience')
+
+@metric('edu_skills', ['title_skills', 'education'])
+def edu_skills(df):
+    return _cross_skill_counts(df, 'education', 'Education')
+
+def _code_names(code):
+    """程式碼物件（含裡面的 lambda、generator、comprehension）用到的全域名稱"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _code_names(const)
+    return names
+
+def code_digest(fn):
+    """指標函式的雜湊：自己的程式碼，加上遞迴用到的同模組輔助函式（例如 _cross_skill_counts）的程式碼
+    與常數（例如 SKILLS）的內容；輔助函式或常數改了，用到它們的指標也會重算"""
+    digest = hashlib.sha256(f'version={METRICS_VERSION};'.encode('utf-8'))
+    pending, seen = [fn], set()
+    while pending:
+        current = pending.pop()
+        if current.__name__ in seen:
+            continue
+        seen.add(current.__name__)
+        digest.update(inspect.getsource(current).encode('utf-8'))
+        for name in sorted(_code_names(current.__code__)):
+            value = current.__globals__.get(name)
+            if inspect.isfunction(value) and value.__module__ == fn.__module__:
+                pending.append(value)
+            elif isinstance(value, (list, tuple, dict, set, frozenset, str, int, float)):
+                digest.update(f'{name}={_constant_repr(value)};'.encode('utf-8'))
+    return digest.hexdigest()
+
+# 載入與衍生欄位用到的模組：這些模組或技能字典改了，同一份資料檔算出的欄位也會不同
+LOADER_MODULES = ['job_features', 'job_salary', 'job_skills', 'job_loader', 'job_parquet']
+
+def _constant_repr(value):
+    if isinstance(value, re.Pattern):
+        return f're({value.pattern!r}, {value.flags})'  # repr() 會截斷長的正規表示式
+    if isinstance(value, (set, frozenset)):
+        return repr(sorted(value, key=repr))  # set 的順序每個進程不同
+    return repr(value)
+
+def loader_digest(loader):
+    """載入流程的雜湊：loader 本身（含同模組的輔助函式、常數，例如 ANALYSIS_COLUMNS、SKILLS）、
+    LOADER_MODULES 的原始碼與目前的模組層級常數（例如 SALARY_BY_EXPERIENCE、TITLE_NOISE、SCHEMA），以及技能字典檔
+    為什麼？資料檔沒變時快取會整份沿用，不看衍生欄位；補值規則或技能字典改了也要重算"""
+    import importlib  # 只在這裡需要
+    digest = hashlib.sha256(code_digest(loader).encode('utf-8') if inspect.isfunction(loader)
+                            else f'{getattr(loader, "__module__", "")}.{getattr(loader, "__qualname__", repr(loader))}'.encode('utf-8'))
+    for module_name in LOADER_MODULES:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), f'{module_name}.py'), 'rb') as f:
+            digest.update(f.read())
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:  # 例如沒裝 pyarrow 時的 job_parquet：只用原始碼
+            continue
+        for name in sorted(vars(module)):
+            value = vars(module)[name]
+            if not name.startswith('_') and isinstance(value, (list, tuple, dict, set, frozenset, str, int, float, re.Pattern)):
+                digest.update(f'{module_name}.{name}={_constant_repr(value)};'.encode('utf-8'))
+    dictionary = importlib.import_module('job_skills').DEFAULT_DICTIONARY
+    if os.path.exists(dictionary):
+        with open(dictionary, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def file_digest(path, block_size=1 << 20):
+    """檔案（或 Parquet 資料夾內所有檔案）內容的 SHA-256"""
+    digest = hashlib.sha256()
+    paths = [path]
+    if os.path.isdir(path):
+        paths = sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+    for file in paths:
+        digest.update(os.path.relpath(file, path).encode('utf-8'))
+        with open(file, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+def _column_digest(series):
+    """單一欄位內容的雜湊；list 欄位（title_skills）先接成字串"""
+    if series.dtype == object and series.map(lambda value: isinstance(value, list)).any():
+        series = series.map(lambda value: '\x1f'.join(value) if isinstance(value, list) else value)
+    return hashlib.sha256(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes()).hexdigest()
+
+class AggregateEngine:
+    """compute(file_path) 回傳 {指標名稱: 結果}；結果與雜湊存在 cache_dir，下次只重算輸入有變的指標"""
+
+    def __init__(self, cache_dir='aggregate_cache', metrics=None):
+        self.cache_dir = cache_dir
+        self.metrics = metrics or METRICS
+        self.manifest_path = os.path.join(cache_dir, 'manifest.json')
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {'files': {}, 'metrics': {}, 'code': {}, 'loader': None}
+
+    def _write(self, path, data, binary):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb' if binary else 'w', **({} if binary else {'encoding': 'utf-8'})) as f:
+            if binary:
+                pickle.dump(data, f)
+            else:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def _result_path(self, name):
+        return os.path.join(self.cache_dir, f'{name}.pkl')
+
+    def _load_result(self, name):
+        with open(self._result_path(name), 'rb') as f:
+            return pickle.load(f)
+
+    def _fingerprint(self, df, name, column_digests, code):
+        _, columns = self.metrics[name]
+        digest = hashlib.sha256(code[name].encode('utf-8'))  # 指標的算法（含輔助函式、常數）改了也要重算
+        for column in columns:
+            if column not in column_digests:
+                column_digests[column] = _column_digest(df[column]) if column in df.columns else 'missing'
+            digest.update(f'{column}={column_digests[column]};'.encode('utf-8'))
+        return digest.hexdigest()
+
+    def compute(self, file_path, loader=load_analysis_frame, force=False):
+        start = time.perf_counter()
+        manifest = self._load_manifest()
+        source_digest = file_digest(file_path)
+        known = manifest['files'].get(source_digest)
+        code = {name: code_digest(fn) for name, (fn, _) in self.metrics.items()}
+        loader_key = loader_digest(loader)
+        # 整份檔案沒變、載入流程沒變、指標程式碼沒變，而且每個指標的結果都還是那次算的：直接讀出，不讀 CSV
+        if (not force and known and manifest.get('loader') == loader_key and manifest.get('code') == code
+                and all(manifest['metrics'].get(name) == known.get(name) for name in self.metrics)):
+            try:
+                results = {name: self._load_result(name) for name in self.metrics}
+                print(f"[彙總快取] 資料檔未變更，沿用全部 {len(results)} 個指標（{time.perf_counter() - start:.2f} 秒）")
+                return results
+            except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+                pass  # 結果檔不見或壞掉，照一般流程重算
+        df = loader(file_path)
+        results, recomputed, column_digests = {}, [], {}
+        fingerprints = {}
+        for name, (fn, _) in self.metrics.items():
+            fingerprint = self._fingerprint(df, name, column_digests, code)
+            fingerprints[name] = fingerprint
+            if not force and manifest['metrics'].get(name) == fingerprint:
+                try:
+                    results[name] = self._load_result(name)
+                    continue
+                except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+                    pass
+            results[name] = fn(df)
+            self._write(self._result_path(name), results[name], binary=True)
+            manifest['metrics'][name] = fingerprint
+            recomputed.append(name)
+        manifest['files'] = {source_digest: fingerprints}  # 只記最新一份資料檔
+        manifest['code'] = code
+        manifest['loader'] = loader_key
+        self._write(self.manifest_path, manifest, binary=False)
+        print(f"[彙總快取] 重算 {len(recomputed)} 個指標、沿用 {len(results) - len(recomputed)} 個"
+              f"（{time.perf_counter() - start:.2f} 秒）" + (f"：{', '.join(recomputed)}" if recomputed else ""))
+        return results
+
+def main():
+    parser = argparse.ArgumentParser(description="計算分析圖表用的彙總指標（有快取）")
+    parser.add_argument("file_path", help="職缺 CSV 檔或 Parquet 資料夾")
+    parser.add_argument("--cache_dir", default="aggregate_cache", help="指標快取資料夾")
+    parser.add_argument("--force", action="store_true", default=False, help="忽略快取，全部重算")
+    args = parser.parse_args()
+    results = AggregateEngine(args.cache_dir).compute(args.file_path, force=args.force)
+    for name, value in results.items():
+        print(f"\n{name}:")
+        print(value.head(10) if hasattr(value, 'head') else value)
+
+if __name__ == "__main__":
+    main()
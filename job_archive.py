@@ -0,0 +1,165 @@
+'''
+原始頁面封存：每個細節頁抓到的原始內容（瀏覽器的 page_source 或 HTTP 的內容 JSON）
+連同列表頁資料，以 gzip 壓縮存成 {archive_dir}/{job_id}/{抓取時間}.json.gz
+為什麼？原本原始 HTML 只在失敗時存成 error_{job_id}.html，page_source_attempt_N.html 每次都被覆蓋，
+改了 extract_skills 或 parse_salary 就只能重爬 104（好幾個小時）。有了封存，
+reextract 用多個進程在本機重新解析所有頁面、重算衍生欄位，產生新的 JSONL，幾分鐘就完成：
+    python job_archive.py reextract --archive_dir raw_pages --output job_details_reextracted.jsonl --processes 4
+    python job_jsonl_sink.py compact job_details_reextracted.jsonl --csv job_data_reextracted.csv   # 再轉成 CSV
+    python job_archive.py status --archive_dir raw_pages
+'''
+
+import os  # 資料夾與原子性改名
+import gzip  # 壓縮原始頁面（HTML 約可壓到 1/5 以下）
+import json  # 封存格式與內容 JSON
+import argparse  # 命令列
+import time  # 計時
+import tempfile  # 先寫暫存檔再改名，當機不會留下壞檔
+from datetime import datetime  # 抓取時間
+from multiprocessing import Pool  # 多進程重新解析（lxml 解析是 CPU 密集）
+from job_salary import parse_salary  # 重算列表頁薪資欄位
+from job_skills import SkillMatcher  # 重算技能
+from job_detail_parser import parse_job_detail  # 瀏覽器 page_source → job_detail
+from job_http_fetcher import content_to_job_detail  # 內容 JSON → job_detail
+from job_jsonl_sink import JsonlSink  # 結果寫成 JSONL
+
+HTML, JSON_CONTENT = "html", "json"  # 瀏覽器 page_source / HTTP 內容 API 的 JSON
+
+class RawPageArchive:
+    """save_page() / save_content() 可由多個 worker 同時呼叫：每次抓取寫成獨立檔案，不需要鎖"""
+
+    def __init__(self, root_dir="raw_pages", compresslevel=6):
+        self.root_dir = root_dir
+        self.compresslevel = compresslevel
+        os.makedirs(root_dir, exist_ok=True)
+
+    def save_page(self, job_id, page_source, list_data=None):
+        """封存瀏覽器抓到的細節頁 page_source"""
+        return self._save(job_id, HTML, page_source, list_data)
+
+    def save_content(self, job_id, content, list_data=None):
+        """封存 HTTP 模式抓到的內容 JSON（dict）"""
+        return self._save(job_id, JSON_CONTENT, content, list_data)
+
+    def _save(self, job_id, kind, body, list_data):
+        """每次抓取寫成一個檔案，回傳檔案路徑；封存失敗只印出，不影響爬蟲"""
+        fetched_at = datetime.now()
+        record = {
+            "job_id": str(job_id),
+            "fetched_at": fetched_at.isoformat(timespec="seconds"),
+            "kind": kind,
+            "list_data": list_data or {},
+            "body": body,
+        }
+        job_dir = os.path.join(self.root_dir, str(job_id))
+        path = os.path.join(job_dir, fetched_at.strftime("%Y%m%dT%H%M%S_%f") + ".json.gz")
+        try:
+            os.makedirs(job_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=job_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=self.compresslevel) as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str).encode("utf-8"))
+            os.replace(tmp_path, path)
+            return path
+        except Exception as e:
+            print(f"封存原始頁面失敗，已忽略: {job_id} - {e}")
+            return None
+
+    def versions(self, job_id):
+        """某職缺所有封存的路徑（由舊到新）"""
+        job_dir = os.path.join(self.root_dir, str(job_id))
+        if not os.path.isdir(job_dir):
+            return []
+        return [os.path.join(job_dir, name) for name in sorted(os.listdir(job_dir)) if name.endswith(".json.gz")]
+
+    def paths(self, all_versions=False):
+        """每個職缺最新一次封存的路徑（all_versions=True 時回傳全部）"""
+        for job_id in sorted(os.listdir(self.root_dir)):
+            versions = self.versions(job_id)
+            if versions:
+                yield from (versions if all_versions else versions[-1:])
+
+def load(path):
+    """讀取一個封存檔，回傳 {job_id, fetched_at, kind, list_data, body}"""
+    with gzip.open(path, "rb") as f:
+        return json.loads(f.read().decode("utf-8"))
+
+_skill_extractor = None
+
+def _init_worker(skill_dict):
+    """每個進程只建一次技能比對自動機"""
+    global _skill_extractor
+    _skill_extractor = SkillMatcher.from_json(skill_dict).extract
+
+def rebuild_job_detail(record, skill_extractor):
+    """由封存內容重建 job_detail：細節欄位重新解析，列表頁的薪資欄位也用目前的 parse_salary 重算"""
+    list_data = dict(record.get("list_data") or {})
+    if isinstance(list_data.get("salary"), str):
+        (list_data["salary_min"], list_data["salary_max"],
+         list_data["salary_avg"], list_data["salary_note"]) = parse_salary(list_data["salary"])
+    if record["kind"] == HTML:
+        return parse_job_detail(record["body"], record["job_id"], list_data, skill_extractor)
+    return content_to_job_detail(record["body"], record["job_id"], list_data, skill_extractor)
+
+def _reextract_one(path):
+    """worker：回傳 (path, job_detail 或 None, 錯誤訊息)"""
+    try:
+        return path, rebuild_job_detail(load(path), _skill_extractor), None
+    except Exception as e:
+        return path, None, str(e)
+
+def reextract(archive_dir, output, processes=None, skill_dict=None, all_versions=False, chunksize=16):
+    """用多個進程重新解析封存的頁面，結果寫入 output（JSONL，已存在會覆蓋），回傳 (成功數, 失敗數)"""
+    if os.path.exists(output):
+        os.remove(output)
+    paths = list(RawPageArchive(archive_dir).paths(all_versions))
+    print(f"封存頁面 {len(paths)} 個，使用 {processes or os.cpu_count()} 個進程重新解析")
+    start = time.perf_counter()
+    ok = failed = 0
+    sink = JsonlSink(output)
+    try:
+        with Pool(processes, initializer=_init_worker, initargs=(skill_dict,)) as pool:
+            for path, job_detail, error in pool.imap(_reextract_one, paths, chunksize=chunksize):
+                if job_detail:
+                    sink.write(job_detail)
+                    ok += 1
+                else:
+                    failed += 1
+                    print(f"重新解析失敗: {path} - {error}")
+    finally:
+        sink.close()
+    elapsed = time.perf_counter() - start
+    print(f"重新解析完成：成功 {ok} 筆、失敗 {failed} 筆，耗時 {elapsed:.1f} 秒（{len(paths) / elapsed if elapsed else 0:.0f} 頁/秒）: {output}")
+    return ok, failed
+
+def status(archive_dir):
+    jobs = pages = size = 0
+    kinds = {}
+    archive = RawPageArchive(archive_dir)
+    for job_id in os.listdir(archive_dir):
+        versions = archive.versions(job_id)
+        if not versions:
+            continue
+        jobs += 1
+        pages += len(versions)
+        size += sum(os.path.getsize(path) for path in versions)
+        kind = load(versions[-1])["kind"]
+        kinds[kind] = kinds.get(kind, 0) + 1
+    print(f"封存職缺 {jobs} 個、頁面 {pages} 個，壓縮後共 {size / 1024 / 1024:.1f} MB，最新版本種類: {kinds}")
+
+def main():
+    parser = argparse.ArgumentParser(description="原始頁面封存：查詢狀態、不重爬直接重新解析")
+    parser.add_argument("command", choices=["reextract", "status"], help="reextract 重新解析；status 查詢封存狀態")
+    parser.add_argument("--archive_dir", default="raw_pages", help="封存資料夾")
+    parser.add_argument("--output", default="job_details_reextracted.jsonl", help="重新解析結果（JSONL）")
+    parser.add_argument("--processes", type=int, default=None, help="進程數（預設為 CPU 核心數）")
+    parser.add_argument("--skill_dict", default=None, help="技能字典 JSON，預設為 skill_dictionary.json")
+    parser.add_argument("--all_versions", action="store_true", default=False,
+                        help="每次抓取都重新解析（預設只解析每個職缺最新一次）")
+    args = parser.parse_args()
+    if args.command == "status":
+        status(args.archive_dir)
+    else:
+        reextract(args.archive_dir, args.output, args.processes, args.skill_dict, args.all_versions)
+
+if __name__ == "__main__":
+    main()
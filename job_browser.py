@@ -0,0 +1,102 @@
+'''
+共用的 Chrome 瀏覽器設定與啟動
+原本 main() 和 restart_driver() 各寫一份 Options，多開瀏覽器 worker 時也要用同一套設定
+block_resources=True 時用 CDP（Chrome DevTools Protocol）擋掉爬蟲用不到的資源：
+圖片、字型、廣告與追蹤腳本（GTM、GA、DoubleClick…）。我們只讀 HTML，這些只會拖慢頁面就緒、浪費頻寬和 CPU
+'''
+
+import threading  # 多個 worker 共用統計
+from selenium.webdriver.chrome.options import Options  # Chrome 瀏覽器選項
+import undetected_chromedriver as uc  # 隱藏 Selenium 痕跡的 Chrome
+
+# 擋掉的網址樣式（Network.setBlockedURLs 支援 * 萬用字元）
+# 不擋 CSS 和 104 自己的 JS：列表頁由前端渲染，擋了職缺卡片就不會出現
+BLOCKED_URL_PATTERNS = [
+    # 圖片
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.avif",
+    # 字型
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # 影片
+    "*.mp4", "*.webm",
+    # 廣告、分析與追蹤
+    "*googletagmanager.com*", "*google-analytics.com*", "*analytics.google.com*",
+    "*doubleclick.net*", "*googlesyndication.com*", "*googleadservices.com*",
+    "*connect.facebook.net*", "*facebook.com/tr*", "*hotjar.com*", "*clarity.ms*",
+    "*scorecardresearch.com*", "*criteo.*", "*adnxs.com*", "*line-scdn.net/*tag*",
+]
+
+# 從 Performance API 讀頁面傳輸量與載入時間
+# 注意：跨網域資源若沒有 Timing-Allow-Origin，transferSize 會是 0，所以是偏低的估計
+PAGE_WEIGHT_SCRIPT = '''
+const nav = performance.getEntriesByType('navigation')[0] || {};
+const resources = performance.getEntriesByType('resource');
+let bytes = nav.transferSize || 0;
+for (const r of resources) { bytes += r.transferSize || 0; }
+return {bytes: bytes, requests: resources.length + 1,
+        dom_ready_ms: nav.domContentLoadedEventEnd || 0, load_ms: nav.loadEventEnd || 0};
+'''
+
+def build_chrome_options(user_agent, headless=False):
+    """產生爬蟲共用的 Chrome 選項"""
+    options = Options()
+    options.add_argument(f"user-agent={user_agent}")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--start-maximized")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--disable-web-security")
+    if headless:
+        options.add_argument("--headless=new")
+    return options
+
+def apply_resource_blocking(driver, patterns=None):
+    """透過 CDP 讓瀏覽器直接不送出符合樣式的請求（對之後所有頁面有效）"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns or BLOCKED_URL_PATTERNS})
+    return driver
+
+def create_driver(user_agent, headless=False, block_resources=False):
+    """啟動一個新的 undetected Chrome；block_resources=True 時擋掉圖片、字型、廣告與追蹤腳本"""
+    driver = uc.Chrome(options=build_chrome_options(user_agent, headless))
+    if block_resources:
+        apply_resource_blocking(driver)
+    return driver
+
+def page_weight(driver):
+    """目前頁面的傳輸量（bytes）、請求數、DOMContentLoaded / load 時間（毫秒），讀不到回傳 None"""
+    try:
+        return driver.execute_script(PAGE_WEIGHT_SCRIPT)
+    except Exception:
+        return None
+
+class PageWeightStats:
+    """依頁面種類（列表頁、細節頁）累計傳輸量與載入時間，最後印出每頁平均"""
+
+    def __init__(self):
+        self.stats = {}  # label -> [頁數, 總 bytes, 總請求數, 總 DOMContentLoaded 毫秒]
+        self.lock = threading.Lock()
+
+    def record(self, label, driver):
+        weight = page_weight(driver)
+        if not weight:
+            return None
+        with self.lock:
+            pages, total_bytes, requests, dom_ready = self.stats.get(label, [0, 0, 0, 0.0])
+            self.stats[label] = [pages + 1, total_bytes + weight["bytes"], requests + weight["requests"],
+                                 dom_ready + weight["dom_ready_ms"]]
+        return weight
+
+    def summary(self, blocked=False):
+        with self.lock:
+            stats = dict(self.stats)
+        for label, (pages, total_bytes, requests, dom_ready) in stats.items():
+            print(f"[頁面大小] {label}{'（已擋資源）' if blocked else ''}: {pages} 頁，"
+                  f"平均 {total_bytes / pages / 1024:.0f} KB、{requests / pages:.0f} 個請求、"
+                  f"DOMContentLoaded {dom_ready / pages:.0f} ms")
+
+def quit_driver(driver):
+    """關閉瀏覽器，錯誤只印出不拋出（瀏覽器可能早已當掉）"""
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"關閉瀏覽器時發生錯誤: {str(e)}")
@@ -0,0 +1,143 @@
+'''
+以職缺為單位的斷點：持久化的工作佇列（SQLite）
+每個職缺一列：pending（待爬）/ done（已存檔）/ failed（失敗，等待重試），加上嘗試次數與下次可重試時間
+為什麼？原本 checkpoint.json 只記 last_page，而且在該頁資料存檔之前就寫入：
+中斷時可能跳過整頁職缺，或把一整頁細節頁重爬一遍。改成列表頁一抓完就把職缺寫進佇列，
+細節頁存檔後才標成 done，下次執行只處理還沒完成的職缺；失敗的職缺依指數退避（backoff）延後重試，
+超過 max_attempts 就不再重試（可用 python job_checkpoint.py reset-failed 重新排入）
+    python job_checkpoint.py status --db job_queue.db
+'''
+
+import sqlite3  # Python 內建的資料庫，當機也不會毀損
+import json  # 列表頁資料以 JSON 存，重試時不用重開列表頁
+import time  # 下次重試時間
+import random  # 退避時間加上隨機，避免同時重試
+import argparse  # 命令列查詢狀態
+import threading  # pipeline 的多個 worker 同時更新狀態
+from datetime import datetime  # 記錄更新時間
+
+PENDING, DONE, FAILED = "pending", "done", "failed"
+
+class JobQueue:
+    """job_queue 資料表：job_id 主鍵、page、status、attempts、next_retry_at、last_error、row（列表頁資料）
+    失敗後第 n 次重試至少等 base_delay * 2^(n-1) 秒（最多 max_delay 秒）"""
+
+    def __init__(self, db_path="job_queue.db", max_attempts=3, base_delay=60, max_delay=3600):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_queue (
+                job_id TEXT PRIMARY KEY,
+                page INTEGER,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_retry_at REAL NOT NULL DEFAULT 0,
+                last_error TEXT,
+                row TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_job_queue_status ON job_queue (status, next_retry_at)")
+        self.conn.commit()
+
+    def enqueue(self, rows, page=None, requeue=False):
+        """把列表頁的職缺加入佇列（已存在的職缺不覆蓋狀態），回傳其中狀態為 pending 的 row
+        為什麼只回傳 pending？done 的已經爬過；failed 的等退避時間到了由 ready_jobs() 重試
+        requeue=True：已是 done 的職缺重新排入（增量模式判斷職缺有更新時使用）"""
+        now = datetime.now().isoformat(timespec="seconds")
+        sql = "INSERT INTO job_queue (job_id, page, status, row, updated_at) VALUES (?, ?, ?, ?, ?)"
+        if requeue:
+            sql += """ ON CONFLICT(job_id) DO UPDATE SET
+                page = excluded.page, status = excluded.status, attempts = 0, next_retry_at = 0,
+                row = excluded.row, updated_at = excluded.updated_at
+                WHERE job_queue.status = 'done'"""
+        else:
+            sql += " ON CONFLICT(job_id) DO NOTHING"
+        with self.lock:
+            self.conn.executemany(
+                sql,
+                [(str(row["job_id"]), page, PENDING, json.dumps(row, ensure_ascii=False, default=str), now)
+                 for row in rows])
+            self.conn.commit()
+            job_ids = [str(row["job_id"]) for row in rows]
+            pending = {job_id for (job_id,) in self.conn.execute(
+                f"SELECT job_id FROM job_queue WHERE status = ? AND job_id IN ({','.join('?' * len(job_ids))})",
+                [PENDING, *job_ids])}
+        return [row for row in rows if str(row["job_id"]) in pending]
+
+    def ready_jobs(self, limit=None):
+        """可以爬的職缺：pending，或 failed 且退避時間已到、次數未超過上限；依頁數與加入順序排列"""
+        sql = """SELECT row FROM job_queue
+                 WHERE status = ? OR (status = ? AND attempts < ? AND next_retry_at <= ?)
+                 ORDER BY page, rowid"""
+        params = [PENDING, FAILED, self.max_attempts, time.time()]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self.lock:
+            return [json.loads(row) for (row,) in self.conn.execute(sql, params)]
+
+    def mark_done(self, job_ids):
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.lock:
+            self.conn.executemany("UPDATE job_queue SET status = ?, last_error = NULL, updated_at = ? WHERE job_id = ?",
+                                  [(DONE, now, str(job_id)) for job_id in job_ids])
+            self.conn.commit()
+
+    def mark_failed(self, job_ids, error=None):
+        """嘗試次數 +1，並依次數設定下次可重試時間"""
+        now = time.time()
+        updated_at = datetime.now().isoformat(timespec="seconds")
+        with self.lock:
+            for job_id in job_ids:
+                row = self.conn.execute("SELECT attempts FROM job_queue WHERE job_id = ?", (str(job_id),)).fetchone()
+                attempts = (row[0] if row else 0) + 1
+                delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1)) * random.uniform(1.0, 1.5)
+                self.conn.execute(
+                    "UPDATE job_queue SET status = ?, attempts = ?, next_retry_at = ?, last_error = ?, updated_at = ? "
+                    "WHERE job_id = ?",
+                    (FAILED, attempts, now + delay, error, updated_at, str(job_id)))
+            self.conn.commit()
+
+    def reset_failed(self):
+        """把所有失敗的職缺（包含超過重試上限的）重新排入 pending，回傳筆數"""
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE job_queue SET status = ?, attempts = 0, next_retry_at = 0 WHERE status = ?", (PENDING, FAILED))
+            self.conn.commit()
+            return cursor.rowcount
+
+    def counts(self):
+        """各狀態的職缺數，另外列出已放棄（failed 且次數用完）的數量"""
+        with self.lock:
+            counts = {status: n for status, n in self.conn.execute(
+                "SELECT status, COUNT(*) FROM job_queue GROUP BY status")}
+            counts["gave_up"] = self.conn.execute(
+                "SELECT COUNT(*) FROM job_queue WHERE status = ? AND attempts >= ?",
+                (FAILED, self.max_attempts)).fetchone()[0]
+        return counts
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="職缺工作佇列工具：查詢狀態、重新排入失敗職缺")
+    parser.add_argument("command", choices=["status", "reset-failed"], help="status 查詢狀態；reset-failed 重新排入失敗職缺")
+    parser.add_argument("--db", default="job_queue.db", help="佇列資料庫檔")
+    args = parser.parse_args()
+    job_queue = JobQueue(args.db)
+    try:
+        if args.command == "reset-failed":
+            print(f"已重新排入 {job_queue.reset_failed()} 個失敗職缺")
+        print(job_queue.counts())
+    finally:
+        job_queue.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+'''
+104 職缺細節頁的單次解析器
+拿到細節頁 HTML 後一次解析，掃過所有 div.list-row 建立「標題關鍵字 → 欄位值」索引，再組出完整 job_detail
+為什麼？原本 extract_field_value() 每查一個關鍵字就重新抓一次所有 list-row（4 個關鍵字就 4 次），
+語文條件、擅長工具、工作技能、職務類別又各自查一次，每次都是 WebDriver 往返
+也可以離線解析存下來的 error_{job_id}.html：
+    python job_detail_parser.py fixtures/error_8ukbm.html   # 範例頁在 fixtures/，測試見 tests/test_detail_parser.py
+'''
+
+# 執行前需安裝套件：pip install pandas lxml
+
+import pandas as pd  # 只用 pd.notna 過濾 list 頁資料
+import re  # 合併空白、從檔名取 job_id
+import os  # 處理檔名
+import sys  # 命令列參數
+import json  # 命令列模式輸出結果
+from lxml import etree, html  # HTML 解析
+from job_skills import extract_skills  # 命令列模式用預設技能字典
+
+def _has_class(name):
+    """XPath 版的 CSS class 選擇器"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# 預先編譯 XPath，對應原本 Selenium 的選擇器；工作內容依序嘗試三種寫法
+DESCRIPTION_XPATHS = [
+    etree.XPath(f"//p[{_has_class('job-description__content')}]"),
+    etree.XPath("//h2[contains(text(), '工作內容')]/following-sibling::p[contains(@class, 'job-description__content')]"),
+    etree.XPath(f"//div[{_has_class('job-description__content')}]//p"),
+]
+LIST_ROW_XPATH = etree.XPath(
+    f"//div[{_has_class('job-description-table')} or {_has_class('job-requirement-table')}]//div[{_has_class('list-row')}]")
+ROW_TITLE_XPATH = etree.XPath(f".//h3[{_has_class('h3')}]")
+ROW_VALUE_XPATH = etree.XPath(f".//div[{_has_class('t3')} and {_has_class('mb-0')}]")
+ROW_UNDERLINE_XPATH = etree.XPath(".//u")
+OTHER_CONDITIONS_XPATH = etree.XPath(
+    "//h3[contains(text(), '其他條件')]/ancestor::div[contains(@class, 'list-row')]"
+    "/following-sibling::div[contains(@class, 'list-row__data')]"
+    "//div[contains(@class, 'job-requirement-table__data')]//p[contains(@class, 'm-0 r3 w-100')]")
+CATEGORY_XPATH = etree.XPath(f"//div[{_has_class('category-item')}]//div[{_has_class('v-popper')}]//u")
+TOOLS_XPATH = etree.XPath(f"//a[{_has_class('tools')}]")
+SKILLS_XPATH = etree.XPath(f"//a[{_has_class('skills')}]")
+
+# 表格欄位：標題關鍵字 → job_detail 欄位名
+TABLE_FIELDS = {
+    "管理責任": "management_responsibility",
+    "上班時段": "work_shift",
+    "遠端工作": "remote_work",
+    "出差外派": "BT_EXP",
+}
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+def _text(element):
+    """單行文字：多個空白合併成一個"""
+    return WHITESPACE_PATTERN.sub(" ", element.text_content()).strip()
+
+def _multiline_text(element):
+    """保留換行的文字（工作內容、其他條件），<br> 視為換行"""
+    for br in element.iter("br"):
+        br.tail = "\n" + (br.tail or "")
+    return element.text_content().strip()
+
+def _underlined(elements):
+    """取每個元素裡第一個 <u> 的文字（擅長工具、工作技能）"""
+    values = []
+    for element in elements:
+        underlines = ROW_UNDERLINE_XPATH(element)
+        if underlines:
+            values.append(_text(underlines[0]))
+    return values
+
+# 欄位缺值時的預設值（整合版爬蟲原本的值）；104_job_detail.py 原本擅長工具預設為 ["不拘"]，用 defaults 參數覆蓋
+DEFAULTS = {
+    "job_description": "未知",
+    "other_conditions": "無",
+    "job_categories": ["未知"],
+    "languages": "不拘",
+    "tools": ["--"],
+    "work_skills": ["不拘"],
+}
+
+def assemble_job_detail(job_id, list_data, fields, skill_extractor, defaults=None):
+    """把解析出的欄位組成 job_detail，欄位順序與預設值與原本 crawl_job_details 相同
+    fields 缺值或空值時填預設值（defaults 可覆蓋 DEFAULTS 的部分欄位）；HTTP 版（job_http_fetcher）也用這個函式，確保兩種來源格式一致"""
+    defaults = {**DEFAULTS, **(defaults or {})}
+    job_detail = {
+        "job_id": job_id,
+        **{k: v for k, v in list_data.items() if pd.notna(v)}
+    }
+    job_description = fields.get("job_description") or defaults["job_description"]
+    job_detail["job_description"] = job_description
+    other_conditions = fields.get("other_conditions") or defaults["other_conditions"]
+    job_detail["skills"] = list(set(skill_extractor(job_description) + skill_extractor(other_conditions)))
+    job_detail["job_categories"] = fields.get("job_categories") or list(defaults["job_categories"])
+    for field in TABLE_FIELDS.values():
+        job_detail[field] = fields.get(field) or "未知"
+    job_detail["languages"] = fields.get("languages") or defaults["languages"]
+    job_detail["tools"] = fields.get("tools") or list(defaults["tools"])
+    job_detail["work_skills"] = fields.get("work_skills") or list(defaults["work_skills"])
+    job_detail["other_conditions"] = other_conditions
+    return job_detail
+
+def extract_detail_fields(page_source):
+    """一次解析細節頁 HTML，回傳原始欄位 dict（沒找到的欄位不放）"""
+    tree = html.fromstring(page_source)
+    fields = {}
+    for xpath in DESCRIPTION_XPATHS:
+        elements = xpath(tree)
+        if elements:
+            fields["job_description"] = _multiline_text(elements[0])
+            break
+    # 只掃一次所有 list-row，建立 標題 → row 的索引
+    row_index = {}
+    for row in LIST_ROW_XPATH(tree):
+        titles = ROW_TITLE_XPATH(row)
+        if titles:
+            row_index.setdefault(_text(titles[0]), row)
+    for title, row in row_index.items():
+        for keyword, field in TABLE_FIELDS.items():
+            if keyword in title and field not in fields:
+                values = ROW_VALUE_XPATH(row)
+                if values:
+                    fields[field] = _text(values[0])
+        if "語文條件" in title and "languages" not in fields:
+            underlines = ROW_UNDERLINE_XPATH(row)
+            if underlines:
+                fields["languages"] = _text(underlines[0])
+    others = OTHER_CONDITIONS_XPATH(tree)
+    if others:
+        fields["other_conditions"] = _multiline_text(others[0])
+    fields["job_categories"] = [_text(u) for u in CATEGORY_XPATH(tree)]
+    fields["tools"] = _underlined(TOOLS_XPATH(tree))
+    fields["work_skills"] = _underlined(SKILLS_XPATH(tree))
+    return fields
+
+def parse_job_detail(page_source, job_id, list_data, skill_extractor, defaults=None):
+    """細節頁 HTML → 完整 job_detail（defaults 見 assemble_job_detail）"""
+    fields = extract_detail_fields(page_source)
+    if not fields.get("job_description"):
+        print(f"警告: {job_id} 無法找到工作內容")
+    return assemble_job_detail(job_id, list_data, fields, skill_extractor, defaults)
+
+def main():
+    """離線解析存下來的細節頁，例如 error_{job_id}.html，結果印成 JSON
+    skills 欄位用預設技能字典（job_skills.py）計算，和爬蟲結果一致；這裡沒有列表頁資料"""
+    if len(sys.argv) < 2:
+        print("用法: python job_detail_parser.py error_{job_id}.html [...]")
+        return
+    for path in sys.argv[1:]:
+        match = re.search(r"(?:error_)?(\w+)\.html?$", os.path.basename(path))
+        job_id = match.group(1) if match else os.path.basename(path)
+        with open(path, "r", encoding="utf-8") as f:
+            job_detail = parse_job_detail(f.read(), job_id, {}, extract_skills)
+        print(json.dumps(job_detail, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
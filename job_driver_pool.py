@@ -0,0 +1,168 @@
+'''
+Chrome 瀏覽器池：預先開好待命的瀏覽器，換瀏覽器時直接拿現成的
+為什麼？restart_driver() 原本每 30 個職缺關掉 Chrome、冷啟動新的 uc.Chrome 再固定等 5 秒，
+整個爬蟲卡在冷啟動上；而且要等到出現 "invalid session id" 才知道瀏覽器已經壞了。
+這裡由背景執行緒維持 warm_size 個待命瀏覽器，取用前先用 execute_script("return 1") 做健康檢查，
+依使用次數或記憶體（job_watchdog 量的 Chrome 進程樹 RSS）決定退役，舊瀏覽器也在背景關閉並清掉殘留進程
+'''
+
+import threading  # 背景補充與關閉瀏覽器
+import time  # 等待待命瀏覽器
+from job_browser import quit_driver  # 關閉瀏覽器（錯誤只印出）
+
+def is_healthy(driver):
+    """最便宜的健康檢查：一次 WebDriver 往返，session 失效或瀏覽器當掉都會拋出例外"""
+    try:
+        return driver.execute_script("return 1") == 1
+    except Exception:
+        return False
+
+class DriverPool:
+    """factory() 建立新瀏覽器；warm_size：背景維持的待命瀏覽器數
+    recycle_after：每個瀏覽器處理幾個頁面後退役
+    watchdog：ChromeWatchdog，追蹤每個瀏覽器的進程樹，記憶體超過上限就退役，關閉後清掉殘留進程（None 不追蹤）"""
+
+    def __init__(self, factory, warm_size=1, recycle_after=30, watchdog=None, closer=quit_driver):
+        self.factory = factory
+        self.closer = closer
+        self.warm_size = max(0, warm_size)
+        self.recycle_after = recycle_after
+        self.watchdog = watchdog
+        self.idle = []  # 待命中的瀏覽器
+        self.uses = {}  # id(driver) -> 已處理頁面數（包含使用中的）
+        self.creating = 0  # 背景正在啟動的數量
+        self.closed = False
+        self.condition = threading.Condition()
+        self.to_close = []  # 等待背景關閉的瀏覽器
+        self.stats = {"created": 0, "retired": 0, "unhealthy": 0, "cold_starts": 0}
+        self.thread = threading.Thread(target=self._maintain, name="driver-pool", daemon=True)
+        self.thread.start()
+
+    def _create(self):
+        driver = self.factory()
+        if self.watchdog is not None:
+            self.watchdog.register(driver)
+        with self.condition:
+            self.uses[id(driver)] = 0
+            self.stats["created"] += 1
+        return driver
+
+    def _close(self, driver):
+        """quit() 之後再清掉這個瀏覽器殘留的進程（孤兒 renderer 等）"""
+        self.closer(driver)
+        if self.watchdog is not None:
+            self.watchdog.reap(driver)
+
+    def _maintain(self):
+        """背景執行緒：補足待命瀏覽器、關閉退役的瀏覽器"""
+        while True:
+            with self.condition:
+                while not self.closed and not self.to_close and len(self.idle) + self.creating >= self.warm_size:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                to_close, self.to_close = self.to_close, []
+                need_driver = len(self.idle) + self.creating < self.warm_size
+                if need_driver:
+                    self.creating += 1
+            for driver in to_close:
+                self._close(driver)
+            if not need_driver:
+                continue
+            try:
+                driver = self._create()
+                print("待命瀏覽器已就緒")
+            except Exception as e:
+                print(f"背景啟動瀏覽器失敗: {e}")
+                driver = None
+                time.sleep(5)  # 啟動失敗（例如網路問題）稍後再試，避免一直重試
+            with self.condition:
+                self.creating -= 1
+                pool_closed = self.closed
+                if driver is not None and not pool_closed:
+                    self.idle.append(driver)
+                self.condition.notify_all()
+            if driver is not None and pool_closed:
+                self._close(driver)  # 啟動期間池已關閉
+
+    def acquire(self, timeout=120):
+        """取得一個通過健康檢查的瀏覽器；待命的正在啟動就等它，沒有待命也沒在啟動才同步冷啟動"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.condition:
+                while not self.idle and self.creating and time.monotonic() < deadline:
+                    self.condition.wait(timeout=1)
+                driver = self.idle.pop() if self.idle else None
+                self.condition.notify_all()  # 讓背景執行緒補充待命
+            if driver is None:
+                with self.condition:
+                    self.stats["cold_starts"] += 1
+                return self._create()
+            if is_healthy(driver):
+                return driver
+            with self.condition:
+                self.stats["unhealthy"] += 1
+            print("待命瀏覽器健康檢查失敗，換下一個")
+            self.retire(driver)
+
+    def retire(self, driver):
+        """退役瀏覽器：交給背景執行緒關閉，不阻塞爬蟲"""
+        if driver is None:
+            return
+        with self.condition:
+            self.uses.pop(id(driver), None)
+            self.stats["retired"] += 1
+            pool_closed = self.closed
+            if not pool_closed:
+                self.to_close.append(driver)
+                self.condition.notify_all()
+        if pool_closed:
+            self._close(driver)
+
+    def swap(self, driver):
+        """退役目前的瀏覽器並換一個待命的（取代 restart_driver 的關閉 + 冷啟動 + sleep）"""
+        self.retire(driver)
+        return self.acquire()
+
+    def needs_recycle(self, driver):
+        """記憶體超過上限或健康檢查失敗就回傳原因（字串），否則回傳 None；不計使用次數
+        細節頁 worker pool 每個職缺前也用這個檢查自己的瀏覽器（使用次數由 worker pool 的 recycle_every 控制）"""
+        if self.watchdog is not None:
+            rss = self.watchdog.over_limit(driver)  # 背景取樣的結果，不會拖慢這裡
+            if rss is not None:
+                return f"記憶體 {rss:.0f} MB 超過上限 {self.watchdog.max_rss_mb} MB"
+        if not is_healthy(driver):
+            with self.condition:
+                self.stats["unhealthy"] += 1
+            return "健康檢查失敗"
+        return None
+
+    def maintain(self, driver):
+        """每次要用瀏覽器開頁面前呼叫：使用次數或記憶體超過上限、或健康檢查失敗就換一個，回傳可用的瀏覽器"""
+        with self.condition:
+            uses = self.uses.get(id(driver), 0)
+            self.uses[id(driver)] = uses + 1
+        if self.recycle_after and uses >= self.recycle_after:
+            reason = f"已處理 {uses} 個頁面"
+        else:
+            reason = self.needs_recycle(driver)
+        if reason is None:
+            return driver
+        print(f"瀏覽器{reason}，換成待命瀏覽器")
+        new_driver = self.swap(driver)
+        with self.condition:
+            self.uses[id(new_driver)] = 1
+        return new_driver
+
+    def close(self, *in_use):
+        """關閉池中所有瀏覽器；in_use 為呼叫端手上還在用的瀏覽器，一起關閉"""
+        with self.condition:
+            self.closed = True
+            drivers = self.idle + self.to_close + [driver for driver in in_use if driver is not None]
+            self.idle, self.to_close = [], []
+            self.condition.notify_all()
+        for driver in drivers:
+            self._close(driver)
+        self.thread.join(timeout=10)
+        print(f"[瀏覽器池] 啟動 {self.stats['created']} 個（同步冷啟動 {self.stats['cold_starts']} 次），"
+              f"退役 {self.stats['retired']} 個，健康檢查失敗 {self.stats['unhealthy']} 次")
@@ -0,0 +1,66 @@
+'''
+分析用衍生欄位：is_remote、is_listed、company_size、補值後的 salary_avg、清理過的標題 title_clean
+為什麼？Job_list_Analize.py 原本用 df.apply(fill_salary, axis=1) 逐列補薪資、
+company_size 對每列跑 lambda 掃一次關鍵字，標題清理（re.sub 一長串詞）每個圖表又各做一次，
+資料累積到好幾個月後這幾段佔了大部分執行時間。這裡全部改成整欄運算，add_features() 一次算好，之後的圖表直接用欄位：
+- 字串判斷（遠端、上市上櫃、公司規模）用 Series.str.contains 一次掃整欄
+- 經驗 → 預設薪資、標題清理先 factorize 取出不重複的值，只算不重複的值再依代碼展開（經驗只有十幾種寫法）
+    python benchmark.py features --rows 50000   # 逐列 apply vs 整欄，並比對結果
+'''
+
+import re  # 標題清理規則
+import pandas as pd  # 整欄運算
+
+# 經驗排序（圖表的 x 軸順序）
+EXP_ORDER = ['經歷不拘', '1年以上', '2年以上', '3年以上', '4年以上', '5年以上', '6年以上', '7年以上', '8年以上', '10年以上']
+# 缺少薪資時依經驗要求補的預設月薪：依序比對，第一個符合的關鍵字決定金額，都不符合用 DEFAULT_SALARY
+SALARY_BY_EXPERIENCE = [
+    (['1年', '2年', '3年'], 57000),
+    (['4年', '5年'], 60000),
+    (['6年', '7年', '8年', '9年', '10年'], 65000),
+]
+DEFAULT_SALARY = 50000
+# 公司名稱有這些詞就推估為大型公司
+LARGE_COMPANY_KEYWORDS = ['國際', '集團', '股份', '科技', '電子']
+# 標題裡的職稱、常見泛用詞，清掉後剩下比較有辨識度的詞（原本技能統計前的 re.sub 規則）
+TITLE_NOISE = re.compile(r'工程師|資料|數據|analyst|engineer|scientist|developer|ai\s|人工智慧|機器學習|資深|主任|專案|管理|系統|技術|資訊|研發|助理|中心|維運|應屆|新鮮人|應用|軟體|it|php|ml')
+
+def default_salary(experience):
+    """單一經驗要求的預設月薪（缺值或無法判斷時回傳 DEFAULT_SALARY）"""
+    if not isinstance(experience, str):
+        return DEFAULT_SALARY
+    for keywords, salary in SALARY_BY_EXPERIENCE:
+        if any(keyword in experience for keyword in keywords):
+            return salary
+    return DEFAULT_SALARY
+
+def _map_unique(series, fn):
+    """只對不重複的值呼叫 fn，再依代碼展開成整欄（缺值以 None 傳給 fn）"""
+    codes, uniques = pd.factorize(series)
+    mapped = pd.Series([fn(value) for value in uniques] + [fn(None)])
+    return pd.Series(mapped.to_numpy()[codes], index=series.index)  # 代碼 -1（缺值）剛好取到最後一個
+
+def impute_salary(salary_avg, experience):
+    """salary_avg 缺值的列依經驗要求補預設月薪，回傳 (補值後的 salary_avg, 是否為補值)"""
+    missing = salary_avg.isna()
+    defaults = _map_unique(experience.astype(object), default_salary)
+    return salary_avg.where(~missing, defaults).astype('float64'), missing
+
+def clean_titles(titles):
+    """標題轉小寫並去掉 TITLE_NOISE 的詞（缺值變成空字串）"""
+    return _map_unique(titles, lambda title: TITLE_NOISE.sub('', title.lower()) if isinstance(title, str) else '')
+
+def add_features(df):
+    """在 df 上新增（或覆蓋）分析用欄位，回傳 df
+    需要的欄位：tags、company、experience、salary_avg、job_title（沒有的欄位就略過對應的衍生欄位）"""
+    if 'tags' in df.columns:
+        df['is_remote'] = df['tags'].str.contains('遠端工作', na=False, regex=False)
+        df['is_listed'] = df['tags'].str.contains('上市上櫃', na=False, regex=False)
+    if 'company' in df.columns:
+        large = df['company'].str.contains('|'.join(LARGE_COMPANY_KEYWORDS), na=False)
+        df['company_size'] = large.map({True: '大型', False: '中小型'})
+    if 'salary_avg' in df.columns and 'experience' in df.columns:
+        df['salary_avg'], df['salary_imputed'] = impute_salary(df['salary_avg'], df['experience'])
+    if 'job_title' in df.columns:
+        df['title_clean'] = clean_titles(df['job_title'])
+    return df
@@ -0,0 +1,116 @@
+'''
+不開瀏覽器的職缺細節頁抓取（HTTP 版本）
+104 職缺頁是前端渲染，頁面內容其實來自 https://www.104.com.tw/job/ajax/content/{job_id} 這支 JSON
+直接用 requests 的連線池抓 JSON，再轉成和 Selenium 版 crawl_job_details 相同格式的 job_detail
+另外支援 replay 模式：從本機資料夾讀 {job_id}.json（例如 fixtures/job_content），可離線測試
+'''
+
+# 執行前需安裝套件：pip install pandas lxml requests
+
+import time  # 重試前暫停
+import random  # 重試等待時間隨機化
+import json  # 解析 JSON 回應與 replay 檔案
+import os  # 組合 replay 檔案路徑
+import requests  # HTTP 客戶端，Session 會重用 TCP 連線
+from requests.adapters import HTTPAdapter  # 設定連線池大小
+from job_detail_parser import assemble_job_detail  # 和瀏覽器版共用 job_detail 組裝
+
+# 職缺內容 API，職缺頁本身也是呼叫這支取得資料
+CONTENT_API = "https://www.104.com.tw/job/ajax/content/{job_id}"
+
+# remoteWork.type 對應頁面上顯示的文字
+REMOTE_WORK_TYPES = {1: "部分遠端", 2: "完全遠端"}
+
+def create_session(user_agent, pool_size=10):
+    """建立共用連線池的 requests Session
+    為什麼？每個職缺都重新建立連線（TLS 握手）很慢，Session 會重用同一條連線"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": user_agent,
+        "Accept": "application/json, text/plain, */*",
+        "Accept-Language": "zh-TW,zh;q=0.9,en;q=0.8",
+    })
+    return session
+
+def fetch_job_content(session, job_id, timeout=15, replay_dir=None, rate_limiter=None):
+    """取得職缺內容 JSON
+    replay_dir 有值時改讀本機 {job_id}.json，不連網路；rate_limiter 為共用的 HostRateLimiter"""
+    if replay_dir:
+        replay_file = os.path.join(replay_dir, f"{job_id}.json")
+        with open(replay_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    url = CONTENT_API.format(job_id=job_id)
+    if rate_limiter:
+        rate_limiter.acquire(url)
+    # 104 會檢查 Referer，沒帶會回傳錯誤
+    response = session.get(url, headers={"Referer": f"https://www.104.com.tw/job/{job_id}"}, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+def _descriptions(items):
+    """把 [{'description': 'Python'}, ...] 轉成文字列表"""
+    return [item.get("description", "").strip() for item in items or [] if item.get("description")]
+
+def _remote_work_text(remote_work):
+    """組出和頁面一致的遠端工作文字，例如 '部分遠端，混合式WFH'"""
+    if not remote_work:
+        return "未知"
+    if isinstance(remote_work, str):
+        return remote_work.strip() or "未知"
+    parts = [REMOTE_WORK_TYPES.get(remote_work.get("type"), ""), (remote_work.get("description") or "").strip()]
+    text = "，".join(part for part in parts if part)
+    return text if text else "未知"
+
+def content_to_job_detail(content, job_id, list_data, skill_extractor):
+    """把內容 JSON 轉成 job_detail，欄位與預設值和瀏覽器版相同（都交給 assemble_job_detail）
+    skill_extractor 傳入爬蟲的 skill_matcher.extract，讓兩種方式的技能判斷一致"""
+    data = content.get("data") or {}
+    detail = data.get("jobDetail") or {}
+    condition = data.get("condition") or {}
+    job_description = (detail.get("jobDescription") or "").strip()
+    if not job_description:
+        print(f"警告: {job_id} 無法找到工作內容")
+    languages = [lang.get("language", "").strip() for lang in condition.get("language") or [] if lang.get("language")]
+    fields = {
+        "job_description": job_description,
+        "other_conditions": (condition.get("other") or "").strip(),
+        "job_categories": _descriptions(detail.get("jobCategory")),
+        "management_responsibility": (detail.get("manageResp") or "").strip(),
+        "work_shift": (detail.get("workPeriod") or "").strip(),
+        "remote_work": _remote_work_text(detail.get("remoteWork")),
+        "BT_EXP": (detail.get("businessTrip") or "").strip(),
+        "languages": languages[0] if languages else "",
+        "tools": _descriptions(condition.get("specialty")),
+        "work_skills": _descriptions(condition.get("skill")),
+    }
+    return assemble_job_detail(job_id, list_data, fields, skill_extractor)
+
+def crawl_job_details_http(session, job_id, list_data, skill_extractor, replay_dir=None, max_retries=3,
+                           rate_limiter=None, archive=None, cache=None):
+    """用 HTTP 爬取單個職缺，回傳格式與 crawl_job_details 相同；失敗回傳 None 讓呼叫端改用瀏覽器
+    archive 為 RawPageArchive 時先封存內容 JSON（replay 模式不封存），之後可不重爬直接重新解析
+    cache 為 PageCache 時先查快取（以內容 API 的 URL 為 key），命中就不連網路、不佔速率限制"""
+    cache_key = CONTENT_API.format(job_id=job_id)
+    if cache is not None and not replay_dir:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return content_to_job_detail(json.loads(cached), job_id, list_data, skill_extractor)
+    for attempt in range(max_retries):
+        try:
+            content = fetch_job_content(session, job_id, replay_dir=replay_dir, rate_limiter=rate_limiter)
+            if archive is not None and not replay_dir:
+                archive.save_content(job_id, content, list_data)
+            job_detail = content_to_job_detail(content, job_id, list_data, skill_extractor)
+            if cache is not None and not replay_dir:
+                cache.put(cache_key, json.dumps(content, ensure_ascii=False))  # 解析成功才存，壞掉的回應不會被快取
+            return job_detail
+        except Exception as e:
+            if attempt < max_retries - 1 and not replay_dir:
+                print(f"HTTP 嘗試 {attempt + 1} 失敗，{job_id} - {str(e)}，重試中...")
+                time.sleep(random.uniform(3, 6))
+                continue
+            print(f"HTTP 錯誤: {job_id} - {str(e)}")
+            return None
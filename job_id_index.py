@@ -0,0 +1,179 @@
+'''
+已存 job_id 的持久化成員索引：Bloom filter 存成一個小檔案（預設 {db_path}.ids），判斷「這個職缺是否已經存過」
+為什麼？原本啟動時 store.job_ids() 把資料庫裡所有 job_id 讀成 Python set，
+歷史資料越多啟動越慢、記憶體越大（每個 job_id 字串加 set 的額外開銷約 100 bytes）。
+Bloom filter 每個 job_id 只佔約 10 bits（1% 誤判率），查詢是固定 k 次位元檢查（O(1)）：
+- 回答「沒有」一定正確，列表頁上絕大多數新職缺到這裡就判斷完
+- 回答「有」可能誤判，再用 SQLite 主鍵查一次確認（exact fallback），所以結果和原本的 set 完全一樣
+索引檔記錄最後同步到的資料庫 rowid，啟動與每次存檔後 sync() 只補上 rowid 比它大的新職缺（增量更新）；
+資料庫被換掉（rowid 變小）或職缺數超過容量時才從資料庫重建
+    python job_id_index.py status --db job_data.db
+    python job_id_index.py rebuild --db job_data.db
+'''
+
+import os  # 檔案與原子性改名
+import math  # 計算位元數與雜湊次數
+import struct  # 檔頭
+import hashlib  # job_id 雜湊
+import argparse  # 命令列
+import tempfile  # 先寫暫存檔再改名
+import threading  # pipeline 的 worker 可能同時查詢
+import numpy as np  # 位元陣列與批次計算位置
+
+MAGIC = b"JIDX1"
+HEADER = struct.Struct("<5sQIQQQ")  # magic、位元數、雜湊次數、容量、已加入筆數、最後同步的 rowid
+MASK64 = (1 << 64) - 1
+
+def _hash_pair(job_id):
+    """job_id → 兩個 64-bit 雜湊值（double hashing 產生 k 個位置）"""
+    digest = hashlib.blake2b(str(job_id).encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+class JobIdIndex:
+    """`job_id in index` 判斷是否已存過；exact（例如 store.has_job）用來確認 Bloom filter 的「有」"""
+
+    def __init__(self, path, capacity=100000, error_rate=0.01, exact=None):
+        self.path = path
+        self.error_rate = error_rate
+        self.exact = exact
+        self.lock = threading.Lock()
+        self.stats = {"lookups": 0, "positives": 0, "false_positives": 0}
+        if not self._load():
+            self._reset(capacity)
+
+    def _reset(self, capacity):
+        self.capacity = max(int(capacity), 1000)
+        self.num_bits = int(math.ceil(-self.capacity * math.log(self.error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+        self.last_rowid = 0
+        self.dirty = True
+
+    def _load(self):
+        """讀取索引檔；不存在或格式不符回傳 False（之後從資料庫重建）"""
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "rb") as f:
+                magic, num_bits, num_hashes, capacity, count, last_rowid = HEADER.unpack(f.read(HEADER.size))
+                bits = np.frombuffer(f.read(), dtype=np.uint8).copy()
+            if magic != MAGIC or len(bits) != (num_bits + 7) // 8:
+                raise ValueError("檔頭或長度不符")
+        except Exception as e:
+            print(f"job_id 索引讀取失敗，將從資料庫重建: {self.path} - {e}")
+            return False
+        self.num_bits, self.num_hashes, self.capacity = num_bits, num_hashes, capacity
+        self.count, self.last_rowid, self.bits = count, last_rowid, bits
+        self.dirty = False
+        return True
+
+    def _positions(self, job_id):
+        h1, h2 = _hash_pair(job_id)
+        return [((h1 + i * h2) & MASK64) % self.num_bits for i in range(self.num_hashes)]
+
+    def _add_many(self, job_ids):
+        """批次加入（numpy 一次算出所有位置；uint64 溢位和 _positions 的 & MASK64 結果相同）"""
+        if not job_ids:
+            return
+        pairs = np.array([_hash_pair(job_id) for job_id in job_ids], dtype=np.uint64)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        positions = ((pairs[:, :1] + steps * pairs[:, 1:]) % np.uint64(self.num_bits)).ravel()
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3), np.left_shift(1, positions & np.uint64(7)).astype(np.uint8))
+        self.count += len(job_ids)
+        self.dirty = True
+
+    def might_contain(self, job_id):
+        """只查 Bloom filter：False 表示一定沒有，True 表示可能有"""
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(job_id))
+
+    def __contains__(self, job_id):
+        with self.lock:
+            self.stats["lookups"] += 1
+            if not self.might_contain(job_id):
+                return False
+            self.stats["positives"] += 1
+        if self.exact is None:
+            return True
+        found = self.exact(str(job_id))
+        if not found:
+            with self.lock:
+                self.stats["false_positives"] += 1
+        return found
+
+    def __len__(self):
+        return self.count
+
+    def sync(self, store):
+        """把資料庫中 rowid 大於上次同步位置的職缺加入索引並存檔，回傳新加入筆數
+        資料庫 rowid 比記錄的小（換了資料庫）或加入後會超過容量時，改為從資料庫重建"""
+        with self.lock:
+            max_rowid = store.max_rowid()
+            if max_rowid < self.last_rowid:
+                return self._rebuild(store)
+            rows = store.ids_since(self.last_rowid)
+            if self.count + len(rows) > self.capacity:
+                return self._rebuild(store)
+            self._add_many([job_id for _, job_id in rows])
+            if rows:
+                self.last_rowid = rows[-1][0]
+            self._save()
+            return len(rows)
+
+    def rebuild(self, store):
+        with self.lock:
+            return self._rebuild(store)
+
+    def _rebuild(self, store):
+        """依資料庫目前筆數的兩倍重設容量，重新加入所有 job_id"""
+        rows = store.ids_since(0)
+        self._reset(max(self.capacity, len(rows) * 2))
+        self._add_many([job_id for _, job_id in rows])
+        self.last_rowid = rows[-1][0] if rows else 0
+        self._save()
+        print(f"已重建 job_id 索引: {self.path}（{len(rows)} 筆，容量 {self.capacity}）")
+        return len(rows)
+
+    def _save(self):
+        """有變動才寫檔；先寫暫存檔再改名，中斷也不會留下寫一半的索引"""
+        if not self.dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.num_bits, self.num_hashes, self.capacity, self.count, self.last_rowid))
+            f.write(self.bits.tobytes())
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def summary(self):
+        with self.lock:
+            stats = dict(self.stats)
+        print(f"[job_id 索引] {self.count} 筆 / 容量 {self.capacity}，{len(self.bits) / 1024:.0f} KB，"
+              f"{self.num_hashes} 個雜湊；查詢 {stats['lookups']} 次、可能存在 {stats['positives']} 次、"
+              f"誤判 {stats['false_positives']} 次")
+
+def open_index(store, path=None):
+    """開啟（或建立）資料庫對應的索引檔，並同步資料庫中新增的職缺"""
+    index = JobIdIndex(path or f"{store.db_path}.ids", exact=store.has_job)
+    index.sync(store)
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="job_id 索引工具：查詢狀態、從資料庫重建")
+    parser.add_argument("command", choices=["status", "rebuild"], help="status 同步後查詢狀態；rebuild 從資料庫重建")
+    parser.add_argument("--db", default="job_data.db", help="SQLite 資料庫檔")
+    parser.add_argument("--index", default=None, help="索引檔（預設為 {db}.ids）")
+    args = parser.parse_args()
+    from job_store import JobStore  # 只有命令列需要
+    store = JobStore(args.db)
+    try:
+        index = open_index(store, args.index)
+        if args.command == "rebuild":
+            index.rebuild(store)
+        index.summary()
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+'''
+增量重爬：用列表頁的 update_date 與卡片內容雜湊，判斷職缺是否需要重爬細節頁
+為什麼？原本只要 job_id 已在資料庫就跳過，薪資或內容改過的職缺永遠不會更新；
+全部重爬又太貴（每個細節頁都要開瀏覽器）。列表頁本來就有每張卡片的更新日期和薪資、標籤等欄位，
+和資料庫存的那筆比對：新職缺或有變動才爬細節頁，沒變的直接略過，並統計省下幾次抓取
+'''
+
+import math  # 判斷 NaN
+import hashlib  # 卡片內容雜湊
+import threading  # pipeline 的 list stage 在另一個執行緒
+
+# 列表頁卡片上會變動、且細節頁也可能跟著變的欄位（update_date 另外比對）
+FINGERPRINT_FIELDS = ["job_title", "company", "industry", "location", "experience", "education", "salary", "tags"]
+
+# 列表頁解析不到欄位時填 "N/A"；從 CSV 匯入的舊資料，pandas 會把 "N/A" 讀成 NaN，匯入時再丟掉
+MISSING_VALUES = {"", "N/A"}
+
+def _normalize(value):
+    """缺值（None、NaN、""、"N/A"）一律視為空字串，避免同一張卡片因來源不同被判斷成有變動"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    text = str(value)
+    return "" if text in MISSING_VALUES else text
+
+def list_fingerprint(row):
+    """列表頁卡片內容的雜湊（欄位缺少或為 N/A 時視為空字串）"""
+    content = "\x1f".join(_normalize(row.get(field)) for field in FINGERPRINT_FIELDS)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+class IncrementalPlanner:
+    """known：{job_id: 資料庫中該職缺的列表頁欄位 dict}（JobStore.list_fields()）
+    plan(rows) 回傳需要爬細節頁的 row（新職缺或有變動），其餘計入略過數"""
+
+    def __init__(self, known):
+        self.known = {job_id: (_normalize(fields.get("update_date")), list_fingerprint(fields)) for job_id, fields in known.items()}
+        self.counts = {"new": 0, "changed": 0, "unchanged": 0}
+        self.lock = threading.Lock()
+
+    def plan(self, rows):
+        to_fetch = []
+        with self.lock:
+            for row in rows:
+                job_id = str(row["job_id"])
+                current = (_normalize(row.get("update_date")), list_fingerprint(row))
+                previous = self.known.get(job_id)
+                if previous is None:
+                    self.counts["new"] += 1
+                elif previous != current:
+                    self.counts["changed"] += 1
+                    reason = f"更新日期 {previous[0]} → {current[0]}" if previous[0] != current[0] else "列表頁內容有變"
+                    print(f"職缺有更新，重爬細節頁: {job_id}（{reason}）")
+                else:
+                    self.counts["unchanged"] += 1
+                    continue
+                self.known[job_id] = current  # 同一次執行中在其他頁再出現就不重複爬
+                to_fetch.append(row)
+        return to_fetch
+
+    def summary(self):
+        with self.lock:
+            counts = dict(self.counts)
+        message = (f"[增量模式] 新職缺 {counts['new']} 個，有更新 {counts['changed']} 個，"
+                   f"未變動略過 {counts['unchanged']} 個（省下 {counts['unchanged']} 次細節頁抓取）")
+        print(message)
+        return counts
@@ -0,0 +1,118 @@
+'''
+逐筆寫入的 JSONL 暫存檔（append-only，每筆職缺爬完立刻寫入）
+為什麼？main() 原本把職缺放在 all_data，每 5 頁才存一次；中途當機、或卡在 Cloudflare 的 input()
+被關掉，最多會丟掉 5 頁 × 20 個細節頁的成果。JSONL 一行一筆、只會往後加，
+寫入後馬上 flush，每 fsync_every 筆或 fsync_interval 秒 fsync 一次（兼顧安全與磁碟負擔）
+之後用 compact 產生去重後的 CSV / Parquet：
+    python job_jsonl_sink.py compact job_details.jsonl --csv job_data_jobcat_1022.csv --parquet_dir job_parquet --jobcat 1022
+'''
+
+import os  # fsync、檢查檔案
+import json  # 一行一筆 JSON
+import time  # 計算距離上次 fsync 的時間
+import argparse  # 命令列 compact
+import threading  # 多個 worker 同時寫入
+import pandas as pd  # compact 輸出 CSV
+
+# 存成 CSV 時要轉成逗號分隔字串的 list 欄位（和 job_store 相同）
+LIST_COLUMNS = ['job_categories', 'skills', 'tools', 'work_skills']
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+class JsonlSink:
+    """執行緒安全的 JSONL 寫入器：write() 寫一行並 flush，批次 fsync"""
+
+    def __init__(self, path, fsync_every=20, fsync_interval=5.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.lock = threading.Lock()
+        self.file = open(path, "a", encoding="utf-8")
+        if self.file.tell() > 0 and not _ends_with_newline(path):
+            self.file.write("\n")  # 上次當機留下半行，先換行，新資料才不會黏在壞掉的那行後面
+        self.pending = 0  # 尚未 fsync 的筆數
+        self.last_sync = time.monotonic()
+        self.written = 0
+
+    def write(self, record):
+        """寫入一筆職缺；record 為 None（爬取失敗）時不寫"""
+        if not record:
+            return
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self.lock:
+            self.file.write(line + "\n")
+            self.file.flush()  # 程式當掉也不會留在 Python 緩衝區
+            self.pending += 1
+            self.written += 1
+            if self.pending >= self.fsync_every or time.monotonic() - self.last_sync >= self.fsync_interval:
+                self._sync()
+
+    def _sync(self):
+        os.fsync(self.file.fileno())  # 確保寫到磁碟，停電或系統當機也不會遺失
+        self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        with self.lock:
+            if self.file.closed:
+                return
+            if self.pending:
+                self._sync()
+            self.file.close()
+
+def iter_jsonl(path):
+    """逐行讀出職缺 dict；最後一行若因當機只寫了一半就略過"""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"略過無法解析的第 {line_no} 行: {path}")
+
+def load_latest(paths):
+    """讀多個 JSONL，同一個 job_id 保留最後寫入的那筆（依 job_id 第一次出現的順序）"""
+    latest = {}
+    for path in paths:
+        for record in iter_jsonl(path):
+            if record.get("job_id"):
+                latest[str(record["job_id"])] = record
+    return list(latest.values())
+
+def compact(paths, csv_path=None, parquet_dir=None, jobcat=None):
+    """把 JSONL 去重後輸出 CSV 及/或 Parquet，回傳去重後筆數"""
+    records = load_latest(paths)
+    if csv_path:
+        df = pd.DataFrame(records)
+        for col in LIST_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].apply(lambda x: ','.join(x) if isinstance(x, list) else x)
+        df.to_csv(csv_path, index=False, encoding="utf-8-sig")
+        print(f"已輸出 CSV: {csv_path}（{len(df)} 筆）")
+    if parquet_dir:
+        from job_parquet import write_partition  # 需要 pyarrow，只在輸出 Parquet 時載入
+        path = write_partition(records, parquet_dir, jobcat or "unknown")
+        print(f"已輸出 Parquet: {path}（{len(records)} 筆）")
+    return len(records)
+
+def main():
+    parser = argparse.ArgumentParser(description="JSONL 暫存檔工具：去重後輸出 CSV / Parquet")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compact_parser = subparsers.add_parser("compact", help="去重後輸出 CSV / Parquet")
+    compact_parser.add_argument("jsonl_files", nargs="+", help="要合併的 JSONL 檔")
+    compact_parser.add_argument("--csv", default=None, help="輸出 CSV 檔名")
+    compact_parser.add_argument("--parquet_dir", default=None, help="輸出 Parquet 資料夾")
+    compact_parser.add_argument("--jobcat", default=None, help="Parquet 分區用的 jobcat（例如 1022）")
+    args = parser.parse_args()
+    total = compact(args.jsonl_files, args.csv, args.parquet_dir, args.jobcat)
+    print(f"去重後共 {total} 筆")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+'''
+104 搜尋列表頁的單次解析器
+從 driver.page_source 一次取出所有職缺卡片的欄位，不再對每個欄位呼叫 find_elements
+為什麼？每次 find_elements 都是一次 WebDriver 往返，一頁 20 張卡片 × 約 10 個欄位，
+加上每張卡片都重新查 div.info-container / div.date-container，往返次數是 O(n²)；
+改成拿到 HTML 後用 lxml 預先編譯好的 XPath 解析，一頁只需要一次 page_source
+104_job_list_crawler.py 和 104_job_crawler_integration.py 共用
+'''
+
+# 執行前需安裝套件：pip install lxml
+
+import re  # 解析 job_id 與總頁數
+from lxml import etree, html  # 比 BeautifulSoup 快很多的 HTML 解析器
+from job_salary import parse_salary  # 薪資字串解析（與整欄向量化版共用規則）
+
+def _has_class(name):
+    """XPath 版的 CSS class 選擇器（div.info-container）"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# 預先編譯 XPath，解析多頁時不用重複編譯；對應原本 Selenium 使用的 CSS selector
+CARD_XPATH = etree.XPath(f"//div[{_has_class('info-container')}]")
+DATE_XPATH = etree.XPath(f"//div[{_has_class('date-container')}]")
+TITLE_XPATH = etree.XPath(".//h2//a[@data-gtm-joblist='職缺-職缺名稱']")
+COMPANY_XPATH = etree.XPath(".//a[@data-gtm-joblist='職缺-公司名稱']")
+INDUSTRY_XPATH = etree.XPath(".//span[contains(@data-gtm-joblist, '職缺-產業')]//a")
+LOCATION_XPATH = etree.XPath(f".//div[{_has_class('info-tags')}]//a[contains(@data-gtm-joblist, '職缺-地區')]")
+EXPERIENCE_XPATH = etree.XPath(f".//div[{_has_class('info-tags')}]//a[contains(@data-gtm-joblist, '職缺-經歷')]")
+EDUCATION_XPATH = etree.XPath(f".//div[{_has_class('info-tags')}]//a[contains(@data-gtm-joblist, '職缺-學歷')]")
+SALARY_XPATH = etree.XPath(f".//div[{_has_class('info-tags')}]//a[contains(@data-gtm-joblist, '職缺-薪資')]")
+TAGS_XPATH = etree.XPath(f".//div[{_has_class('info-othertags')}]//a")
+
+JOB_ID_PATTERN = re.compile(r"/job/(\w+)")
+# 總頁數：只看搜尋結果的分頁元件（下拉選單的「第 1 / 50 頁」），或搜尋狀態資料裡的 "pagination" 物件
+# 為什麼不掃整頁？推薦職缺、廣告等內嵌 JSON 也可能有自己的 totalPage / totalCount，數字較小時會把結束頁數縮錯
+PAGINATION_XPATH = etree.XPath("//*[contains(@class, 'pagination') or contains(@class, 'page-select')]")
+PAGE_OF_PATTERN = re.compile(r"第\s*\d+\s*/\s*(\d+)\s*頁")
+SEARCH_PAGINATION_PATTERN = re.compile(r'"pagination"\s*:\s*(\{[^{}]*\})')
+TOTAL_PAGE_PATTERN = re.compile(r'"(?:lastPage|totalPage)"\s*:\s*(\d+)')
+TOTAL_COUNT_PATTERN = re.compile(r'"(?:total|totalCount)"\s*:\s*(\d+)')
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+def _text(element):
+    """取元素文字並把多個空白合併成一個，接近 Selenium .text 的結果"""
+    return WHITESPACE_PATTERN.sub(" ", element.text_content()).strip()
+
+def _first_text(xpath, card, default="N/A"):
+    elements = xpath(card)
+    return _text(elements[0]) if elements else default
+
+def parse_list_page(page_source, source_url):
+    """把列表頁 HTML 轉成 row dict 列表，欄位與原本 Selenium 版相同
+    注意：不做去重或過濾已存在職缺，由呼叫端決定"""
+    tree = html.fromstring(page_source)
+    cards = CARD_XPATH(tree)
+    dates = DATE_XPATH(tree)
+    if len(dates) != len(cards):
+        print(f"警告：日期元素數量不匹配（職缺 {len(cards)}、日期 {len(dates)}，可能廣告影響）")
+    rows = []
+    for idx, card in enumerate(cards):
+        row = {}
+        title_elem = TITLE_XPATH(card)
+        row["job_title"] = _text(title_elem[0]) if title_elem else "N/A"
+        job_id = "N/A"
+        href = title_elem[0].get("href") if title_elem else None
+        if href:
+            match = JOB_ID_PATTERN.search(href)
+            job_id = match.group(1) if match else "N/A"
+        row["job_id"] = job_id
+        row["company"] = _first_text(COMPANY_XPATH, card)
+        row["industry"] = _first_text(INDUSTRY_XPATH, card)
+        row["location"] = _first_text(LOCATION_XPATH, card)
+        row["experience"] = _first_text(EXPERIENCE_XPATH, card)
+        row["education"] = _first_text(EDUCATION_XPATH, card)
+        salary = _first_text(SALARY_XPATH, card)
+        row["salary"] = salary
+        min_salary, max_salary, avg_salary, salary_note = parse_salary(salary)
+        row["salary_min"] = min_salary
+        row["salary_max"] = max_salary
+        row["salary_avg"] = avg_salary
+        row["salary_note"] = salary_note
+        tags = [_text(tag) for tag in TAGS_XPATH(card)]
+        row["tags"] = ", ".join(tags) if tags else "N/A"
+        # 日期和原本一樣用全域索引對應（日期不在 info-container 裡）
+        row["update_date"] = _text(dates[idx]) if idx < len(dates) else "N/A"
+        row["source_url"] = source_url
+        rows.append(row)
+    return rows
+
+def parse_total_pages(page_source, page_size=20):
+    """從列表頁 HTML 推估搜尋結果總頁數，找不到回傳 None
+    先看分頁元件的「第 N / M 頁」，再看搜尋狀態的 pagination 物件：有總頁數用總頁數，
+    沒有的話用總筆數 ÷ 每頁筆數（無條件進位）"""
+    elements = PAGINATION_XPATH(html.fromstring(page_source)) if page_source.strip() else []  # 空白頁 lxml 會拋錯
+    for element in elements:
+        pages = [int(total) for total in PAGE_OF_PATTERN.findall(element.text_content())]
+        if pages:
+            return max(pages)
+    for state in SEARCH_PAGINATION_PATTERN.findall(page_source):
+        match = TOTAL_PAGE_PATTERN.search(state)
+        if match:
+            return int(match.group(1))
+        match = TOTAL_COUNT_PATTERN.search(state)
+        if match:
+            return -(-int(match.group(1)) // page_size)
+    return None
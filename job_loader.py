@@ -0,0 +1,115 @@
+'''
+職缺 CSV 的省記憶體載入：依宣告的 schema 設定型別，只讀需要的欄位，可分批（chunk）讀取
+為什麼？pd.read_csv 預設把所有文字欄位讀成 object，每個值都是一個 Python 字串；
+industry、location、experience、education、company 這些欄位重複率很高（幾萬筆只有幾百種值），
+改成 category 只存一份字典加上整數代碼；薪資數字改成 nullable 整數 / float32，
+再配合 usecols 不讀 job_description 等長文字欄位，記憶體通常只剩原本的一小部分。
+多個月的歷史資料太大時用 iter_chunks() 分批處理，或 load_jobs(chunksize=...) 分批讀再合併（category 會合併字典）
+    python job_loader.py 104_job_data_jobcat_1022_raw.csv                       # 全部欄位，列出載入前後的記憶體
+    python job_loader.py 104_job_data_jobcat_1022_raw.csv --columns job_id industry salary --chunksize 10000
+'''
+
+import argparse  # 命令列
+import pandas as pd  # 讀取 CSV
+from pandas.api.types import union_categoricals  # 合併各批次的 category
+
+# 欄位型別：category 用於重複率高的欄位；Int32 為可有缺值的整數；沒列出的欄位（job_id、長文字）維持字串
+SCHEMA = {
+    'company': 'category',
+    'industry': 'category',
+    'location': 'category',
+    'experience': 'category',
+    'education': 'category',
+    'salary': 'category',
+    'salary_min': 'Int32',
+    'salary_max': 'Int32',
+    'salary_avg': 'float32',
+    'salary_note': 'category',
+    'update_date': 'category',
+    'work_shift': 'category',
+    'remote_work': 'category',
+    'BT_EXP': 'category',
+    'languages': 'category',
+    'management_responsibility': 'category',
+    'jobcat': 'category',
+}
+
+def apply_schema(df):
+    """依 SCHEMA 轉換 df 已有的欄位（原地修改並回傳 df）"""
+    for column, dtype in SCHEMA.items():
+        if column not in df.columns or str(df[column].dtype) == dtype:
+            continue
+        if dtype == 'Int32':
+            df[column] = pd.to_numeric(df[column], errors='coerce').round().astype('Int32')
+        elif dtype == 'float32':
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype('float32')
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+def _usecols(columns):
+    """欄位投影：只讀 columns 裡有的欄位，舊檔缺欄位時不報錯"""
+    return None if columns is None else (lambda column: column in columns)
+
+def iter_chunks(path, columns=None, chunksize=50000, stats=None):
+    """分批讀取 CSV，每批都已套用 SCHEMA；stats（dict）會累加每批轉換前後的記憶體（bytes）"""
+    reader = pd.read_csv(path, usecols=_usecols(columns), chunksize=chunksize, dtype={'job_id': str}, low_memory=False)
+    for chunk in reader:
+        if stats is not None:
+            stats['before'] = stats.get('before', 0) + int(chunk.memory_usage(deep=True).sum())
+        chunk = apply_schema(chunk)
+        if stats is not None:
+            stats['after'] = stats.get('after', 0) + int(chunk.memory_usage(deep=True).sum())
+            stats['rows'] = stats.get('rows', 0) + len(chunk)
+        yield chunk
+
+def _concat(chunks):
+    """合併各批次；category 欄位先合併字典，避免 concat 後退回 object"""
+    if len(chunks) == 1:
+        return chunks[0]
+    categorical = [column for column in chunks[0].columns if isinstance(chunks[0][column].dtype, pd.CategoricalDtype)]
+    merged = {column: union_categoricals([chunk[column] for chunk in chunks]) for column in categorical}
+    df = pd.concat([chunk.drop(columns=categorical) for chunk in chunks], ignore_index=True)
+    for column in categorical:
+        df[column] = merged[column]
+    return df[chunks[0].columns]
+
+def load_jobs(path, columns=None, chunksize=None, report=False):
+    """讀取職缺 CSV 並套用 SCHEMA；chunksize 有值時分批讀（降低讀取時的記憶體高峰）
+    report=True 時印出轉換前（預設 object 型別）與轉換後的記憶體"""
+    stats = {} if report else None
+    if chunksize:
+        chunks = list(iter_chunks(path, columns, chunksize, stats))
+        df = _concat(chunks) if chunks else pd.DataFrame(columns=columns or [])
+    else:
+        df = pd.read_csv(path, usecols=_usecols(columns), dtype={'job_id': str}, low_memory=False)
+        if stats is not None:
+            stats['before'] = int(df.memory_usage(deep=True).sum())
+        df = apply_schema(df)
+        if stats is not None:
+            stats['after'] = int(df.memory_usage(deep=True).sum())
+    if report:
+        before, after = stats.get('before', 0), int(df.memory_usage(deep=True).sum())
+        print(f"[載入] {path}: {len(df)} 筆、{len(df.columns)} 欄，記憶體 {before / 1024 / 1024:.1f} MB → "
+              f"{after / 1024 / 1024:.1f} MB（{(1 - after / before) * 100 if before else 0:.0f}% 節省）")
+    return df
+
+def read_job_ids(path, chunksize=200000):
+    """只讀 job_id 欄位（分批），回傳 set；不解析其他欄位"""
+    job_ids = set()
+    for chunk in pd.read_csv(path, usecols=['job_id'], dtype={'job_id': str}, chunksize=chunksize):
+        job_ids.update(chunk['job_id'].dropna())
+    return job_ids
+
+def main():
+    parser = argparse.ArgumentParser(description="依 schema 載入職缺 CSV，列出記憶體使用量")
+    parser.add_argument("csv_path", help="職缺 CSV 檔")
+    parser.add_argument("--columns", nargs="+", default=None, help="只讀這些欄位（預設全部）")
+    parser.add_argument("--chunksize", type=int, default=None, help="分批讀取的筆數")
+    args = parser.parse_args()
+    df = load_jobs(args.csv_path, args.columns, args.chunksize, report=True)
+    usage = df.memory_usage(deep=True).drop('Index').sort_values(ascending=False)
+    print(pd.DataFrame({'dtype': df.dtypes.astype(str), 'MB': (usage / 1024 / 1024).round(2)}).loc[usage.index].to_string())
+
+if __name__ == "__main__":
+    main()
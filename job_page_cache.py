@@ -0,0 +1,187 @@
+'''
+依 URL 快取抓到的頁面（列表頁 HTML、細節頁 HTML、職缺內容 JSON）
+內容以 SHA-256 定址、壓縮後存成 {cache_dir}/objects/ab/abcdef...（有 zstandard 用 zstd，沒有就用 gzip），
+URL → 內容雜湊、存入時間、最後使用時間記在 {cache_dir}/index.db（SQLite）
+為什麼？列表頁原本每頁都把完整 page_source 寫成 page_source_attempt_{n}.html：沒壓縮、沒有 key、
+下一頁就覆蓋，寫了也沒用。開發時改解析規則重跑，又要重新開瀏覽器、重新等 104。
+這裡存入時間在 ttl 秒內的頁面直接從快取讀，不開瀏覽器也不佔速率限制；
+總大小超過 max_mb 時先清掉過期的，再依最後使用時間（LRU）刪到上限以下；相同內容只存一份
+    python job_page_cache.py status --cache_dir page_cache
+    python job_page_cache.py clear --cache_dir page_cache
+'''
+
+import os  # 資料夾與原子性改名
+import gzip  # 沒有 zstandard 時的壓縮
+import time  # 存入 / 使用時間
+import sqlite3  # URL 索引
+import hashlib  # 內容定址
+import argparse  # 命令列
+import tempfile  # 先寫暫存檔再改名
+import threading  # pipeline 與多個 worker 同時讀寫
+
+try:
+    import zstandard  # 比 gzip 壓得快、解得更快（pip install zstandard）
+except ImportError:
+    zstandard = None
+
+class PageCache:
+    """get(url) 取回 ttl 秒內存入的內容（str），沒有或過期回傳 None；put(url, body) 存入"""
+
+    def __init__(self, cache_dir="page_cache", ttl=6 * 3600, max_mb=500):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.codec = "zstd" if zstandard is not None else "gzip"
+        os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(cache_dir, "index.db"), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                codec TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed_at)")
+        self.conn.commit()
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+
+    def _object_path(self, digest, codec):
+        return os.path.join(self.cache_dir, "objects", digest[:2], f"{digest}.{'zst' if codec == 'zstd' else 'gz'}")
+
+    def _compress(self, data):
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    @staticmethod
+    def _decompress(data, codec):
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("快取用 zstd 壓縮，需安裝 zstandard")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def get(self, url):
+        with self.lock:
+            row = self.conn.execute("SELECT digest, codec, stored_at FROM pages WHERE url = ?", (url,)).fetchone()
+            if row is None or row[2] < time.time() - self.ttl:
+                self.stats["misses"] += 1
+                return None
+            digest, codec, _ = row
+            try:
+                with open(self._object_path(digest, codec), "rb") as f:
+                    body = self._decompress(f.read(), codec).decode("utf-8")
+            except Exception as e:
+                print(f"快取內容讀取失敗，改抓網頁: {url} - {e}")
+                self.conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+                self.conn.commit()
+                self.stats["misses"] += 1
+                return None
+            self.conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+            self.stats["hits"] += 1
+            return body
+
+    def put(self, url, body):
+        """存入內容（str）；快取寫入失敗只印出，不影響爬蟲"""
+        data = body.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest, self.codec)
+        now = time.time()
+        try:
+            with self.lock:
+                previous = self.conn.execute("SELECT digest, codec FROM pages WHERE url = ?", (url,)).fetchone()
+                if not os.path.exists(path):  # 相同內容（例如不同 URL 同一頁）只存一份
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(self._compress(data))
+                    os.replace(tmp_path, path)
+                self.conn.execute(
+                    """INSERT INTO pages (url, digest, codec, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(url) DO UPDATE SET digest = excluded.digest, codec = excluded.codec, size = excluded.size,
+                       stored_at = excluded.stored_at, accessed_at = excluded.accessed_at""",
+                    (url, digest, self.codec, os.path.getsize(path), now, now))
+                self.conn.commit()
+                # 同一個 URL 換了內容（例如列表頁過期後重抓）：舊內容沒有其他 URL 引用就刪掉，不留孤兒檔案
+                if previous is not None and previous[0] != digest:
+                    self._remove_unreferenced(*previous)
+                self.stats["stored"] += 1
+                self._evict()
+        except Exception as e:
+            print(f"寫入頁面快取失敗，已忽略: {url} - {e}")
+
+    def _total_bytes(self):
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM pages)").fetchone()[0]
+
+    def _evict(self):
+        """先刪過期的，總大小仍超過上限再依最後使用時間由舊到新刪，並刪掉沒人引用的內容檔"""
+        self._delete(self.conn.execute("SELECT url, digest, codec FROM pages WHERE stored_at < ?",
+                                       (time.time() - self.ttl,)).fetchall())
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+        # 同一份內容可能被多個 URL 引用：最後一個引用它的 URL 被淘汰時，內容檔才真的刪掉、總大小才減少
+        refs = dict(self.conn.execute("SELECT digest, COUNT(*) FROM pages GROUP BY digest").fetchall())
+        victims = []
+        for url, digest, codec, size in self.conn.execute("SELECT url, digest, codec, size FROM pages ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            victims.append((url, digest, codec))
+            refs[digest] -= 1
+            if refs[digest] == 0:
+                total -= size
+        self._delete(victims)
+
+    def _delete(self, rows):
+        if not rows:
+            return
+        self.conn.executemany("DELETE FROM pages WHERE url = ?", [(url,) for url, _, _ in rows])
+        self.conn.commit()
+        for _, digest, codec in rows:
+            self._remove_unreferenced(digest, codec)
+        self.stats["evicted"] += len(rows)
+
+    def _remove_unreferenced(self, digest, codec):
+        """內容檔已沒有任何 URL 引用時刪掉"""
+        if self.conn.execute("SELECT 1 FROM pages WHERE digest = ? LIMIT 1", (digest,)).fetchone() is None:
+            try:
+                os.remove(self._object_path(digest, codec))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        with self.lock:
+            self._delete(self.conn.execute("SELECT url, digest, codec FROM pages").fetchall())
+
+    def summary(self):
+        with self.lock:
+            pages = self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            total = self._total_bytes()
+            stats = dict(self.stats)
+        print(f"[頁面快取] 命中 {stats['hits']} 次、未命中 {stats['misses']} 次，本次存入 {stats['stored']} 頁、"
+              f"淘汰 {stats['evicted']} 頁；目前 {pages} 頁，{total / 1024 / 1024:.1f} MB（{self.codec}）")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="頁面快取工具：查詢狀態、清空")
+    parser.add_argument("command", choices=["status", "clear"], help="status 查詢狀態；clear 清空快取")
+    parser.add_argument("--cache_dir", default="page_cache", help="快取資料夾")
+    args = parser.parse_args()
+    cache = PageCache(args.cache_dir)
+    try:
+        if args.command == "clear":
+            cache.clear()
+        cache.summary()
+    finally:
+        cache.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+'''
+列表頁提早結束的規則
+為什麼？main() 原本一定從 start_page 走到 end_page（預設 20 頁），每頁光等待就要 20~40 秒，
+即使整頁職缺都已經在資料庫、全部被過濾掉也一樣。每天執行、依更新日期排序時，
+新職缺都在前幾頁：連續 stop_after 頁都沒有新職缺就停；
+第一頁若能讀到搜尋結果總頁數，也不會去開超過總頁數的空白頁
+'''
+
+import threading  # pipeline 的 list stage 在另一個執行緒
+
+class PaginationPolicy:
+    """stop_after：連續幾頁沒有新職缺就停止（0 表示不啟用）
+    observe(page, new_count, total_pages) 在每頁列完後呼叫，回傳是否繼續下一頁"""
+
+    def __init__(self, start_page, end_page, stop_after=0):
+        self.start_page = start_page
+        self.end_page = end_page
+        self.planned_end = end_page  # 原本預計爬到的頁數，用來計算省下幾頁
+        self.stop_after = stop_after
+        self.empty_streak = 0
+        self.last_page = None
+        self.stop_reason = None
+        self.lock = threading.Lock()
+
+    def update_total_pages(self, total_pages, current_page=None):
+        """讀到總頁數時，把結束頁數縮到總頁數
+        比目前這頁還小的總頁數一定是讀錯了（例如其他區塊的資料），忽略，避免漏掉真正的頁面"""
+        with self.lock:
+            if total_pages and current_page and total_pages < current_page:
+                print(f"忽略總頁數 {total_pages}（小於目前頁數 {current_page}）")
+                return
+            if total_pages and total_pages < self.end_page:
+                print(f"搜尋結果共 {total_pages} 頁，結束頁數由 {self.end_page} 改為 {total_pages}")
+                self.end_page = total_pages
+
+    def observe(self, page, new_count):
+        with self.lock:
+            self.last_page = page
+            self.empty_streak = 0 if new_count else self.empty_streak + 1
+            if page >= self.end_page:
+                if self.end_page < self.planned_end:
+                    self.stop_reason = f"已到搜尋結果最後一頁（第 {self.end_page} 頁）"
+                return False
+            if self.stop_after and self.empty_streak >= self.stop_after:
+                self.stop_reason = f"連續 {self.empty_streak} 頁沒有新職缺"
+                return False
+            return True
+
+    def pages_saved(self):
+        with self.lock:
+            if self.last_page is None:
+                return 0
+            return max(0, self.planned_end - self.last_page)
+
+    def summary(self):
+        saved = self.pages_saved()
+        if self.stop_reason:
+            print(f"[提早結束] {self.stop_reason}，停在第 {self.last_page} 頁，省下 {saved} 頁列表頁")
+        else:
+            print("[提早結束] 未觸發，依原本頁數範圍爬完")
+        return saved
@@ -0,0 +1,107 @@
+'''
+職缺資料的 Parquet 輸出（欄式儲存、有型別、依爬取日期與 jobcat 分區）
+為什麼？utf-8-sig CSV 沒有型別，list 欄位被 ','.join 成字串，job_description 又是長篇多行文字，
+重讀幾萬行 CSV 又慢又吃記憶體；Parquet 有壓縮、保留 list 與數值型別，而且可以只讀需要的欄位
+目錄結構（hive 分區）：
+    {root}/crawl_date=20251022/jobcat=1022/part-20251022T101500-xxxx.parquet
+'''
+
+# 執行前需安裝套件：pip install pandas pyarrow
+
+import os  # 建立分區資料夾
+import uuid  # 每次寫入的檔名不重複（append-only）
+from datetime import datetime  # 檔名時間戳
+import pandas as pd  # 讀取 Parquet
+import pyarrow as pa  # 定義 schema
+import pyarrow.dataset as ds  # 讀取分區資料夾
+import pyarrow.parquet as pq  # 寫入 Parquet
+
+# 職缺資料的 schema；分區欄位 crawl_date / jobcat 由資料夾名稱提供，不寫進檔案
+JOB_SCHEMA = pa.schema([
+    ("job_id", pa.string()),
+    ("job_title", pa.string()),
+    ("company", pa.string()),
+    ("industry", pa.string()),
+    ("location", pa.string()),
+    ("experience", pa.string()),
+    ("education", pa.string()),
+    ("salary", pa.string()),
+    ("salary_min", pa.int64()),
+    ("salary_max", pa.int64()),
+    ("salary_avg", pa.float64()),
+    ("salary_note", pa.string()),
+    ("tags", pa.string()),
+    ("update_date", pa.string()),
+    ("source_url", pa.string()),
+    ("job_description", pa.string()),
+    ("skills", pa.list_(pa.string())),
+    ("job_categories", pa.list_(pa.string())),
+    ("management_responsibility", pa.string()),
+    ("work_shift", pa.string()),
+    ("remote_work", pa.string()),
+    ("BT_EXP", pa.string()),
+    ("languages", pa.string()),
+    ("tools", pa.list_(pa.string())),
+    ("work_skills", pa.list_(pa.string())),
+    ("other_conditions", pa.string()),
+])
+
+LIST_FIELDS = {field.name for field in JOB_SCHEMA if pa.types.is_list(field.type)}
+INT_FIELDS = {field.name for field in JOB_SCHEMA if pa.types.is_integer(field.type)}
+FLOAT_FIELDS = {field.name for field in JOB_SCHEMA if pa.types.is_floating(field.type)}
+
+def _normalize_value(name, value):
+    """把一個欄位轉成 schema 對應的 Python 型別；缺值回傳 None"""
+    if value is None:
+        return None
+    if name in LIST_FIELDS:
+        if isinstance(value, str):
+            # 舊資料或 CSV 匯入的 list 欄位是逗號分隔字串
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return [str(item) for item in value]
+    if isinstance(value, float) and pd.isna(value):
+        return None
+    if name in INT_FIELDS:
+        return int(value)
+    if name in FLOAT_FIELDS:
+        return float(value)
+    return str(value)
+
+def records_to_table(records):
+    """job_detail dict 列表 → 符合 JOB_SCHEMA 的 pyarrow Table（多的欄位忽略，少的欄位補 None）"""
+    columns = {field.name: [] for field in JOB_SCHEMA}
+    for record in records:
+        for name in columns:
+            columns[name].append(_normalize_value(name, record.get(name)))
+    return pa.table(columns, schema=JOB_SCHEMA)
+
+def write_partition(records, root_dir, jobcat, crawl_date=None):
+    """把一批職缺寫成新的 Parquet 檔（append-only），回傳檔案路徑"""
+    if not records:
+        return None
+    crawl_date = crawl_date or datetime.now().strftime("%Y%m%d")
+    partition_dir = os.path.join(root_dir, f"crawl_date={crawl_date}", f"jobcat={jobcat}")
+    os.makedirs(partition_dir, exist_ok=True)
+    filename = f"part-{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+    path = os.path.join(partition_dir, filename)
+    pq.write_table(records_to_table(records), path, compression="zstd")
+    return path
+
+def read_jobs(root_dir, columns=None, crawl_dates=None, jobcats=None):
+    """讀取 Parquet 資料集，只讀 columns 指定的欄位；可用 crawl_dates / jobcats 篩選分區
+    同一個 job_id 出現在多個分區時保留最新爬取的那筆"""
+    filters = []
+    if crawl_dates:
+        filters.append(("crawl_date", "in", [str(d) for d in crawl_dates]))
+    if jobcats:
+        filters.append(("jobcat", "in", [str(j) for j in jobcats]))
+    read_columns = None
+    if columns is not None:
+        read_columns = list(dict.fromkeys(list(columns) + ["job_id", "crawl_date"]))
+    partitioning = ds.partitioning(
+        pa.schema([("crawl_date", pa.string()), ("jobcat", pa.string())]), flavor="hive")
+    df = pd.read_parquet(root_dir, columns=read_columns, filters=filters or None, partitioning=partitioning)
+    df = df.sort_values("crawl_date", kind="stable").drop_duplicates(subset=["job_id"], keep="last")
+    if columns is not None:
+        df = df[list(columns)]
+    return df.reset_index(drop=True)
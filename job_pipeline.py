@@ -0,0 +1,137 @@
+'''
+列表頁 / 細節頁兩段式 pipeline（producer / consumer）
+list stage 一頁一頁抓 job_id，放進有上限的 queue；detail worker 同時從 queue 取出爬細節頁
+為什麼？原本要等第 N 頁所有細節頁爬完才開第 N+1 頁，列表頁的固定等待（10 秒 + 10~20 秒 + 最多 60 秒 WebDriverWait）
+全部卡在關鍵路徑上；拆成兩段後，列表頁的等待和細節頁的爬取會重疊
+斷點只記錄「已經存檔」的頁數：某頁的所有職缺都處理完並寫入檔案，checkpoint 才會前進到那一頁
+'''
+
+import queue  # 有上限的 queue，list stage 太快時會自動等待 detail worker
+import threading  # list stage 與 detail worker 各自一個執行緒
+
+_STOP = object()  # 通知 detail worker 結束的記號
+
+class PageCommitTracker:
+    """記錄每頁送出幾個職缺、已存檔幾個，算出可以寫入 checkpoint 的頁數
+    例如第 3 頁已全部存檔但第 2 頁還有職缺在爬，checkpoint 只能停在第 1 頁"""
+
+    def __init__(self, start_page):
+        self.next_page = start_page  # 下一個尚未全部存檔的頁數
+        self.listed = {}  # page -> 該頁送出的職缺數（頁面列完才會有值）
+        self.committed = {}  # page -> 該頁已存檔（或確定失敗）的職缺數
+        self.lock = threading.Lock()
+
+    def page_listed(self, page, job_count):
+        with self.lock:
+            self.listed[page] = job_count
+            self.committed.setdefault(page, 0)
+
+    def jobs_committed(self, pages):
+        """pages：這次存檔的每個職缺所屬頁數"""
+        with self.lock:
+            for page in pages:
+                self.committed[page] = self.committed.get(page, 0) + 1
+
+    def committed_page(self):
+        """回傳最後一個「它和之前所有頁都已存檔」的頁數，沒有則回傳 None"""
+        with self.lock:
+            last = None
+            while self.next_page in self.listed and self.committed.get(self.next_page, 0) >= self.listed[self.next_page]:
+                last = self.next_page
+                self.next_page += 1
+            return last
+
+def run_pipeline(pages, list_fn, crawl_fn, detail_pool, commit_fn, checkpoint_fn,
+                 queue_size=40, commit_every=20, continue_fn=None):
+    """執行 pipeline
+    pages：[(page, url), ...]；list_fn(url) 回傳該頁的 job_data_list（在 list stage 執行緒執行）
+    crawl_fn(resource, row) 爬一個細節頁，由 detail_pool 的 worker 資源執行
+    commit_fn(data) 存檔；checkpoint_fn(page) 寫入斷點
+    continue_fn(page, job_data_list) 回傳 False 時，該頁送出後就不再開下一頁（提早結束）
+    回傳 (存檔職缺數, 失敗的 row 列表)，失敗的 row 可交給呼叫端用其他方式補爬"""
+    job_queue = queue.Queue(maxsize=queue_size)
+    results = queue.Queue()
+    tracker = PageCommitTracker(pages[0][0] if pages else 1)
+    stop_event = threading.Event()
+
+    def list_stage():
+        try:
+            for page, url in pages:
+                if stop_event.is_set():
+                    break
+                try:
+                    job_data_list = list_fn(url)
+                except Exception as e:
+                    print(f"列表頁 {page} 失敗: {e}")
+                    job_data_list = []
+                tracker.page_listed(page, len(job_data_list))
+                print(f"列表頁 {page} 送出 {len(job_data_list)} 個職缺，queue 中 {job_queue.qsize()} 個")
+                if not job_data_list:
+                    results.put((page, None, None))  # 空頁也要讓主執行緒推進 checkpoint
+                for row in job_data_list:
+                    if stop_event.is_set():
+                        break
+                    job_queue.put((page, row))
+                if continue_fn is not None and not continue_fn(page, job_data_list):
+                    break
+        finally:
+            for _ in range(detail_pool.workers):
+                job_queue.put(_STOP)
+
+    def detail_stage():
+        while True:
+            item = job_queue.get()
+            if item is _STOP:
+                results.put(_STOP)
+                break
+            page, row = item
+            if stop_event.is_set():
+                results.put((page, row, None))
+                continue
+            results.put((page, row, detail_pool.process(crawl_fn, row)))
+
+    threads = [threading.Thread(target=list_stage, name="list-stage", daemon=True)]
+    threads += [threading.Thread(target=detail_stage, name=f"detail-{i}", daemon=True) for i in range(detail_pool.workers)]
+    for thread in threads:
+        thread.start()
+
+    buffer, buffer_pages, failed = [], [], []
+    saved = 0
+    finished_workers = 0
+
+    def flush():
+        nonlocal buffer, buffer_pages, saved
+        if buffer:
+            commit_fn(buffer)
+            saved += len(buffer)
+        tracker.jobs_committed(buffer_pages)  # 失敗的職缺也算處理完，才不會卡住 checkpoint
+        buffer, buffer_pages = [], []
+        page = tracker.committed_page()
+        if page is not None:
+            checkpoint_fn(page)
+
+    try:
+        while finished_workers < detail_pool.workers:
+            item = results.get()
+            if item is _STOP:
+                finished_workers += 1
+                continue
+            page, row, job_detail = item
+            if row is None:
+                flush()  # 空頁
+                continue
+            buffer_pages.append(page)
+            if job_detail:
+                buffer.append(job_detail)
+                print(f"已處理職缺 {row['job_id']}（第 {page} 頁）")
+            else:
+                failed.append(row)
+            if len(buffer_pages) >= commit_every:
+                flush()
+    except KeyboardInterrupt:
+        print("偵測到手動中斷 (Ctrl+C)，停止 pipeline 並儲存已完成的職缺...")
+        stop_event.set()
+        raise
+    finally:
+        flush()
+    return saved, failed
@@ -0,0 +1,64 @@
+'''
+共用的請求速率限制器（token bucket）
+取代各處 time.sleep(random.uniform(...))：所有 worker 共用同一個桶，
+不論開幾個瀏覽器或 HTTP Session，對同一個網站的總請求速率都不會超過設定值
+'''
+
+import time  # 計算補充 token 的時間
+import random  # 取得 token 後加一點隨機延遲，讓請求間隔不那麼規律
+import threading  # 多個 worker 同時取 token 需要加鎖
+from urllib.parse import urlparse  # 從 URL 取出 host，依 host 分開限速
+
+class TokenBucket:
+    """token bucket：每秒補充 rate 個 token，最多累積 capacity 個
+    為什麼？固定 sleep 只能限制單一執行緒，token bucket 可以限制所有執行緒加起來的速率"""
+
+    def __init__(self, rate, capacity=1, jitter=0.0):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.jitter = jitter
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """取得一個 token，不夠時阻塞等待；回傳實際等待秒數"""
+        if self.rate <= 0:
+            return 0.0  # rate <= 0 表示不限速
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+        if self.jitter > 0:
+            extra = random.uniform(0, self.jitter)
+            time.sleep(extra)
+            waited += extra
+        return waited
+
+class HostRateLimiter:
+    """依 host 各自一個 TokenBucket，所有 worker 共用同一個實例"""
+
+    def __init__(self, rate, burst=1, jitter=None):
+        self.rate = rate
+        self.burst = burst
+        # 預設加上最多半個間隔的隨機延遲，模擬人類瀏覽的不規律
+        self.jitter = jitter if jitter is not None else (0.5 / rate if rate > 0 else 0.0)
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, url):
+        host = urlparse(url).netloc or url
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst, self.jitter)
+                self.buckets[host] = bucket
+        return bucket.acquire()
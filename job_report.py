@@ -0,0 +1,360 @@
+'''
+分析報表的圖表：六組圖（薪資、產業、經歷、遠端工作、技能、總覽）各是一個函式，輸入 job_aggregates.py 算好的指標
+Job_list_Analize.py 互動顯示用同一組函式；這裡另外提供無介面的報表模式：
+不用 TkAgg、不呼叫 plt.show()，六組圖丟給多個進程同時畫，全部存到同一個資料夾，並記錄每張圖花的時間
+為什麼？原本的分析腳本固定用 TkAgg 又每張圖都 plt.show()，沒有螢幕的伺服器跑不起來，
+dpi=300 的六張圖也是一張畫完才畫下一張；每天晚上排程產生報表時不需要人在旁邊
+    python job_report.py job_data_jobcat_1022_20251019.csv --output_dir reports/20251019
+    python job_report.py job_data_jobcat_1022_20251019.csv --processes 1   # 依序畫（比較時間用）
+'''
+
+import os  # 輸出資料夾
+import time  # 每張圖的時間
+import argparse  # 命令列
+from concurrent.futures import ProcessPoolExecutor, as_completed  # 多進程畫圖（matplotlib 畫圖吃 CPU，執行緒幫不上忙）
+import matplotlib
+import matplotlib.pyplot as plt
+import seaborn as sns
+from job_features import EXP_ORDER  # 經驗排序
+
+# 中文字型：依序找得到哪個用哪個（Windows 微軟正黑體、macOS 蘋方、Linux 思源黑體 / 文泉驛）
+CJK_FONTS = ['Microsoft JhengHei', 'PingFang TC', 'Noto Sans CJK TC', 'Noto Sans CJK JP', 'WenQuanYi Zen Hei', 'DejaVu Sans']
+
+def configure_fonts():
+    """設定中文字型與字型大小（互動模式與報表模式共用）"""
+    plt.rcParams['font.sans-serif'] = CJK_FONTS
+    plt.rcParams['axes.unicode_minus'] = False
+    plt.rcParams['font.size'] = 8  # 保持字型大小
+
+def plot_salary(metrics):
+    """薪資分析圖表"""
+    df_salary = metrics['salary_frame']
+    industry_salary = metrics['industry_salary']
+    fig, axes = plt.subplots(2, 2, figsize=(20, 12))
+    fig.suptitle('薪資分析', fontsize=12)
+
+    # 子圖 1：薪資分佈直方圖
+    sns.histplot(df_salary['salary_avg'], bins=20, kde=True, ax=axes[0, 0])
+    axes[0, 0].set_title('薪資分佈 (月薪)')
+    axes[0, 0].set_xlabel('平均薪資 (元)')
+    axes[0, 0].set_ylabel('職缺數')
+    axes[0, 0].tick_params(axis='both', labelsize=6)
+
+    # 子圖 2：按經驗的薪資箱形圖
+    sns.boxplot(x='experience', y='salary_avg', data=df_salary, ax=axes[0, 1], order=EXP_ORDER)
+    axes[0, 1].set_title('按經驗要求的薪資')
+    axes[0, 1].set_xlabel('經驗要求')
+    axes[0, 1].set_ylabel('平均薪資 (元)')
+    axes[0, 1].tick_params(axis='x', rotation=45, labelsize=6)
+
+    # 子圖 3：按產業的薪資長條圖
+    sns.barplot(x='mean', y=industry_salary.index, data=industry_salary, ax=axes[1, 0])
+    axes[1, 0].set_title('按產業的薪資 (前 10)')
+    axes[1, 0].set_xlabel('平均薪資 (元)')
+    axes[1, 0].set_ylabel('產業')
+    axes[1, 0].tick_params(axis='y', labelsize=6)
+
+    # 子圖 4：遠端工作與薪資箱形圖
+    sns.boxplot(x='is_remote', y='salary_avg', data=df_salary, ax=axes[1, 1])
+    axes[1, 1].set_title('遠端工作與薪資')
+    axes[1, 1].set_xlabel('是否遠端工作')
+    axes[1, 1].set_ylabel('平均薪資 (元)')
+    axes[1, 1].set_xticks([0, 1])
+    axes[1, 1].set_xticklabels(['否', '是'], fontsize=6)
+
+    fig.subplots_adjust(wspace=0.4, hspace=0.5)
+    return fig
+
+def plot_industry(metrics):
+    """產業分析圖表"""
+    industry_salary = metrics['industry_salary']
+    industry_counts = metrics['industry_counts']
+    remote_industry = metrics['remote_industry']
+    exp_industry = metrics['exp_industry']
+    fig, axes = plt.subplots(2, 2, figsize=(20, 12))
+    fig.suptitle('產業分析', fontsize=12)
+
+    # 子圖 1：產業分佈長條圖
+    sns.barplot(x=industry_counts.values, y=industry_counts.index, ax=axes[0, 0])
+    axes[0, 0].set_title('職缺產業分佈 (前 10)')
+    axes[0, 0].set_xlabel('職缺數')
+    axes[0, 0].set_ylabel('產業')
+    axes[0, 0].tick_params(axis='y', labelsize=6)
+
+    # 子圖 2：產業與薪資長條圖
+    sns.barplot(x='mean', y=industry_salary.index, data=industry_salary, ax=axes[0, 1])
+    axes[0, 1].set_title('按產業的薪資 (前 10)')
+    axes[0, 1].set_xlabel('平均薪資 (元)')
+    axes[0, 1].set_ylabel('產業')
+    axes[0, 1].tick_params(axis='y', labelsize=6)
+
+    # 子圖 3：遠端工作與產業長條圖
+    sns.barplot(x=remote_industry.values, y=remote_industry.index, ax=axes[1, 0])
+    axes[1, 0].set_title('遠端工作產業分佈 (前 10)')
+    axes[1, 0].set_xlabel('職缺數')
+    axes[1, 0].set_ylabel('產業')
+    axes[1, 0].tick_params(axis='y', labelsize=6)
+
+    # 子圖 4：產業與經驗熱圖
+    sns.heatmap(exp_industry, annot=True, cmap='Blues', fmt='d', ax=axes[1, 1])
+    axes[1, 1].set_title('經驗與產業分佈熱圖')
+    axes[1, 1].set_xlabel('經驗要求')
+    axes[1, 1].set_ylabel('產業')
+    axes[1, 1].tick_params(axis='x', rotation=45, labelsize=6)
+
+    fig.subplots_adjust(wspace=0.4, hspace=0.5)
+    return fig
+
+def plot_experience(metrics):
+    """經歷分析圖表"""
+    df_salary = metrics['salary_frame']
+    exp_skills_df = metrics['exp_skills']
+    exp_counts = metrics['exp_counts']
+    exp_remote = metrics['exp_remote']
+    fig, axes = plt.subplots(2, 2, figsize=(20, 12))
+    fig.suptitle('經歷分析', fontsize=12)
+
+    # 子圖 1：經驗要求分佈長條圖
+    sns.barplot(x=exp_counts.values, y=exp_counts.index, ax=axes[0, 0])
+    axes[0, 0].set_title('經驗要求分佈')
+    axes[0, 0].set_xlabel('職缺數')
+    axes[0, 0].set_ylabel('經驗要求')
+    axes[0, 0].tick_params(axis='y', labelsize=6)
+
+    # 子圖 2：經驗與薪資箱形圖
+    sns.boxplot(x='experience', y='salary_avg', data=df_salary, ax=axes[0, 1], order=EXP_ORDER)
+    axes[0, 1].set_title('按經驗要求的薪資')
+    axes[0, 1].set_xlabel('經驗要求')
+    axes[0, 1].set_ylabel('平均薪資 (元)')
+    axes[0, 1].tick_params(axis='x', rotation=45, labelsize=6)
+
+    # 子圖 3：經驗與技能長條圖
+    sns.barplot(x='Count', y='Skill', hue='Experience', data=exp_skills_df, ax=axes[1, 0])
+    axes[1, 0].set_title('經驗與技能 (前 5 技能)')
+    axes[1, 0].set_xlabel('出現次數')
+    axes[1, 0].set_ylabel('技能')
+    axes[1, 0].legend(fontsize=6)
+    axes[1, 0].tick_params(axis='y', labelsize=6)
+
+    # 子圖 4：經驗與遠端工作熱圖
+    sns.heatmap(exp_remote, annot=True, cmap='Blues', fmt='d', ax=axes[1, 1])
+    axes[1, 1].set_title('經驗與遠端工作熱圖')
+    axes[1, 1].set_xlabel('是否遠端工作')
+    axes[1, 1].set_ylabel('經驗要求')
+    axes[1, 1].set_xticklabels(['否', '是'], fontsize=6)
+    axes[1, 1].tick_params(axis='y', labelsize=6)
+
+    fig.subplots_adjust(wspace=0.4, hspace=0.5)
+    return fig
+
+def plot_remote(metrics):
+    """遠端工作分析圖表"""
+    df_salary = metrics['salary_frame']
+    remote_industry = metrics['remote_industry']
+    remote_counts = metrics['remote_counts']
+    remote_edu = metrics['remote_edu']
+    fig, axes = plt.subplots(2, 2, figsize=(20, 12))
+    fig.suptitle('遠端工作分析', fontsize=12)
+
+    # 子圖 1：遠端工作分佈長條圖
+    sns.barplot(x=remote_counts.index, y=remote_counts.values, ax=axes[0, 0])
+    axes[0, 0].set_title('遠端工作分佈')
+    axes[0, 0].set_xlabel('是否遠端工作')
+    axes[0, 0].set_ylabel('職缺數')
+    axes[0, 0].set_xticks([0, 1])
+    axes[0, 0].set_xticklabels(['否', '是'], fontsize=6)
+    axes[0, 0].tick_params(axis='x', labelsize=6)
+
+    # 子圖 2：遠端工作與薪資箱形圖
+    sns.boxplot(x='is_remote', y='salary_avg', data=df_salary, ax=axes[0, 1])
+    axes[0, 1].set_title('遠端工作與薪資')
+    axes[0, 1].set_xlabel('是否遠端工作')
+    axes[0, 1].set_ylabel('平均薪資 (元)')
+    axes[0, 1].set_xticks([0, 1])
+    axes[0, 1].set_xticklabels(['否', '是'], fontsize=6)
+    axes[0, 1].tick_params(axis='x', labelsize=6)
+
+    # 子圖 3：遠端工作與產業長條圖
+    sns.barplot(x=remote_industry.values, y=remote_industry.index, ax=axes[1, 0])
+    axes[1, 0].set_title('遠端工作產業分佈 (前 10)')
+    axes[1, 0].set_xlabel('職缺數')
+    axes[1, 0].set_ylabel('產業')
+    axes[1, 0].tick_params(axis='y', labelsize=6)
+
+    # 子圖 4：遠端工作與學歷長條圖
+    sns.barplot(x=remote_edu.values, y=remote_edu.index, ax=axes[1, 1])
+    axes[1, 1].set_title('遠端工作與學歷分佈')
+    axes[1, 1].set_xlabel('職缺數')
+    axes[1, 1].set_ylabel('學歷')
+    axes[1, 1].tick_params(axis='y', labelsize=6)
+
+    fig.subplots_adjust(wspace=0.4, hspace=0.5)
+    return fig
+
+def plot_skills(metrics):
+    """技能分析圖表"""
+    skill_counts_df = metrics['skill_counts']
+    skill_salary_df = metrics['skill_salary']
+    remote_skills_df = metrics['remote_skills']
+    edu_skills_df = metrics['edu_skills']
+    fig, axes = plt.subplots(2, 2, figsize=(20, 12))
+    fig.suptitle('技能分析', fontsize=12)
+
+    # 子圖 1：技能分佈長條圖
+    sns.barplot(x='Count', y='Skill', data=skill_counts_df, ax=axes[0, 0])
+    axes[0, 0].set_title('熱門技能分佈 (前 10)')
+    axes[0, 0].set_xlabel('出現次數')
+    axes[0, 0].set_ylabel('技能')
+    axes[0, 0].tick_params(axis='y', labelsize=6)
+
+    # 子圖 2：技能與薪資長條圖
+    sns.barplot(x='Mean_Salary', y='Skill', data=skill_salary_df, ax=axes[0, 1])
+    axes[0, 1].set_title('技能與薪資 (前 10)')
+    axes[0, 1].set_xlabel('平均薪資 (元)')
+    axes[0, 1].set_ylabel('技能')
+    axes[0, 1].tick_params(axis='y', labelsize=6)
+
+    # 子圖 3：技能與遠端工作長條圖
+    sns.barplot(x='Count', y='Skill', data=remote_skills_df, ax=axes[1, 0])
+    axes[1, 0].set_title('技能與遠端工作 (前 10)')
+    axes[1, 0].set_xlabel('出現次數')
+    axes[1, 0].set_ylabel('技能')
+    axes[1, 0].tick_params(axis='y', labelsize=6)
+
+    # 子圖 4：技能與學歷長條圖
+    sns.barplot(x='Count', y='Skill', hue='Education', data=edu_skills_df, ax=axes[1, 1])
+    axes[1, 1].set_title('技能與學歷 (前 5 技能)')
+    axes[1, 1].set_xlabel('出現次數')
+    axes[1, 1].set_ylabel('技能')
+    axes[1, 1].legend(fontsize=6)
+    axes[1, 1].tick_params(axis='y', labelsize=6)
+
+    fig.subplots_adjust(wspace=0.4, hspace=0.5)
+    return fig
+
+def plot_main(metrics):
+    """總覽分析圖表（六個重要分析）"""
+    df_salary = metrics['salary_frame']
+    skill_counts_df = metrics['skill_counts']
+    industry_salary = metrics['industry_salary']
+    exp_remote = metrics['exp_remote']
+    fig, axes = plt.subplots(2, 3, figsize=(24, 12))
+    fig.suptitle('資料工程師職缺分析 - 總覽', fontsize=12)
+
+    # 子圖 1：薪資分佈直方圖
+    sns.histplot(df_salary['salary_avg'], bins=20, kde=True, ax=axes[0, 0])
+    axes[0, 0].set_title('薪資分佈 (月薪)')
+    axes[0, 0].set_xlabel('平均薪資 (元)')
+    axes[0, 0].set_ylabel('職缺數')
+    axes[0, 0].tick_params(axis='both', labelsize=6)
+
+    # 子圖 2：按經驗的薪資箱形圖
+    sns.boxplot(x='experience', y='salary_avg', data=df_salary, ax=axes[0, 1], order=EXP_ORDER)
+    axes[0, 1].set_title('按經驗要求的薪資')
+    axes[0, 1].set_xlabel('經驗要求')
+    axes[0, 1].set_ylabel('平均薪資 (元)')
+    axes[0, 1].tick_params(axis='x', rotation=45, labelsize=6)
+
+    # 子圖 3：按產業的薪資長條圖
+    sns.barplot(x='mean', y=industry_salary.index, data=industry_salary, ax=axes[0, 2])
+    axes[0, 2].set_title('按產業的薪資 (前 10)')
+    axes[0, 2].set_xlabel('平均薪資 (元)')
+    axes[0, 2].set_ylabel('產業')
+    axes[0, 2].tick_params(axis='y', labelsize=6)
+
+    # 子圖 4：遠端工作與薪資箱形圖
+    sns.boxplot(x='is_remote', y='salary_avg', data=df_salary, ax=axes[1, 0])
+    axes[1, 0].set_title('遠端工作與薪資')
+    axes[1, 0].set_xlabel('是否遠端工作')
+    axes[1, 0].set_ylabel('平均薪資 (元)')
+    axes[1, 0].set_xticks([0, 1])
+    axes[1, 0].set_xticklabels(['否', '是'], fontsize=6)
+    axes[1, 0].tick_params(axis='x', labelsize=6)
+
+    # 子圖 5：技能分佈長條圖
+    sns.barplot(x='Count', y='Skill', data=skill_counts_df, ax=axes[1, 1])
+    axes[1, 1].set_title('熱門技能分佈 (前 10)')
+    axes[1, 1].set_xlabel('出現次數')
+    axes[1, 1].set_ylabel('技能')
+    axes[1, 1].tick_params(axis='y', labelsize=6)
+
+    # 子圖 6：經驗與遠端工作熱圖
+    sns.heatmap(exp_remote, annot=True, cmap='Blues', fmt='d', ax=axes[1, 2])
+    axes[1, 2].set_title('經驗與遠端工作熱圖')
+    axes[1, 2].set_xlabel('是否遠端工作')
+    axes[1, 2].set_ylabel('經驗要求')
+    axes[1, 2].set_xticklabels(['否', '是'], fontsize=6)
+    axes[1, 2].tick_params(axis='y', labelsize=6)
+
+    fig.subplots_adjust(wspace=0.4, hspace=0.5)
+    return fig
+
+# 圖組名稱 -> (畫圖函式, 檔名)，檔名與原本分析腳本輸出的相同
+FIGURES = {
+    'salary': (plot_salary, 'salary_analysis.png'),
+    'industry': (plot_industry, 'industry_analysis.png'),
+    'experience': (plot_experience, 'experience_analysis.png'),
+    'remote': (plot_remote, 'remote_analysis.png'),
+    'skills': (plot_skills, 'skills_analysis.png'),
+    'main': (plot_main, 'main_analysis.png'),
+}
+
+_metrics = None
+
+def _init_worker(metrics):
+    """每個進程只收一次指標，並改用不需要螢幕的 Agg 後端"""
+    global _metrics
+    _metrics = metrics
+    matplotlib.use('Agg')
+    configure_fonts()
+
+def render_figure(name, output_dir, dpi=300, metrics=None):
+    """畫一組圖並存檔，回傳 (名稱, 檔案路徑, 秒數)"""
+    start = time.perf_counter()
+    draw, filename = FIGURES[name]
+    fig = draw(metrics if metrics is not None else _metrics)
+    path = os.path.join(output_dir, filename)
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return name, path, time.perf_counter() - start
+
+def render_report(metrics, output_dir, processes=None, dpi=300, names=None):
+    """把圖組（預設全部）畫到 output_dir，processes=1 時在本進程依序畫；回傳 {名稱: 秒數}"""
+    os.makedirs(output_dir, exist_ok=True)
+    names = names or list(FIGURES)
+    start = time.perf_counter()
+    timings = {}
+    if processes == 1:
+        _init_worker(metrics)
+        results = (render_figure(name, output_dir, dpi) for name in names)
+    else:
+        executor = ProcessPoolExecutor(min(processes or os.cpu_count(), len(names)), initializer=_init_worker, initargs=(metrics,))
+        futures = [executor.submit(render_figure, name, output_dir, dpi) for name in names]
+        results = (future.result() for future in as_completed(futures))
+    try:
+        for name, path, seconds in results:
+            timings[name] = seconds
+            print(f"已輸出 {path}（{seconds:.1f} 秒）")
+    finally:
+        if processes != 1:
+            executor.shutdown()
+    print(f"報表完成：{len(timings)} 組圖，總耗時 {time.perf_counter() - start:.1f} 秒"
+          f"（各圖合計 {sum(timings.values()):.1f} 秒）: {output_dir}")
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="無介面產生分析報表圖表（多進程）")
+    parser.add_argument("file_path", help="職缺 CSV 檔或 Parquet 資料夾")
+    parser.add_argument("--output_dir", default="reports", help="圖表輸出資料夾")
+    parser.add_argument("--processes", type=int, default=None, help="畫圖進程數（預設為 CPU 核心數，1 表示依序畫）")
+    parser.add_argument("--dpi", type=int, default=300, help="輸出解析度")
+    parser.add_argument("--figures", nargs="+", choices=list(FIGURES), default=None, help="只畫這些圖組（預設全部）")
+    parser.add_argument("--cache_dir", default="aggregate_cache", help="彙總指標快取資料夾")
+    args = parser.parse_args()
+    matplotlib.use('Agg')
+    from job_aggregates import AggregateEngine
+    metrics = AggregateEngine(args.cache_dir).compute(args.file_path)
+    render_report(metrics, args.output_dir, args.processes, args.dpi, args.figures)
+
+if __name__ == "__main__":
+    main()
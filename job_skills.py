@@ -0,0 +1,150 @@
+'''
+技能關鍵字比對：Aho-Corasick 自動機 + 可載入的技能字典（skill_dictionary.json）
+為什麼？爬蟲的 extract_skills() 用一個很長的 alternation 正規表示式加 IGNORECASE，
+每遇到 R 還要對整段文字再跑一次 re.search；(?<!\\w) 把中文也當成字元，「熟悉Python」反而比對不到；
+Job_list_Analize.py 又另外對每個標題 for skill in skills: if skill in title，'sql' 會算進 'mysql'。
+這裡把字典裡所有寫法建成一個自動機，每份文件只掃一次（時間與文件長度成線性），
+比對到的寫法再套用英數字邊界規則，轉成標準名稱；extract_many() 一次處理多份文件
+    python job_skills.py "熟悉Python、SQL，有R&D經驗"    # 查看比對結果
+'''
+
+import json  # 技能字典
+import os  # 預設字典路徑
+import re  # 快速跳到可能的詞開頭
+import sys  # 命令列
+from collections import deque  # 建立失敗連結（BFS）
+
+DEFAULT_DICTIONARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_dictionary.json")
+# 邊界判斷只看英數字：中文緊鄰英文技能（熟悉Python）仍算獨立的詞
+WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789")
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+def _lower(text):
+    """轉小寫且長度不變，比對位置才能直接對回原文
+    str.lower() 快很多，只有少數 Unicode 字元會改變長度，這時改成只轉 ASCII"""
+    lowered = text.lower()
+    return lowered if len(lowered) == len(text) else text.translate(_ASCII_LOWER)
+
+class SkillMatcher:
+    """entries：[{"name": 標準名稱, "aliases": [其他寫法], "case_sensitive": bool, "exclude": [不算數的詞]}]
+    extract(text) 回傳文件中出現的標準名稱（依出現順序、不重複）；extract_many(texts) 處理多份文件"""
+
+    def __init__(self, entries):
+        self.goto = [{}]  # 每個節點：字元 -> 下一個節點
+        self.fail = [0]
+        self.output = [[]]  # 每個節點結束的詞：(長度, 標準名稱或 None（exclude 詞）, 區分大小寫時的原文)
+        self.names = []
+        for entry in entries:
+            name = entry["name"]
+            self.names.append(name)
+            case_sensitive = entry.get("case_sensitive", False)
+            for alias in [name] + entry.get("aliases", []):
+                self._add(alias, name, alias if case_sensitive else None)
+            for phrase in entry.get("exclude", []):
+                self._add(phrase, None, None)
+        self._build_fail_links()
+        # 可能是詞開頭的位置：英數字開頭的詞必須在英數字邊界上，其他字元（中文、符號）開頭的詞不限
+        word_starts = "".join(re.escape(char) for char in self.goto[0] if char in WORD_CHARS)
+        other_starts = "".join(re.escape(char) for char in self.goto[0] if char not in WORD_CHARS)
+        alternatives = ([f"(?<![a-z0-9])[{word_starts}]"] if word_starts else []) + ([f"[{other_starts}]"] if other_starts else [])
+        self.start_pattern = re.compile("|".join(alternatives) or "(?!)")
+
+    @classmethod
+    def from_json(cls, path=None):
+        with open(path or DEFAULT_DICTIONARY, "r", encoding="utf-8") as f:
+            return cls(json.load(f)["skills"])
+
+    def _add(self, term, name, exact):
+        node = 0
+        for char in _lower(term):
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            node = next_node
+        self.output[node].append((len(term), name, exact))
+
+    def _build_fail_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                if self.fail[child] == child:
+                    self.fail[child] = 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def _matches(self, text):
+        """所有符合邊界規則的比對：(起點, 終點, 標準名稱或 None)"""
+        lowered = _lower(text)
+        goto, fail, output = self.goto, self.fail, self.output
+        root, next_start = goto[0], self.start_pattern.search
+        matches = []
+        node = 0
+        position, size = 0, len(lowered)
+        while position < size:
+            if not node:
+                # 在根節點時直接跳到下一個可能是詞開頭的位置（大部分中文字與英文單字中間都不是）
+                # 略過的位置開頭的比對本來就會被邊界規則排除，結果不變
+                found = next_start(lowered, position)
+                if found is None:
+                    break
+                position = found.start()
+            char = lowered[position]
+            position += 1
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = (goto[node] if node else root).get(char, 0)
+            end = position
+            for length, name, exact in output[node]:
+                start = end - length
+                if exact is not None and text[start:end] != exact:
+                    continue
+                if start > 0 and lowered[start] in WORD_CHARS and lowered[start - 1] in WORD_CHARS:
+                    continue
+                if end < size and lowered[end - 1] in WORD_CHARS and lowered[end] in WORD_CHARS:
+                    continue
+                matches.append((start, end, name))
+        return matches
+
+    def extract(self, text):
+        """由左到右取最長、不重疊的比對（MS SQL 不會再算一次 SQL；R&D 蓋掉 R）"""
+        if not isinstance(text, str) or not text:
+            return []
+        skills = []
+        position = 0
+        for start, end, name in sorted(self._matches(text), key=lambda m: (m[0], -m[1])):
+            if start < position:
+                continue
+            position = end
+            if name is not None and name not in skills:
+                skills.append(name)
+        return skills
+
+    def extract_many(self, texts):
+        """多份文件（list 或 pandas Series）一次處理，回傳每份文件的技能 list"""
+        return [self.extract(text) for text in texts]
+
+_default_matcher = None
+
+def default_matcher():
+    """預設字典的 SkillMatcher（第一次使用時才載入）"""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = SkillMatcher.from_json()
+    return _default_matcher
+
+def extract_skills(text):
+    """提取技能關鍵字（預設字典），回傳標準名稱 list"""
+    return default_matcher().extract(text)
+
+if __name__ == "__main__":
+    for document in sys.argv[1:]:
+        print(f"{document} -> {extract_skills(document)}")
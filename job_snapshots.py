@@ -0,0 +1,227 @@
+'''
+多次爬取的趨勢分析：每份爬取結果（job_data_jobcat_1022_YYYYMMDD.csv）只匯入一次，存進只新增不修改的快照資料庫，
+匯入時順便更新趨勢指標：新增 / 下架職缺數、各產業平均薪資、技能需求
+為什麼？每次爬完都會留一份有日期的 CSV，但 Job_list_Analize.py 只看寫死的一份檔案，看不出變化；
+每次做報表都重讀全部歷史 CSV 又會越來越慢。這裡匯入新快照時只和「上一份快照」比較，
+指標（每份快照一列）存在資料庫裡，報表直接讀指標表，不用重新掃描歷史資料：
+    python job_snapshots.py ingest job_data_jobcat_1022_*.csv   # 已匯入過的檔案（內容雜湊相同）會跳過
+    python job_snapshots.py report --industries 5 --skills 10
+'''
+
+import os  # 檔案時間
+import re  # 從檔名取日期
+import glob  # Windows 命令列不會展開萬用字元
+import sqlite3  # 快照資料庫
+import hashlib  # 檔案內容雜湊（同一份檔案不重複匯入）
+import argparse  # 命令列
+from datetime import datetime  # 快照日期
+import pandas as pd  # 讀 CSV、整理報表
+
+SNAPSHOT_COLUMNS = ['job_id', 'job_title', 'company', 'industry', 'salary', 'salary_avg', 'job_description']
+DATE_PATTERN = re.compile(r'(\d{8})')  # 檔名中的 YYYYMMDD
+
+def snapshot_date(path):
+    """快照日期：檔名有 YYYYMMDD 就用檔名，否則用檔案修改時間"""
+    match = DATE_PATTERN.search(os.path.basename(path))
+    if match:
+        try:
+            return datetime.strptime(match.group(1), '%Y%m%d').strftime('%Y-%m-%d')
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(os.path.getmtime(path)).strftime('%Y-%m-%d')
+
+def _digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class SnapshotStore:
+    """snapshots：每份快照一列；postings：每份快照的職缺（只新增）；job_presence：每個職缺第一次 / 最後一次出現的快照
+    snapshot_metrics、industry_salary、skill_demand：匯入時算好的趨勢指標"""
+
+    def __init__(self, db_path='job_snapshots.db'):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                snapshot_date TEXT NOT NULL,
+                source TEXT NOT NULL,
+                file_digest TEXT NOT NULL UNIQUE,
+                ingested_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                snapshot_id INTEGER NOT NULL,
+                job_id TEXT NOT NULL,
+                industry TEXT,
+                salary_avg REAL,
+                PRIMARY KEY (snapshot_id, job_id)
+            );
+            CREATE TABLE IF NOT EXISTS job_presence (
+                job_id TEXT PRIMARY KEY,
+                first_snapshot INTEGER NOT NULL,
+                last_snapshot INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS snapshot_metrics (
+                snapshot_id INTEGER PRIMARY KEY,
+                active INTEGER NOT NULL,
+                new_postings INTEGER NOT NULL,
+                closed_postings INTEGER NOT NULL,
+                reposted INTEGER NOT NULL,
+                salary_mean REAL
+            );
+            CREATE TABLE IF NOT EXISTS industry_salary (
+                snapshot_id INTEGER NOT NULL,
+                industry TEXT NOT NULL,
+                job_count INTEGER NOT NULL,
+                salary_count INTEGER NOT NULL,
+                salary_mean REAL,
+                PRIMARY KEY (snapshot_id, industry)
+            );
+            CREATE TABLE IF NOT EXISTS skill_demand (
+                snapshot_id INTEGER NOT NULL,
+                skill TEXT NOT NULL,
+                job_count INTEGER NOT NULL,
+                PRIMARY KEY (snapshot_id, skill)
+            );
+        """)
+        self.conn.commit()
+
+    def latest(self):
+        """最新一份快照 (snapshot_id, snapshot_date)，沒有快照時回傳 None"""
+        return self.conn.execute(
+            "SELECT snapshot_id, snapshot_date FROM snapshots ORDER BY snapshot_date DESC, snapshot_id DESC LIMIT 1").fetchone()
+
+    def ingest(self, path, skill_extractor=None):
+        """匯入一份爬取結果，回傳 snapshot_id；同內容已匯入過或比最新快照舊時跳過，回傳 None"""
+        digest = _digest(path)
+        if self.conn.execute("SELECT 1 FROM snapshots WHERE file_digest = ?", (digest,)).fetchone():
+            print(f"已匯入過，跳過: {path}")
+            return None
+        date = snapshot_date(path)
+        previous = self.latest()
+        if previous is not None and date < previous[1]:
+            # 新增 / 下架都是和上一份快照比，順序錯了指標就不對；要補舊資料請重建資料庫依日期重新匯入
+            print(f"快照日期 {date} 早於最新快照 {previous[1]}，跳過: {path}")
+            return None
+        df = pd.read_csv(path, usecols=lambda col: col in SNAPSHOT_COLUMNS, dtype={'job_id': str})
+        df = df.dropna(subset=['job_id']).drop_duplicates(subset=['job_id'])
+        if 'salary_avg' not in df.columns:
+            if 'salary' in df.columns:
+                from job_salary import parse_salary_series
+                df['salary_avg'] = parse_salary_series(df['salary'])['salary_avg']
+            else:
+                df['salary_avg'] = float('nan')
+        if 'industry' not in df.columns:
+            df['industry'] = None
+        with self.conn:  # 一份快照的所有資料表在同一個交易內寫入，中途失敗不會留下一半
+            cursor = self.conn.execute(
+                "INSERT INTO snapshots (snapshot_date, source, file_digest, ingested_at) VALUES (?, ?, ?, ?)",
+                (date, os.path.abspath(path), digest, datetime.now().isoformat(timespec='seconds')))
+            snapshot_id = cursor.lastrowid
+            industry = df['industry'].astype(object).where(df['industry'].notna(), None)
+            salary = df['salary_avg'].astype('float64').astype(object).where(df['salary_avg'].notna(), None)
+            rows = [(snapshot_id, job_id, ind, sal) for job_id, ind, sal in zip(df['job_id'], industry, salary)]
+            self.conn.executemany("INSERT INTO postings (snapshot_id, job_id, industry, salary_avg) VALUES (?, ?, ?, ?)", rows)
+            self._update_metrics(snapshot_id, previous[0] if previous else None, df, skill_extractor)
+        return snapshot_id
+
+    def _update_metrics(self, snapshot_id, previous_id, df, skill_extractor):
+        """只用這份快照和上一份快照的 job_id 計算指標，不掃描更早的歷史"""
+        current = set(df['job_id'])
+        previous = set() if previous_id is None else {
+            row[0] for row in self.conn.execute("SELECT job_id FROM postings WHERE snapshot_id = ?", (previous_id,))}
+        seen_before = set()
+        ids = list(current)
+        for start in range(0, len(ids), 900):  # SQLite 參數數量有上限，分批查
+            batch = ids[start:start + 900]
+            seen_before.update(row[0] for row in self.conn.execute(
+                f"SELECT job_id FROM job_presence WHERE job_id IN ({','.join('?' * len(batch))})", batch))
+        new_postings = len(current - seen_before)
+        reposted = len((current & seen_before) - previous)  # 曾經下架又重新出現
+        closed_postings = len(previous - current)
+        self.conn.executemany("""
+            INSERT INTO job_presence (job_id, first_snapshot, last_snapshot) VALUES (?, ?, ?)
+            ON CONFLICT(job_id) DO UPDATE SET last_snapshot = excluded.last_snapshot""",
+            [(job_id, snapshot_id, snapshot_id) for job_id in ids])
+        salary = df['salary_avg'].astype('float64')
+        self.conn.execute("INSERT INTO snapshot_metrics VALUES (?, ?, ?, ?, ?, ?)",
+                          (snapshot_id, len(current), new_postings, closed_postings, reposted,
+                           None if salary.notna().sum() == 0 else float(salary.mean())))
+        by_industry = df.groupby(df['industry'].fillna('未知'))['salary_avg'].agg(['size', 'count', 'mean'])
+        self.conn.executemany("INSERT INTO industry_salary VALUES (?, ?, ?, ?, ?)",
+                              [(snapshot_id, industry, int(row['size']), int(row['count']),
+                                None if pd.isna(row['mean']) else float(row['mean']))
+                               for industry, row in by_industry.iterrows()])
+        if skill_extractor is None:
+            from job_skills import default_matcher
+            skill_extractor = default_matcher().extract
+        text = df['job_title'].fillna('') if 'job_title' in df.columns else pd.Series('', index=df.index)
+        if 'job_description' in df.columns:
+            text = text + '\n' + df['job_description'].fillna('')
+        demand = pd.Series([skill for found in map(skill_extractor, text) for skill in found]).value_counts()
+        self.conn.executemany("INSERT INTO skill_demand VALUES (?, ?, ?)",
+                              [(snapshot_id, skill, int(count)) for skill, count in demand.items()])
+        print(f"快照 {snapshot_id}：職缺 {len(current)} 筆，新增 {new_postings}、下架 {closed_postings}、重新上架 {reposted}")
+
+    def posting_trend(self):
+        """每份快照的職缺數、新增、下架、平均薪資"""
+        return pd.read_sql_query("""
+            SELECT s.snapshot_date, m.active, m.new_postings, m.closed_postings, m.reposted, ROUND(m.salary_mean) AS salary_mean
+            FROM snapshot_metrics m JOIN snapshots s USING (snapshot_id) ORDER BY s.snapshot_date, s.snapshot_id""", self.conn)
+
+    def salary_drift(self, top=10):
+        """職缺數最多的產業，每份快照的平均薪資與相對上一份快照的變化（drift）"""
+        df = pd.read_sql_query("""
+            SELECT s.snapshot_date, i.industry, i.job_count, i.salary_mean
+            FROM industry_salary i JOIN snapshots s USING (snapshot_id) ORDER BY s.snapshot_date, s.snapshot_id""", self.conn)
+        if df.empty:
+            return df
+        industries = df.groupby('industry')['job_count'].sum().nlargest(top).index
+        pivot = df[df['industry'].isin(industries)].pivot_table(index='snapshot_date', columns='industry', values='salary_mean')
+        return pivot.round().join(pivot.diff().round().add_suffix('_drift'))
+
+    def skill_trend(self, top=10):
+        """需求最多的技能，每份快照有幾個職缺提到"""
+        df = pd.read_sql_query("""
+            SELECT s.snapshot_date, d.skill, d.job_count
+            FROM skill_demand d JOIN snapshots s USING (snapshot_id) ORDER BY s.snapshot_date, s.snapshot_id""", self.conn)
+        if df.empty:
+            return df
+        skills = df.groupby('skill')['job_count'].sum().nlargest(top).index
+        return df[df['skill'].isin(skills)].pivot_table(index='snapshot_date', columns='skill', values='job_count', fill_value=0).astype(int)
+
+    def close(self):
+        self.conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="多次爬取的快照資料庫與趨勢報表")
+    parser.add_argument("command", choices=["ingest", "report"], help="ingest 匯入爬取結果；report 列出趨勢")
+    parser.add_argument("paths", nargs="*", help="要匯入的 CSV（可用萬用字元），依快照日期排序後匯入")
+    parser.add_argument("--db", default="job_snapshots.db", help="快照資料庫")
+    parser.add_argument("--industries", type=int, default=5, help="薪資變化列出幾個產業")
+    parser.add_argument("--skills", type=int, default=10, help="技能需求列出幾個技能")
+    args = parser.parse_args()
+    store = SnapshotStore(args.db)
+    try:
+        if args.command == "ingest":
+            paths = sorted({path for pattern in args.paths for path in (glob.glob(pattern) or [pattern])},
+                           key=lambda path: (snapshot_date(path), path))
+            for path in paths:
+                store.ingest(path)
+        else:
+            with pd.option_context('display.width', 200, 'display.max_columns', 30):
+                print("職缺數與新增 / 下架:")
+                print(store.posting_trend().to_string(index=False))
+                print("\n產業平均薪資與變化:")
+                print(store.salary_drift(args.industries))
+                print("\n技能需求:")
+                print(store.skill_trend(args.skills))
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
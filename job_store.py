@@ -0,0 +1,189 @@
+'''
+SQLite 職缺資料庫：以 job_id 為主鍵 upsert，取代「讀整個 CSV → concat → drop_duplicates → 重寫 CSV 和 JSON」
+為什麼？原本每 5 頁存檔一次都要讀寫全部資料，資料越多越慢（O(總筆數)）；
+SQLite 每次只寫入新的幾十筆，job_id 有索引，啟動時查已存在職缺也不用解析整個 CSV
+CSV / JSON 改成需要時再匯出：
+    python job_store.py export --db job_data.db --csv job_data_jobcat_1022.csv --json job_data_jobcat_1022.json
+'''
+
+import sqlite3  # Python 內建的資料庫，不用另外安裝
+import json  # 每筆職缺以 JSON 存，保留 list 欄位
+import os  # 檢查檔案
+import argparse  # 命令列匯出
+import threading  # pipeline / worker 可能從不同執行緒寫入
+from datetime import datetime  # 記錄寫入時間
+import pandas as pd  # 匯出 CSV、匯入舊 CSV
+from job_loader import read_job_ids  # 只讀 job_id 欄位
+
+# 存成 CSV 時要轉成逗號分隔字串的 list 欄位
+LIST_COLUMNS = ['job_categories', 'skills', 'tools', 'work_skills']
+
+class JobStore:
+    """jobs 資料表：job_id 主鍵、jobcat、data（整筆 JSON）、first_seen / updated_at"""
+
+    def __init__(self, db_path="job_data.db"):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")  # 寫入時不阻塞讀取，當機也不會毀損
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                jobcat TEXT,
+                data TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_jobcat ON jobs (jobcat)")
+        # 記錄已匯入過的舊 CSV，避免每次啟動都重新解析
+        self.conn.execute("CREATE TABLE IF NOT EXISTS imports (path TEXT PRIMARY KEY, mtime REAL NOT NULL)")
+        self.conn.commit()
+
+    def upsert_jobs(self, records, jobcat=None):
+        """新增或更新職缺（同 job_id 以新資料為準），回傳寫入筆數"""
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = [(str(record["job_id"]), jobcat, json.dumps(record, ensure_ascii=False, default=str), now, now)
+                for record in records if record.get("job_id")]
+        with self.lock:
+            self.conn.executemany("""
+                INSERT INTO jobs (job_id, jobcat, data, first_seen, updated_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    jobcat = COALESCE(excluded.jobcat, jobs.jobcat),
+                    data = excluded.data,
+                    updated_at = excluded.updated_at""", rows)
+            self.conn.commit()
+        return len(rows)
+
+    def job_ids(self, jobcat=None):
+        """所有 job_id（只讀主鍵索引，不解析整筆資料）"""
+        with self.lock:
+            if jobcat:
+                cursor = self.conn.execute("SELECT job_id FROM jobs WHERE jobcat = ?", (jobcat,))
+            else:
+                cursor = self.conn.execute("SELECT job_id FROM jobs")
+            return {row[0] for row in cursor}
+
+    def has_job(self, job_id):
+        """單一 job_id 是否已存在（主鍵查詢）；job_id_index 用來確認 Bloom filter 的結果"""
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM jobs WHERE job_id = ?", (str(job_id),)).fetchone() is not None
+
+    def max_rowid(self):
+        with self.lock:
+            return self.conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM jobs").fetchone()[0]
+
+    def ids_since(self, rowid):
+        """rowid 大於 rowid 的 (rowid, job_id)，依 rowid 排序；upsert 既有職缺不改 rowid，所以只會拿到新職缺"""
+        with self.lock:
+            return self.conn.execute("SELECT rowid, job_id FROM jobs WHERE rowid > ? ORDER BY rowid", (rowid,)).fetchall()
+
+    def list_fields(self, fields, jobcat=None):
+        """每個職缺的部分欄位 {job_id: {field: value}}，用 SQLite json_extract 取值，不解析整筆 JSON
+        增量模式用來比對列表頁的 update_date 與卡片內容"""
+        columns = ", ".join(f"json_extract(data, '$.\"{field}\"')" for field in fields)
+        sql = f"SELECT job_id, {columns} FROM jobs"
+        params = ()
+        if jobcat:
+            sql += " WHERE jobcat = ?"
+            params = (jobcat,)
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return {row[0]: dict(zip(fields, row[1:])) for row in rows}
+
+    def count(self, jobcat=None):
+        with self.lock:
+            if jobcat:
+                return self.conn.execute("SELECT COUNT(*) FROM jobs WHERE jobcat = ?", (jobcat,)).fetchone()[0]
+            return self.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def iter_records(self, jobcat=None, include_untagged=False):
+        """依寫入順序逐筆讀出職缺 dict
+        include_untagged=True：指定 jobcat 時，也包含沒有 jobcat 的職缺（沒帶 --jobcat 匯入的舊 CSV）"""
+        with self.lock:
+            if jobcat and include_untagged:
+                rows = self.conn.execute("SELECT data FROM jobs WHERE jobcat = ? OR jobcat IS NULL ORDER BY rowid",
+                                         (jobcat,)).fetchall()
+            elif jobcat:
+                rows = self.conn.execute("SELECT data FROM jobs WHERE jobcat = ? ORDER BY rowid", (jobcat,)).fetchall()
+            else:
+                rows = self.conn.execute("SELECT data FROM jobs ORDER BY rowid").fetchall()
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def import_csv(self, csv_path, jobcat=None, chunksize=20000):
+        """把舊的 CSV 匯入資料庫（同一個檔案沒變動就不重複匯入），回傳匯入筆數"""
+        if not csv_path or not os.path.exists(csv_path):
+            return 0
+        mtime = os.path.getmtime(csv_path)
+        with self.lock:
+            row = self.conn.execute("SELECT mtime FROM imports WHERE path = ?", (os.path.abspath(csv_path),)).fetchone()
+        if row and row[0] >= mtime:
+            return 0
+        # 先只讀 job_id 欄位比對；舊資料不覆蓋資料庫中已有（較新）的職缺，沒有新職缺就不解析其他欄位
+        new_ids = read_job_ids(csv_path) - self.job_ids()
+        imported = 0
+        if new_ids:
+            for chunk in pd.read_csv(csv_path, dtype={"job_id": str}, chunksize=chunksize):  # 分批讀，記憶體不隨檔案變大
+                chunk = chunk[chunk["job_id"].isin(new_ids)]
+                records = [{k: v for k, v in record.items() if pd.notna(v)} for record in chunk.to_dict("records")]
+                imported += self.upsert_jobs(records, jobcat)
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO imports (path, mtime) VALUES (?, ?)",
+                              (os.path.abspath(csv_path), mtime))
+            self.conn.commit()
+        return imported
+
+    def to_dataframe(self, jobcat=None, include_untagged=False):
+        return pd.DataFrame(list(self.iter_records(jobcat, include_untagged)))
+
+    def export_csv(self, csv_path, jobcat=None):
+        """匯出 CSV（list 欄位轉為逗號分隔字串，和原本 save_data 相同）
+        指定 jobcat 時沒有 jobcat 的舊資料也一起匯出：匯出檔常常就是當初匯入的舊 CSV，漏掉會覆蓋掉歷史資料"""
+        df = self.to_dataframe(jobcat, include_untagged=True)
+        for col in LIST_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].apply(lambda x: ','.join(x) if isinstance(x, list) else x)
+        df.to_csv(csv_path, index=False, encoding="utf-8-sig")
+        print(f"已匯出 CSV: {csv_path}（{len(df)} 筆）")
+        return len(df)
+
+    def export_json(self, json_path, jobcat=None):
+        records = list(self.iter_records(jobcat, include_untagged=True))
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+        print(f"已匯出 JSON: {json_path}（{len(records)} 筆）")
+        return len(records)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="職缺資料庫工具：匯出 CSV/JSON、匯入舊 CSV")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="匯出 CSV / JSON")
+    export_parser.add_argument("--db", default="job_data.db", help="SQLite 資料庫檔")
+    export_parser.add_argument("--jobcat", default=None, help="只匯出某個 jobcat（例如 1022）")
+    export_parser.add_argument("--csv", default=None, help="輸出 CSV 檔名")
+    export_parser.add_argument("--json", default=None, help="輸出 JSON 檔名")
+    import_parser = subparsers.add_parser("import", help="匯入舊 CSV")
+    import_parser.add_argument("--db", default="job_data.db", help="SQLite 資料庫檔")
+    import_parser.add_argument("--jobcat", default=None, help="匯入資料的 jobcat")
+    import_parser.add_argument("csv_files", nargs="+", help="要匯入的 CSV 檔")
+    args = parser.parse_args()
+    store = JobStore(args.db)
+    try:
+        if args.command == "export":
+            if args.csv:
+                store.export_csv(args.csv, args.jobcat)
+            if args.json:
+                store.export_json(args.json, args.jobcat)
+        else:
+            for csv_file in args.csv_files:
+                print(f"{csv_file}: 匯入 {store.import_csv(csv_file, args.jobcat)} 筆")
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+'''
+依頁面實際狀態決定等待時間，取代固定的 time.sleep
+原本 driver.get 後固定等 10 秒，再「等待穩定」10~20 秒或 15~30 秒、每次滾動 5~10 秒、細節頁載入後 5~15 秒，
+大部分時間頁面其實早就好了；這裡改成輪詢具體的就緒訊號（職缺卡片數不再變化、工作內容元素出現），
+就緒後只再補足一個可設定、帶隨機的最短等待（模擬真人，不要每次都秒開下一頁），並記錄每次實際等了多久
+'''
+
+import time  # 計時與輪詢間隔
+import random  # 最短等待加上隨機
+import logging  # 等待時間寫進爬蟲日誌
+import threading  # 多個 worker 共用同一個 WaitPolicy 時保護統計資料
+from selenium.webdriver.common.by import By  # 指定元素尋找方式
+from selenium.common.exceptions import TimeoutException  # 逾時拋出和 WebDriverWait 相同的例外
+
+class WaitPolicy:
+    """min_wait + jitter：就緒後至少要等到的秒數（從開始等待起算），jitter 為額外隨機秒數上限
+    timeout：就緒訊號最多等多久；poll：輪詢間隔"""
+
+    def __init__(self, min_wait=1.0, jitter=1.0, timeout=30, poll=0.5):
+        self.min_wait = min_wait
+        self.jitter = jitter
+        self.timeout = timeout
+        self.poll = poll
+        self.stats = {}  # label -> [次數, 總秒數, 逾時次數]
+        self.lock = threading.Lock()
+
+    def _record(self, label, elapsed, ready):
+        with self.lock:
+            count, total, timeouts = self.stats.get(label, [0, 0.0, 0])
+            self.stats[label] = [count + 1, total + elapsed, timeouts + (0 if ready else 1)]
+        message = f"[等待] {label}: {elapsed:.1f} 秒" + ("" if ready else "（逾時）")
+        print(message)
+        logging.info(message)
+
+    def _finish(self, label, start, ready):
+        """補足帶隨機的最短等待，記錄並回傳實際等待秒數"""
+        minimum = self.min_wait + random.uniform(0, self.jitter)
+        remaining = minimum - (time.monotonic() - start)
+        if remaining > 0:
+            time.sleep(remaining)
+        elapsed = time.monotonic() - start
+        self._record(label, elapsed, ready)
+        return elapsed
+
+    def until(self, label, condition, timeout=None, required=False):
+        """輪詢 condition() 直到為真或逾時；required=True 時逾時拋出 TimeoutException"""
+        start = time.monotonic()
+        deadline = start + (timeout if timeout is not None else self.timeout)
+        ready = False
+        while True:
+            try:
+                ready = bool(condition())
+            except Exception:
+                ready = False  # 頁面切換中查詢失敗，視為尚未就緒
+            if ready or time.monotonic() >= deadline:
+                break
+            time.sleep(self.poll)
+        self._finish(label, start, ready)
+        if not ready and required:
+            raise TimeoutException(f"等待逾時: {label}")
+        return ready
+
+    def until_document_ready(self, driver, label, timeout=None):
+        """document.readyState == 'complete'"""
+        return self.until(label, lambda: driver.execute_script("return document.readyState") == "complete", timeout)
+
+    def until_present(self, driver, label, locators, timeout=None, required=False):
+        """locators 裡任一個 (by, selector) 找得到元素"""
+        return self.until(label, lambda: any(driver.find_elements(by, selector) for by, selector in locators),
+                          timeout, required)
+
+    def until_stable_count(self, driver, label, css_selector, stable_polls=3, timeout=None, required=False):
+        """元素數量大於 0 且連續 stable_polls 次輪詢都沒變，代表前端已渲染完"""
+        history = []
+
+        def stable():
+            history.append(len(driver.find_elements(By.CSS_SELECTOR, css_selector)))
+            recent = history[-stable_polls:]
+            return len(recent) == stable_polls and recent[0] > 0 and len(set(recent)) == 1
+
+        return self.until(label, stable, timeout, required)
+
+    def summary(self):
+        """印出每種等待的平均秒數，方便比較調整前後"""
+        with self.lock:
+            stats = dict(self.stats)
+        for label, (count, total, timeouts) in stats.items():
+            message = f"[等待統計] {label}: {count} 次，平均 {total / count:.1f} 秒，逾時 {timeouts} 次"
+            print(message)
+            logging.info(message)
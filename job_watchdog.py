@@ -0,0 +1,165 @@
+'''
+Chrome 進程看門狗：只追蹤、只清理我們自己開的瀏覽器
+為什麼？cleanup_chrome_processes() 只比對 chrome.exe / chromedriver.exe，在 Linux 上一個都抓不到；
+而且只在程式結束時跑一次，長時間執行時殘留的 renderer 會越積越多，直到機器開始用 swap。
+反過來在 Windows 上它會把使用者自己開的 Chrome 也一起殺掉。
+這裡在瀏覽器啟動時記下 chromedriver 與 Chrome 主程式的 PID 和它們底下的整棵進程樹（PID + 建立時間，避免 PID 被重複使用時誤殺），
+背景定期用 psutil 量這棵樹的 RSS，超過上限就標記讓瀏覽器池換新；
+瀏覽器 quit() 之後，樹裡還活著的進程（孤兒 renderer、GPU process…）才強制結束
+Linux、macOS、Windows 都適用（只依 PID，不看進程名稱）
+'''
+
+import threading  # 背景取樣
+import psutil  # 跨平台的進程資訊
+
+def _snapshot(root_pids):
+    """每個 root 與其所有子孫進程的 {pid: create_time}（已結束的 root 略過）"""
+    snapshot = {}
+    for root_pid in root_pids:
+        try:
+            root = psutil.Process(root_pid)
+            processes = [root] + root.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        for proc in processes:
+            try:
+                snapshot[proc.pid] = proc.create_time()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+    return snapshot
+
+def driver_root_pids(driver):
+    """chromedriver 的 PID，加上 undetected-chromedriver 另外啟動的 Chrome 主程式 PID（browser_pid）
+    為什麼兩個？uc 的 Chrome 不是 chromedriver 的子進程，而是直接由 Python 啟動"""
+    pids = []
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    if process is not None:
+        pids.append(process.pid)
+    browser_pid = getattr(driver, "browser_pid", None)
+    if browser_pid:
+        pids.append(browser_pid)
+    return pids
+
+def _alive(pid, create_time):
+    """PID 還在而且是同一個進程（建立時間相同）才算，避免殺到 PID 被重複使用的其他程式"""
+    try:
+        proc = psutil.Process(pid)
+        return proc if abs(proc.create_time() - create_time) < 1e-3 and proc.status() != psutil.STATUS_ZOMBIE else None
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+class ChromeWatchdog:
+    """register(driver) 開始追蹤；over_limit(driver) 查詢是否超過記憶體上限；
+    reap(driver) 在 quit() 之後清掉殘留進程；reap_all() 在程式結束時清掉所有追蹤中的進程"""
+
+    def __init__(self, max_rss_mb=None, interval=15):
+        self.max_rss_mb = max_rss_mb
+        self.interval = interval
+        self.tracked = {}  # id(driver) -> {"roots": [pid], "pids": {pid: create_time}, "rss_mb": 最近一次取樣}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.stats = {"reaped": 0, "peak_rss_mb": 0.0, "over_limit": 0}
+        self.thread = threading.Thread(target=self._run, name="chrome-watchdog", daemon=True)
+        self.thread.start()
+
+    def register(self, driver):
+        """記下瀏覽器的 chromedriver / Chrome 主程式 PID 與目前的進程樹"""
+        roots = driver_root_pids(driver)
+        if not roots:
+            print("無法追蹤瀏覽器進程：找不到 PID")
+            return driver
+        with self.lock:
+            self.tracked[id(driver)] = {"roots": roots, "pids": _snapshot(roots), "rss_mb": None}
+        return driver
+
+    def sample(self):
+        """更新每個瀏覽器的進程樹（renderer 會一直新增）並量 RSS"""
+        with self.lock:
+            items = list(self.tracked.items())
+        for key, info in items:
+            rss = 0
+            current = _snapshot(info["roots"])
+            for pid, create_time in current.items():
+                proc = _alive(pid, create_time)
+                if proc is None:
+                    continue
+                try:
+                    rss += proc.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            rss_mb = rss / (1024 * 1024)
+            with self.lock:
+                if key in self.tracked:
+                    self.tracked[key]["pids"].update(current)  # 只增不減：已離開樹的孤兒也要記得清
+                    self.tracked[key]["rss_mb"] = rss_mb
+                self.stats["peak_rss_mb"] = max(self.stats["peak_rss_mb"], rss_mb)
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"看門狗取樣失敗: {e}")
+
+    def rss_mb(self, driver):
+        with self.lock:
+            info = self.tracked.get(id(driver))
+            return info["rss_mb"] if info else None
+
+    def over_limit(self, driver):
+        """最近一次取樣超過 max_rss_mb 就回傳目前 RSS（MB），否則回傳 None"""
+        rss = self.rss_mb(driver)
+        if self.max_rss_mb and rss is not None and rss > self.max_rss_mb:
+            with self.lock:
+                self.stats["over_limit"] += 1
+            return rss
+        return None
+
+    def _kill(self, pids):
+        """結束還活著的進程（先 terminate，3 秒內沒結束再 kill），回傳數量"""
+        procs = [proc for proc in (_alive(pid, create_time) for pid, create_time in pids.items()) if proc]
+        for proc in procs:
+            try:
+                print(f"清理殘留進程: {proc.name()} (PID: {proc.pid})")
+                proc.terminate()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        _, still_alive = psutil.wait_procs(procs, timeout=3)
+        for proc in still_alive:
+            try:
+                proc.kill()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return len(procs)
+
+    def reap(self, driver):
+        """瀏覽器 quit() 之後呼叫：清掉這棵進程樹殘留的進程，並停止追蹤"""
+        with self.lock:
+            info = self.tracked.pop(id(driver), None)
+        if not info:
+            return 0
+        info["pids"].update(_snapshot(info["roots"]))
+        killed = self._kill(info["pids"])
+        with self.lock:
+            self.stats["reaped"] += killed
+        return killed
+
+    def reap_all(self):
+        """程式結束時呼叫：停止取樣並清掉所有追蹤中的進程，回傳清理數量"""
+        self.stop_event.set()
+        with self.lock:
+            infos = list(self.tracked.values())
+            self.tracked = {}
+        killed = 0
+        for info in infos:
+            killed += self._kill(info["pids"])
+        with self.lock:
+            self.stats["reaped"] += killed
+        return killed
+
+    def summary(self):
+        with self.lock:
+            stats = dict(self.stats)
+        print(f"[進程看門狗] 瀏覽器進程樹 RSS 峰值 {stats['peak_rss_mb']:.0f} MB，"
+              f"超過上限 {stats['over_limit']} 次，清理殘留進程 {stats['reaped']} 個")
@@ -0,0 +1,82 @@
+'''
+細節頁 worker pool：固定 N 個 worker 平行爬一頁的 job_data_list
+每個 worker 有自己的資源（Chrome 或 HTTP Session），不共用，避免互相干擾；
+請求速率由共用的 HostRateLimiter 控制，多開 worker 不會讓單一網站的請求變密
+'''
+
+import threading  # 每個 worker 執行緒各自保存資源
+from concurrent.futures import ThreadPoolExecutor  # 執行緒池
+
+class DetailWorkerPool:
+    """resource_factory() 建立 worker 專屬資源，resource_closer(resource) 負責關閉
+    recycle_every：每個資源處理幾個職缺後重建（瀏覽器長時間運作會卡住，原本是每 30 個重啟）
+    needs_recycle(resource)：每個職缺前檢查資源，回傳原因（字串）就重建，例如瀏覽器記憶體超過上限或健康檢查失敗"""
+
+    def __init__(self, workers, resource_factory, resource_closer=None, recycle_every=None, needs_recycle=None):
+        self.workers = max(1, workers)
+        self.resource_factory = resource_factory
+        self.resource_closer = resource_closer
+        self.recycle_every = recycle_every
+        self.needs_recycle = needs_recycle
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="detail")
+        self.local = threading.local()
+        self.states = []  # 所有 worker 的資源，close() 時統一關閉
+        self.lock = threading.Lock()
+
+    def _close_resource(self, state):
+        if state["resource"] is not None and self.resource_closer:
+            try:
+                self.resource_closer(state["resource"])
+            except Exception as e:
+                print(f"關閉 worker 資源時發生錯誤: {e}")
+        state["resource"] = None
+
+    def _get_state(self):
+        """取得目前執行緒的資源，需要時建立或重建"""
+        state = getattr(self.local, "state", None)
+        if state is None:
+            state = {"resource": None, "count": 0, "broken": False}
+            self.local.state = state
+            with self.lock:
+                self.states.append(state)
+        if state["resource"] is not None:
+            reason = None
+            if state["broken"]:
+                reason = "上個職缺失敗"
+            elif self.recycle_every and state["count"] >= self.recycle_every:
+                reason = f"處理 {state['count']} 個職缺"
+            elif self.needs_recycle is not None:
+                reason = self.needs_recycle(state["resource"])
+            if reason:
+                print(f"{threading.current_thread().name} {reason}，重建資源...")
+                self._close_resource(state)
+        if state["resource"] is None:
+            state["resource"] = self.resource_factory()
+            state["count"] = 0
+            state["broken"] = False
+        return state
+
+    def process(self, crawl_fn, row):
+        """在目前執行緒用它專屬的資源爬一個職缺（pipeline 的 detail worker 也直接呼叫這個）"""
+        state = self._get_state()
+        try:
+            return crawl_fn(state["resource"], row)
+        except Exception as e:
+            # 資源可能已失效（例如 invalid session id），下個職缺前重建
+            state["broken"] = True
+            print(f"worker 爬取 {row.get('job_id')} 失敗: {str(e)}")
+            return None
+        finally:
+            state["count"] += 1
+
+    def map(self, crawl_fn, rows):
+        """平行執行 crawl_fn(resource, row)，依 rows 順序回傳結果（失敗為 None）"""
+        futures = [self.executor.submit(self.process, crawl_fn, row) for row in rows]
+        return [future.result() for future in futures]
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        with self.lock:
+            for state in self.states:
+                self._close_resource(state)
+            self.states = []
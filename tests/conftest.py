@@ -0,0 +1,11 @@
+'''
+pytest 共用設定：測試直接 import 專案根目錄的 job_*.py 模組，fixture 檔案在 fixtures/
+    python -m pytest -q
+'''
+
+import os  # 組合路徑
+import sys  # 讓測試找得到根目錄的模組
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "fixtures")
+sys.path.insert(0, ROOT)
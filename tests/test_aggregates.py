@@ -0,0 +1,63 @@
+'''
+彙總快取：指標的雜湊要包含它呼叫的輔助函式與常數，改了才會重算；輸入沒變時沿用快取
+'''
+
+import pandas as pd
+import job_aggregates
+from job_aggregates import AggregateEngine, METRICS, code_digest, load_analysis_frame
+import job_features
+
+def test_code_digest_follows_helpers_and_constants(monkeypatch):
+    before = {name: code_digest(fn) for name, (fn, _) in METRICS.items()}
+    monkeypatch.setattr(job_aggregates, 'SKILLS', ['Rust'] + job_aggregates.SKILLS)
+    after = {name: code_digest(fn) for name, (fn, _) in METRICS.items()}
+    changed = {name for name in before if before[name] != after[name]}
+    assert {'exp_skills', 'edu_skills'} <= changed  # 經由 _cross_skill_counts 用到 SKILLS[:5]
+    assert 'job_count' not in changed
+
+def test_engine_recomputes_only_changed_metrics(tmp_path, monkeypatch):
+    csv_path = tmp_path / 'jobs.csv'
+    pd.DataFrame({'a': [1, 2, 3], 'b': [4, 5, 6]}).to_csv(csv_path, index=False)
+    calls = []
+
+    def sum_a(df):
+        calls.append('sum_a')
+        return df['a'].sum() * 10
+
+    def sum_b(df):
+        calls.append('sum_b')
+        return df['b'].sum()
+
+    metrics = {'sum_a': (sum_a, ['a']), 'sum_b': (sum_b, ['b'])}
+    engine = AggregateEngine(str(tmp_path / 'cache'), metrics)
+    assert engine.compute(str(csv_path), loader=pd.read_csv) == {'sum_a': 60, 'sum_b': 15}
+    assert engine.compute(str(csv_path), loader=pd.read_csv) == {'sum_a': 60, 'sum_b': 15}
+    assert calls == ['sum_a', 'sum_b']  # 第二次整份沿用
+    pd.DataFrame({'a': [1, 2, 3], 'b': [4, 5, 7]}).to_csv(csv_path, index=False)
+    assert engine.compute(str(csv_path), loader=pd.read_csv) == {'sum_a': 60, 'sum_b': 16}
+    assert calls == ['sum_a', 'sum_b', 'sum_b']  # 只有 b 欄變了
+
+def test_engine_recomputes_when_helper_constant_changes(tmp_path, monkeypatch):
+    csv_path = tmp_path / 'jobs.csv'
+    pd.DataFrame({'a': [1, 2, 3]}).to_csv(csv_path, index=False)
+    engine = AggregateEngine(str(tmp_path / 'cache'), {'edu_skills': (METRICS['edu_skills'][0], [])})
+    loader = lambda path: pd.DataFrame({'education': ['大學'], 'title_skills': [['Python']]})
+    first = engine.compute(str(csv_path), loader=loader)['edu_skills']
+    assert list(first['Skill']) == ['Python']
+    # 資料檔沒變，但 _cross_skill_counts 用到的 SKILLS 改了：不能沿用快取
+    monkeypatch.setattr(job_aggregates, 'SKILLS', ['SQL'])
+    second = engine.compute(str(csv_path), loader=loader)['edu_skills']
+    assert second.empty
+
+def test_engine_reloads_when_loader_rules_change(tmp_path, monkeypatch):
+    csv_path = tmp_path / 'jobs.csv'
+    pd.DataFrame({'job_title': ['資料工程師', '資料分析師'], 'company': ['A 科技', 'B'], 'industry': ['軟體', '軟體'],
+                  'location': ['台北市', '台北市'], 'experience': ['3年以上', '經歷不拘'], 'education': ['大學', '大學'],
+                  'salary': ['待遇面議', '待遇面議'], 'salary_avg': [None, None], 'tags': ['遠端工作', '上市上櫃']}).to_csv(csv_path, index=False)
+    engine = AggregateEngine(str(tmp_path / 'cache'), {'industry_salary': METRICS['industry_salary']})
+    first = engine.compute(str(csv_path), loader=load_analysis_frame)['industry_salary']
+    # 資料檔沒變，但補值規則（job_features.SALARY_BY_EXPERIENCE）改了：不能整份沿用快取
+    monkeypatch.setattr(job_features, 'SALARY_BY_EXPERIENCE', [(['3年'], 999999)])
+    second = engine.compute(str(csv_path), loader=load_analysis_frame)['industry_salary']
+    assert not first.equals(second)
+    assert engine.compute(str(csv_path), loader=load_analysis_frame)['industry_salary'].equals(second)
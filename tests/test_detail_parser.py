@@ -0,0 +1,52 @@
+'''
+細節頁解析：離線解析 fixtures/error_8ukbm.html，檢查 job_detail 的主要欄位
+'''
+
+import os  # 讀取 fixture
+from conftest import FIXTURES
+from job_detail_parser import parse_job_detail, extract_detail_fields
+from job_skills import extract_skills
+
+def _load(name="error_8ukbm.html"):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+def test_parse_job_detail_fixture():
+    list_data = {"job_title": "Data QA Engineer", "company": "範例公司", "salary": float("nan")}
+    job_detail = parse_job_detail(_load(), "8ukbm", list_data, extract_skills)
+    assert job_detail["job_id"] == "8ukbm"
+    assert job_detail["job_title"] == "Data QA Engineer"
+    assert "salary" not in job_detail  # 列表頁的缺值不帶入
+    assert job_detail["job_description"].startswith("【主要職責】")
+    assert "Kinesis、Kafka、Airflow" in job_detail["job_description"]
+    assert job_detail["job_categories"] == ["資料工程師"]
+    assert job_detail["management_responsibility"] == "不需負擔管理責任"
+    assert job_detail["work_shift"] == "日班"
+    assert job_detail["remote_work"] == "未知"  # 頁面沒有遠端欄位時用預設值
+    assert job_detail["BT_EXP"] == "無需出差外派"
+    assert job_detail["languages"] == "英文"
+    assert job_detail["tools"] == ["MySQL", "AWS", "ETL"]
+    assert job_detail["work_skills"][0] == "測試計劃及測試報告書撰寫"
+    assert len(job_detail["work_skills"]) == 7
+    assert job_detail["other_conditions"] == "熟悉 Python 與 SQL\n具 AWS 經驗尤佳"
+    assert {"Python", "SQL", "Kafka", "Airflow", "AWS"} <= set(job_detail["skills"])
+
+def test_missing_fields_use_defaults():
+    job_detail = parse_job_detail("<html><body><p>空白頁</p></body></html>", "x1", {}, extract_skills)
+    assert job_detail["job_description"] == "未知"
+    assert job_detail["job_categories"] == ["未知"]
+    assert job_detail["languages"] == "不拘"
+    assert job_detail["tools"] == ["--"]
+    assert job_detail["work_skills"] == ["不拘"]
+    assert job_detail["other_conditions"] == "無"
+
+def test_extract_fields_skips_missing_rows():
+    fields = extract_detail_fields(_load())
+    assert "remote_work" not in fields
+
+def test_defaults_override():
+    # 104_job_detail.py 的擅長工具缺值預設為 ["不拘"]，其他欄位沿用共用預設
+    job_detail = parse_job_detail("<html><body></body></html>", "x1", {}, extract_skills, {"tools": ["不拘"]})
+    assert job_detail["tools"] == ["不拘"]
+    assert job_detail["work_skills"] == ["不拘"]
+    assert parse_job_detail("<html><body></body></html>", "x1", {}, extract_skills)["tools"] == ["--"]
@@ -0,0 +1,27 @@
+'''
+HTTP 細節頁：replay fixtures/job_content/8ukbm.json 的結果要和瀏覽器版解析 fixtures/error_8ukbm.html 完全一致
+'''
+
+import os  # 讀取 fixture
+from conftest import FIXTURES
+from job_detail_parser import parse_job_detail
+from job_http_fetcher import crawl_job_details_http
+from job_skills import extract_skills
+
+LIST_DATA = {"job_title": "資料品質測試工程師", "company": "美商比特斯科技有限公司(籌備處)", "salary": "待遇面議"}
+
+def test_http_replay_matches_browser_parser():
+    http_detail = crawl_job_details_http(None, "8ukbm", dict(LIST_DATA), extract_skills,
+                                         replay_dir=os.path.join(FIXTURES, "job_content"))
+    with open(os.path.join(FIXTURES, "error_8ukbm.html"), encoding="utf-8") as f:
+        browser_detail = parse_job_detail(f.read(), "8ukbm", dict(LIST_DATA), extract_skills)
+    assert http_detail is not None
+    assert list(http_detail) == list(browser_detail)  # 欄位與順序相同
+    for key, value in browser_detail.items():
+        if key == "skills":  # 由 set 產生，順序不固定
+            assert sorted(http_detail[key]) == sorted(value), key
+        else:
+            assert http_detail[key] == value, key
+
+def test_http_replay_missing_file_returns_none():
+    assert crawl_job_details_http(None, "nojob", {}, extract_skills, replay_dir=os.path.join(FIXTURES, "job_content")) is None
@@ -0,0 +1,102 @@
+'''
+job_id 索引：sync 後不會漏判（沒有 false negative）、超過容量或換了資料庫時重建、存檔再讀回結果相同、
+Bloom filter 的誤判由資料庫主鍵查詢修正
+'''
+
+import os  # 刪除資料庫檔
+from job_id_index import JobIdIndex, open_index
+from job_store import JobStore
+
+def _ids(prefix, n):
+    return [f"{prefix}{i:05d}" for i in range(n)]
+
+def _save_jobs(store, job_ids):
+    store.upsert_jobs([{"job_id": job_id} for job_id in job_ids], "1022")
+
+def test_no_false_negatives_after_sync(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    try:
+        _save_jobs(store, _ids("a", 3000))
+        index = open_index(store)
+        assert all(job_id in index for job_id in _ids("a", 3000))
+        _save_jobs(store, _ids("b", 500) + ["a00001"])  # 增量：只補新的 rowid；更新既有職缺不重複加入
+        assert index.sync(store) == 500
+        assert len(index) == 3500
+        assert all(job_id in index for job_id in _ids("a", 3000) + _ids("b", 500))
+        assert not any(job_id in index for job_id in _ids("c", 2000))
+    finally:
+        store.close()
+
+def test_exact_fallback_rejects_false_positives(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    try:
+        _save_jobs(store, _ids("a", 1000))
+        index = JobIdIndex(str(tmp_path / "tiny.ids"), capacity=1000, error_rate=0.5, exact=store.has_job)  # 故意很容易誤判
+        index.sync(store)
+        probes = _ids("z", 2000)
+        assert any(index.might_contain(job_id) for job_id in probes)
+        assert not any(job_id in index for job_id in probes)
+        assert index.stats["false_positives"] > 0
+    finally:
+        store.close()
+
+def test_rebuild_when_capacity_exceeded(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    try:
+        index = JobIdIndex(str(tmp_path / "jobs.db.ids"), capacity=1000, exact=store.has_job)
+        _save_jobs(store, _ids("a", 800))
+        index.sync(store)
+        assert index.capacity == 1000
+        _save_jobs(store, _ids("b", 800))
+        index.sync(store)
+        assert index.capacity >= 1600
+        assert len(index) == 1600
+        assert all(job_id in index for job_id in _ids("a", 800) + _ids("b", 800))
+    finally:
+        store.close()
+
+def test_rebuild_when_database_replaced(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    store = JobStore(db_path)
+    _save_jobs(store, _ids("a", 300))
+    open_index(store)
+    store.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    store = JobStore(db_path)  # 新的資料庫：max rowid 比索引記錄的小
+    try:
+        _save_jobs(store, _ids("b", 10))
+        index = open_index(store)
+        assert index.last_rowid == store.max_rowid()
+        assert len(index) == 10
+        assert all(job_id in index for job_id in _ids("b", 10))
+        assert not any(job_id in index for job_id in _ids("a", 300))
+    finally:
+        store.close()
+
+def test_reload_from_disk_gives_same_answers(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    try:
+        _save_jobs(store, _ids("a", 2000))
+        index = open_index(store)
+        probes = _ids("a", 2000) + _ids("z", 2000)
+        expected = [index.might_contain(job_id) for job_id in probes]
+        reloaded = JobIdIndex(index.path, exact=store.has_job)
+        assert (reloaded.count, reloaded.last_rowid, reloaded.num_bits) == (index.count, index.last_rowid, index.num_bits)
+        assert [reloaded.might_contain(job_id) for job_id in probes] == expected
+        assert reloaded.sync(store) == 0  # 已同步過，沒有新職缺
+    finally:
+        store.close()
+
+def test_corrupt_index_file_is_rebuilt(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    try:
+        _save_jobs(store, _ids("a", 100))
+        index_path = str(tmp_path / "jobs.db.ids")
+        with open(index_path, "wb") as f:
+            f.write(b"garbage")
+        index = open_index(store)
+        assert all(job_id in index for job_id in _ids("a", 100))
+    finally:
+        store.close()
@@ -0,0 +1,29 @@
+'''
+增量模式：從 CSV 匯入的職缺（N/A 被讀成 NaN 後丟掉）和列表頁同一張卡片（N/A）要判斷為未變動
+'''
+
+import pandas as pd
+from job_incremental import IncrementalPlanner, list_fingerprint, FINGERPRINT_FIELDS
+from job_store import JobStore
+
+CARD = {"job_id": "8ukbm", "job_title": "資料品質測試工程師", "company": "範例公司", "industry": "軟體及網路相關業",
+        "location": "台北市信義區", "experience": "3年以上", "education": "大學", "salary": "待遇面議",
+        "tags": "N/A", "update_date": "10/22"}
+
+def test_missing_values_fingerprint_equal():
+    base = dict(CARD)
+    for missing in (None, float("nan"), "", "N/A"):
+        assert list_fingerprint({**base, "tags": missing}) == list_fingerprint({k: v for k, v in base.items() if k != "tags"})
+
+def test_csv_imported_job_is_unchanged(tmp_path):
+    csv_path = tmp_path / "old.csv"
+    pd.DataFrame([CARD]).to_csv(csv_path, index=False)
+    store = JobStore(str(tmp_path / "jobs.db"))
+    try:
+        assert store.import_csv(str(csv_path)) == 1
+        planner = IncrementalPlanner(store.list_fields(["update_date"] + FINGERPRINT_FIELDS))
+    finally:
+        store.close()
+    assert planner.plan([dict(CARD)]) == []
+    assert planner.plan([{**CARD, "salary": "月薪40,000元以上"}]) != []
+    assert planner.counts == {"new": 0, "changed": 1, "unchanged": 1}
@@ -0,0 +1,42 @@
+'''
+列表頁解析：總頁數只從搜尋結果的分頁元件 / pagination 物件讀取，其他區塊的數字不影響結束頁數
+'''
+
+import os  # 讀取 fixture
+from conftest import FIXTURES
+from job_list_parser import parse_list_page, parse_total_pages
+from job_pagination import PaginationPolicy
+
+def _page(body):
+    return f"<html><body>{body}</body></html>"
+
+def test_parse_list_page_fixture():
+    with open(os.path.join(FIXTURES, "list_page_sample.html"), encoding="utf-8") as f:
+        rows = parse_list_page(f.read(), "https://www.104.com.tw/jobs/search")
+    assert rows
+    assert all(row["job_id"] != "N/A" for row in rows)
+
+def test_total_pages_from_pagination_select():
+    source = _page('<select class="page-select"><option>第 1 / 42 頁</option><option>第 2 / 42 頁</option></select>')
+    assert parse_total_pages(source) == 42
+
+def test_total_pages_from_search_state():
+    assert parse_total_pages(_page('<script>{"pagination":{"currentPage":1,"lastPage":17}}</script>')) == 17
+    assert parse_total_pages(_page('<script>{"pagination":{"currentPage":1,"total":401}}</script>')) == 21
+
+def test_total_pages_ignores_other_json():
+    # 推薦職缺 / 廣告的內嵌資料有自己的 totalPage、totalCount，不能當成搜尋結果的總頁數
+    source = _page('<script>{"recommend":{"totalPage":2,"totalCount":30}}</script>'
+                   '<div class="pagination"><select><option>第 1 / 35 頁</option></select></div>')
+    assert parse_total_pages(source) == 35
+    assert parse_total_pages(_page('<script>{"ad":{"totalPage":2,"totalCount":30}}</script>')) is None
+
+def test_policy_ignores_total_smaller_than_current_page():
+    policy = PaginationPolicy(1, 50)
+    policy.update_total_pages(3, current_page=5)
+    assert policy.end_page == 50
+    policy.update_total_pages(30, current_page=5)
+    assert policy.end_page == 30
+
+def test_total_pages_empty_page():
+    assert parse_total_pages("") is None
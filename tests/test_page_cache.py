@@ -0,0 +1,62 @@
+'''
+頁面快取：相同內容只存一份；淘汰時依實際刪掉的內容計算大小，結束後總大小要在上限以下
+'''
+
+import os  # 隨機內容
+from job_page_cache import PageCache
+
+def _body(n, size=200000):
+    return os.urandom(size // 2).hex() + str(n)  # 壓縮不掉的內容，大小約等於 size
+
+def test_put_get_and_dedup(tmp_path):
+    cache = PageCache(str(tmp_path), ttl=3600, max_mb=10)
+    try:
+        cache.put("https://a", "hello")
+        cache.put("https://b", "hello")
+        assert cache.get("https://a") == "hello"
+        assert cache.get("https://missing") is None
+        assert cache.conn.execute("SELECT COUNT(DISTINCT digest) FROM pages").fetchone()[0] == 1
+    finally:
+        cache.close()
+
+def test_evict_shared_digest_until_under_limit(tmp_path):
+    cache = PageCache(str(tmp_path), ttl=3600, max_mb=1)
+    try:
+        shared = _body("shared", 600000)  # 壓縮後約 300 KB
+        for i in range(3):  # 3 個 URL 共用同一份內容，最先使用
+            cache.put(f"https://shared/{i}", shared)
+        cache.put("https://page/big", _body("big", 1600000))  # 壓縮後約 800 KB，總大小超過 1 MB
+        # 要淘汰全部 3 個共用 URL 才真的刪掉那份內容；不能淘汰一個 URL 就當作少了 300 KB
+        assert cache._total_bytes() <= cache.max_bytes
+        assert cache.get("https://shared/0") is None
+        assert cache.get("https://page/big") is not None
+        assert _object_count(tmp_path) == 1
+    finally:
+        cache.close()
+
+def _object_count(cache_dir):
+    return sum(len(files) for _, _, files in os.walk(os.path.join(str(cache_dir), "objects")))
+
+def test_put_same_url_replaces_old_content(tmp_path):
+    cache = PageCache(str(tmp_path), ttl=3600, max_mb=10)
+    try:
+        for i in range(50):  # 列表頁每次重抓內容都不同
+            cache.put("https://list?page=1", f"page body {i}")
+        assert cache.get("https://list?page=1") == "page body 49"
+        assert _object_count(tmp_path) == 1
+        # 舊內容還被其他 URL 引用時不能刪
+        cache.put("https://a", "shared")
+        cache.put("https://b", "shared")
+        cache.put("https://a", "new")
+        assert cache.get("https://b") == "shared"
+        assert _object_count(tmp_path) == 3
+    finally:
+        cache.close()
+
+def test_expired_pages_miss(tmp_path):
+    cache = PageCache(str(tmp_path), ttl=-1, max_mb=10)
+    try:
+        cache.put("https://a", "hello")
+        assert cache.get("https://a") is None
+    finally:
+        cache.close()
@@ -0,0 +1,65 @@
+'''
+薪資解析：整欄向量化 parse_salary_series() 與單筆 parse_salary() 逐筆結果必須相同
+'''
+
+import math  # 比對 NaN
+import pandas as pd
+import pytest
+from job_salary import parse_salary, parse_salary_series, NO_SALARY, UNPARSED, PIECE_RATE
+
+EDGE_CASES = [
+    "待遇面議",
+    float("nan"),
+    None,
+    "",
+    "論件計酬",
+    "月薪40,000~60,000元",
+    "月薪35,000元以上",
+    "月薪4萬~6萬元",
+    "月薪4~6萬元",
+    "月薪3.5萬元以上",
+    "年薪1,200,000元以上",
+    "年薪100萬元以上",
+    "年薪80萬~120萬元",
+    "年薪1,000,001~1,500,001元",
+    "時薪183元",
+    "時薪190~250元",
+    "日薪1,500元",
+    "日薪1,500~2,000元",
+    "面議（經常性薪資達4萬元或以上）",
+    "依公司規定",
+    "月薪元",
+    "薪資40,000元",
+    12345,
+]
+
+def _same(a, b):
+    if a is None or (isinstance(a, float) and math.isnan(a)):
+        return b is None or (isinstance(b, float) and math.isnan(b))
+    return a == b
+
+def test_series_matches_scalar_row_by_row():
+    parsed = parse_salary_series(pd.Series(EDGE_CASES, dtype="object"))
+    for i, salary in enumerate(EDGE_CASES):
+        expected = parse_salary(salary)
+        row = parsed.iloc[i]
+        actual = (row["salary_min"], row["salary_max"], row["salary_avg"], row["salary_note"])
+        assert all(_same(a, b) for a, b in zip(expected, actual)), (salary, expected, actual)
+
+def test_series_accepts_category_and_keeps_index():
+    series = pd.Series(EDGE_CASES[:8], index=range(100, 108)).astype("category")
+    parsed = parse_salary_series(series)
+    assert list(parsed.index) == list(series.index)
+    assert list(parsed["salary_note"]) == [parse_salary(s)[3] for s in EDGE_CASES[:8]]
+
+@pytest.mark.parametrize("salary, expected", [
+    ("待遇面議", (None, None, None, NO_SALARY)),
+    ("論件計酬", (None, None, None, PIECE_RATE)),
+    ("月薪4萬~6萬元", (40000, 60000, 50000, "")),
+    ("年薪100萬元以上", (83333, None, 83333, "年薪轉換為月薪")),
+    ("時薪190~250元", (190 * 176, 250 * 176, 220 * 176, "推估（時薪 × 8小時 × 22天）")),
+    ("日薪1,500元", (33000, None, 33000, "推估（日薪 × 22天）")),
+    ("依公司規定", (None, None, None, UNPARSED)),
+])
+def test_parse_salary_values(salary, expected):
+    assert parse_salary(salary) == expected
@@ -0,0 +1,46 @@
+'''
+技能比對（Aho-Corasick）：邊界規則、最長比對、大小寫、排除詞與同義詞
+'''
+
+import pytest
+from job_skills import SkillMatcher, default_matcher, extract_skills
+
+@pytest.fixture(scope="module")
+def matcher():
+    return default_matcher()
+
+@pytest.mark.parametrize("text, expected", [
+    ("熟悉Python", ["Python"]),                         # 中文緊鄰英文技能仍算
+    ("MySQL資料庫", ["MySQL"]),                         # MySQL 不算 SQL
+    ("熟 MS SQL", ["MS SQL"]),                          # MS SQL 比 SQL 長，優先
+    ("MS SQL與SQL", ["MS SQL", "SQL"]),
+    ("R&D部門", []),                                    # R&D 蓋掉 R
+    ("R & D 工程師", []),
+    ("使用RStudio", []),                                # RStudio 不是 R
+    ("用R做統計", ["R"]),
+    ("r語言", []),                                      # R 區分大小寫
+    ("JavaScript/Java", ["JavaScript", "Java"]),
+    ("機器學習", ["Machine Learning"]),                 # 同義詞轉成標準名稱
+    ("SQL Server", ["MS SQL"]),
+    ("mssql", ["MS SQL"]),
+    ("Python3", ["Python"]),
+    ("pythonic", []),                                   # 英數字邊界
+    ("Python、python、PYTHON", ["Python"]),             # 不重複
+])
+def test_extract(matcher, text, expected):
+    assert matcher.extract(text) == expected
+
+def test_extract_many_matches_extract(matcher):
+    texts = ["熟悉Python、SQL，有R&D經驗", "MySQL / MS SQL", "機器學習與JavaScript", "", None, float("nan"), "RStudio 與 R"]
+    assert matcher.extract_many(texts) == [matcher.extract(text) for text in texts]
+
+def test_extract_skills_uses_default_dictionary():
+    assert extract_skills("熟悉Python、SQL，有R&D經驗") == ["Python", "SQL"]
+
+def test_custom_entries():
+    matcher = SkillMatcher([
+        {"name": "Go", "aliases": ["Golang"], "case_sensitive": True, "exclude": ["Go to market"]},
+        {"name": "Data Analysis", "aliases": ["資料分析", "數據分析"]},
+    ])
+    assert matcher.extract("會 Golang 與數據分析") == ["Go", "Data Analysis"]
+    assert matcher.extract("go 與 Go to market") == []
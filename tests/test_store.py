@@ -0,0 +1,56 @@
+'''
+職缺資料庫：匯入舊 CSV 後再匯出同一個 jobcat，舊資料不能遺失
+'''
+
+import pandas as pd
+from job_store import JobStore
+
+OLD_ROWS = [
+    {"job_id": "old1", "job_title": "資料工程師", "skills": "Python,SQL"},
+    {"job_id": "old2", "job_title": "資料分析師", "skills": "SQL"},
+]
+
+def _store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.db"))
+
+def test_import_then_export_keeps_history(tmp_path):
+    csv_path = tmp_path / "job_data_jobcat_1022.csv"
+    pd.DataFrame(OLD_ROWS).to_csv(csv_path, index=False)
+    store = _store(tmp_path)
+    try:
+        assert store.import_csv(str(csv_path), "1022") == 2
+        store.upsert_jobs([{"job_id": "new1", "job_title": "資料科學家", "skills": ["Python"]}], "1022")
+        assert store.export_csv(str(csv_path), "1022") == 3  # 匯出到同一個檔案
+    finally:
+        store.close()
+    exported = pd.read_csv(csv_path)
+    assert list(exported["job_id"]) == ["old1", "old2", "new1"]
+    assert exported.loc[2, "skills"] == "Python"
+
+def test_export_includes_untagged_rows(tmp_path):
+    # 舊版沒有帶 jobcat 匯入的資料庫：匯出指定 jobcat 時也要包含
+    csv_path = tmp_path / "old.csv"
+    pd.DataFrame(OLD_ROWS).to_csv(csv_path, index=False)
+    store = _store(tmp_path)
+    try:
+        store.import_csv(str(csv_path))
+        store.upsert_jobs([{"job_id": "new1"}], "1022")
+        store.upsert_jobs([{"job_id": "other"}], "2001")
+        json_path = tmp_path / "out.json"
+        assert store.export_json(str(json_path), "1022") == 3
+        assert store.count("1022") == 1
+    finally:
+        store.close()
+
+def test_import_skips_known_ids_and_unchanged_file(tmp_path):
+    csv_path = tmp_path / "old.csv"
+    pd.DataFrame(OLD_ROWS).to_csv(csv_path, index=False)
+    store = _store(tmp_path)
+    try:
+        store.upsert_jobs([{"job_id": "old1", "job_title": "較新的資料"}], "1022")
+        assert store.import_csv(str(csv_path), "1022") == 1  # old1 已存在，不被舊資料覆蓋
+        assert store.import_csv(str(csv_path), "1022") == 0  # 檔案沒變動不再匯入
+        titles = {record["job_id"]: record["job_title"] for record in store.iter_records()}
+    finally:
+        store.close()
+    assert titles["old1"] == "較新的資料"